@@ -0,0 +1,43 @@
+"""Measure the memory allocated for the basic blocks of the cfg, before and after the SSA conversion.
+Usage: benchmark_block_memory.py [python files...], default to some of the modules of klara.
+"""
+import gc
+import tracemalloc
+
+from benchmark_utils import get_files, read_source
+
+from klara.core import cfg, config
+from klara.core.manager import AstManager
+
+MANAGER = AstManager()
+
+
+def measure(source):
+    as_tree = MANAGER.build_tree(source)
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    cfg_real = cfg.Cfg(as_tree)
+    built = tracemalloc.take_snapshot()
+    cfg_real.convert_to_ssa()
+    cfg_real.fill_all_conditions()
+    converted = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    cfg_size = sum(stat.size_diff for stat in built.compare_to(start, "filename"))
+    ssa_size = sum(stat.size_diff for stat in converted.compare_to(start, "filename"))
+    return len(cfg_real.block_list), cfg_size, ssa_size
+
+
+def main(files):
+    MANAGER.initialize(config.Config())
+    for file in files:
+        num_blocks, cfg_size, ssa_size = measure(read_source(file))
+        print(
+            "{}: {} blocks, cfg {:.1f} Kb ({} bytes/block), after ssa {:.1f} Kb ({} bytes/block)".format(
+                file, num_blocks, cfg_size / 1024, cfg_size // num_blocks, ssa_size / 1024, ssa_size // num_blocks
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(get_files())
@@ -0,0 +1,33 @@
+"""Microbenchmark of the inference path push/pop with a deep call context.
+Compare the maintained hash of CallContext against hashing all the items on every push/pop.
+"""
+import timeit
+
+from klara.core import context_mod, nodes
+
+
+def bench(call_context_size, number=2000):
+    context = context_mod.InferenceContext()
+    for i in range(call_context_size):
+        arg = nodes.Arg()
+        arg.arg = "arg_{}".format(i)
+        context.call_context[arg] = nodes.Const(i)
+    node = nodes.Name()
+
+    def push_remove():
+        context.push_path(node)
+        context.remove_path(node)
+
+    def push_remove_full_hash():
+        h = hash(frozenset(context.call_context.items()))
+        context.path.add((node, h))
+        context.path.remove((node, hash(frozenset(context.call_context.items()))))
+
+    incremental = timeit.timeit(push_remove, number=number)
+    full = timeit.timeit(push_remove_full_hash, number=number)
+    print("{:>6} args: incremental {:.4f}s, full hash {:.4f}s".format(call_context_size, incremental, full))
+
+
+if __name__ == "__main__":
+    for size in (1, 10, 100, 1000):
+        bench(size)
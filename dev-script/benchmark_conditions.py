@@ -0,0 +1,43 @@
+"""Benchmark of `Cfg.fill_all_conditions()` on a generated function, made of a loop containing
+a sequence of nested if/elif chains.
+"""
+from benchmark_utils import get_number, timed
+
+from klara.core.cfg import Cfg
+from klara.core.manager import AstManager
+
+MANAGER = AstManager()
+
+
+def generate_source(groups, depth, branches):
+    lines = ["def foo(x, y):", "    while x > 0:"]
+    for group in range(groups):
+        indent = "        "
+        for level in range(depth):
+            for branch in range(branches):
+                keyword = "if" if branch == 0 else "elif"
+                lines.append("{}{} x == {}:".format(indent, keyword, (group * depth + level) * branches + branch))
+                lines.append("{}    y = y + {}".format(indent, branch))
+            lines.append("{}else:".format(indent))
+            indent += "    "
+        lines.append("{}y = {}".format(indent, group))
+    lines.append("        x = x - 1")
+    lines.append("    return y")
+    return "\n".join(lines)
+
+
+def bench(groups, depth, branches):
+    as_tree = MANAGER.build_tree(generate_source(groups, depth, branches))
+    cfg_real = Cfg(as_tree)
+    _, duration = timed(cfg_real.fill_all_conditions)
+    print(
+        "{:>3} groups of depth {}, {:>2} branches ({:>5} blocks): {:.3f}s".format(
+            groups, depth, branches, len(cfg_real.block_list), duration
+        )
+    )
+
+
+if __name__ == "__main__":
+    groups = get_number(20)
+    for branches in (2, 6, 12):
+        bench(groups, 4, branches)
@@ -0,0 +1,33 @@
+"""Benchmark of the dominator tree and dominance frontier computation on synthetic CFGs.
+The CFG is a chain of if/else diamonds, with a loop back edge every 10 diamonds.
+"""
+import sys
+
+from benchmark_utils import build_diamonds, timed
+
+from klara.core.cfg import Cfg, ParentScopeBlock
+
+
+def build_cfg(num_blocks):
+    root = ParentScopeBlock(name="root")
+    root.blocks.extend(build_diamonds(num_blocks))
+    Cfg.connect_2_blocks(root, root.blocks[0])
+    return root
+
+
+def fill_dominators(root):
+    root.fill_dominates()
+    root.fill_idom()
+    root.fill_df(list(root.blocks))
+
+
+def bench(num_blocks):
+    root = build_cfg(num_blocks)
+    _, duration = timed(fill_dominators, root)
+    print("{:>7} blocks: {:.3f}s".format(len(root.blocks), duration))
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    for size in sizes:
+        bench(size)
@@ -0,0 +1,47 @@
+"""Compare the time to build the cfg, SSA and conditions and infer a single call, with the SSA of the functions
+constructed upfront and on demand (--lazy-ssa).
+Usage: benchmark_lazy_ssa.py [number of functions], default to 500 functions, where only one of them is called.
+"""
+import time
+
+from benchmark_utils import generate_functions, get_number
+
+from klara.core import cfg, config, nodes
+from klara.core.manager import AstManager
+
+MANAGER = AstManager()
+
+
+def generate(num_functions):
+    return generate_functions(num_functions) + "x = func_0(5, 2)\n"
+
+
+def run(source, lazy_ssa):
+    MANAGER.config.lazy_ssa = lazy_ssa
+    MANAGER.clear_infer_cache()
+    as_tree = MANAGER.build_tree(source)
+    start = time.perf_counter()
+    cfg_real = cfg.Cfg(as_tree)
+    cfg_real.apply_transform()
+    cfg_real.convert_to_ssa()
+    cfg_real.fill_all_conditions()
+    build_time = time.perf_counter() - start
+    value = as_tree.body[-1].value
+    assert isinstance(value, nodes.Call)
+    results = sorted(str(res.result) for res in value.infer())
+    return results, build_time, time.perf_counter() - start
+
+
+def main(num_functions):
+    MANAGER.initialize(config.Config())
+    source = generate(num_functions)
+    eager_results, eager_build, eager_total = run(source, False)
+    lazy_results, lazy_build, lazy_total = run(source, True)
+    assert eager_results == lazy_results, (eager_results, lazy_results)
+    print("{} functions, inferred: {}".format(num_functions, ", ".join(lazy_results)))
+    print("eager: build {:.3f}s, build + infer {:.3f}s".format(eager_build, eager_total))
+    print("lazy: build {:.3f}s, build + infer {:.3f}s".format(lazy_build, lazy_total))
+
+
+if __name__ == "__main__":
+    main(get_number(500))
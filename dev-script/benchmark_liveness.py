@@ -0,0 +1,55 @@
+"""Benchmark of the liveness computation on a synthetic CFG with hundreds of variables.
+The CFG is a chain of if/else diamonds with a loop back edge every 10 diamonds, every block
+using and defining a few of the variables.
+"""
+import random
+import sys
+
+from benchmark_utils import build_diamonds, timed
+
+from klara.core.cfg import Cfg
+
+
+def build_cfg(num_blocks, num_vars):
+    rand = random.Random(0)
+    cfg = Cfg()
+    variables = ["v{}".format(i) for i in range(num_vars)]
+    for blk in build_diamonds(num_blocks):
+        blk.ue_var = set(rand.sample(variables, 3))
+        blk.var_kill = set(rand.sample(variables, 3))
+        cfg.block_list.append(blk)
+    return cfg
+
+
+def round_robin(cfg):
+    changed_flag = True
+    while changed_flag:
+        changed_flag = False
+        for blocks in cfg.block_list:
+            new_liveout = set()
+            for nxt_block in blocks.nxt_block_list:
+                new_liveout |= nxt_block.ue_var | (nxt_block.live_out - nxt_block.var_kill)
+            if new_liveout - blocks.live_out:
+                blocks.live_out = new_liveout
+                changed_flag = True
+
+
+def bench(num_blocks, num_vars):
+    cfg = build_cfg(num_blocks, num_vars)
+    _, bits_time = timed(cfg.compute_live_out)
+    expected = [blk.live_out for blk in cfg.block_list]
+    for blk in cfg.block_list:
+        blk.live_out = set()
+    _, round_robin_time = timed(round_robin, cfg)
+    assert expected == [blk.live_out for blk in cfg.block_list]
+    print(
+        "{:>6} blocks, {:>4} vars: bitset worklist {:.3f}s, round robin sets {:.3f}s".format(
+            num_blocks, num_vars, bits_time, round_robin_time
+        )
+    )
+
+
+if __name__ == "__main__":
+    num_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for num_vars in (50, 200, 500):
+        bench(num_blocks, num_vars)
@@ -0,0 +1,54 @@
+"""Compare the time to build the tree and cfg of a module with the time to get them from the module cache
+(config.module_cache), and the time to build them with the time to move them built to another process, which is
+pickling and unpickling them with `snapshot.Snapshot`.
+Usage: benchmark_module_cache.py [python files...], default to some of the modules of klara.
+"""
+import io
+
+from benchmark_utils import get_files, read_source, timed
+
+from klara.core import snapshot
+from klara.core.tree_rewriter import AstBuilder
+from klara.klara_z3.cov_manager import CovManager
+from klara.scripts.cover_gen_ins import config
+
+MANAGER = CovManager()
+
+
+def build(source):
+    return MANAGER.build_cfg(MANAGER.build_tree(source))
+
+
+def transfer(as_tree, *roots):
+    file = io.BytesIO()
+    snapshot.Snapshot(MANAGER.builtins_tree).dump(file, as_tree, *roots)
+    file.seek(0)
+    return snapshot.Snapshot(MANAGER.builtins_tree).load(file)
+
+
+def main(files):
+    MANAGER.initialize(config.ConfigNamespace())
+    MANAGER.config.module_cache = len(files)
+    for file in files:
+        source = read_source(file)
+        module_cfg, build_time = timed(build, source)
+        _, cached_time = timed(build, source)
+        _, cfg_transfer_time = timed(transfer, module_cfg.as_tree, module_cfg)
+        as_tree, tree_time = timed(AstBuilder().string_build, source)
+        _, transfer_time = timed(transfer, as_tree)
+        print(
+            "{}: tree and cfg {:.3f}s, cached {:.6f}s, moving them {:.3f}s, tree {:.3f}s, moving the tree {:.3f}s "
+            "({:.1f}x tree)".format(
+                file,
+                build_time,
+                cached_time,
+                cfg_transfer_time,
+                tree_time,
+                transfer_time,
+                transfer_time / tree_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(get_files())
@@ -0,0 +1,63 @@
+"""Measure the memory of the tree per source line with tracemalloc, compared to the tree of CPython's ast module.
+The tree is measured after the rewriting (build_tree), and again after the cfg and SSA form are built, which also
+counts the scope containers filled by the renaming. Stub files are built like builtins.pyi, without the SSA form.
+Usage: benchmark_node_memory.py [python files...], default to builtins.pyi and some of the modules of klara.
+"""
+import ast
+import gc
+import tracemalloc
+
+from benchmark_utils import DEFAULT_FILES, get_files, read_source
+
+from klara.core import cfg, config
+from klara.core.manager import AstManager
+from klara.core.protocols import StubTreeRewriter
+from klara.core.tree_rewriter import AstBuilder
+
+MANAGER = AstManager()
+STUB_FILES = ("klara/core/typeshed/stdlib/2and3/builtins.pyi",)
+
+
+def measure(func, *args):
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def build_ssa(as_tree):
+    cfg_real = cfg.Cfg(as_tree)
+    cfg_real.apply_transform()
+    cfg_real.convert_to_ssa()
+    return cfg_real
+
+
+def main(files):
+    MANAGER.initialize(config.Config())
+    for file in files:
+        source = read_source(file)
+        num_lines = source.count("\n") + 1
+        _, ast_size = measure(ast.parse, source)
+        if file.endswith(".pyi"):
+            _, tree_size = measure(AstBuilder(tree_rewriter=StubTreeRewriter).string_build, source)
+            ssa_size = 0
+        else:
+            as_tree, tree_size = measure(MANAGER.build_tree, source)
+            _, ssa_size = measure(build_ssa, as_tree)
+        print(
+            "{}: {} lines, ast {:.0f} b/line, tree {:.0f} b/line ({:.1f}x ast), ssa {:.0f} b/line".format(
+                file,
+                num_lines,
+                ast_size / num_lines,
+                tree_size / num_lines,
+                tree_size / ast_size,
+                ssa_size / num_lines,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(get_files(STUB_FILES + DEFAULT_FILES))
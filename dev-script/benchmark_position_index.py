@@ -0,0 +1,46 @@
+"""Compare the time of the queries of the HTML server (node at lineno:col_offset) and of --cover-lines (first node
+of the lines) with a walk of the tree for every query, and with the position index of the tree.
+Usage: benchmark_position_index.py [python files...], default to some of the modules of klara.
+"""
+from benchmark_utils import get_files, read_source, timed
+
+from klara.core import config, ssa_visitors
+from klara.core.manager import AstManager
+from klara.core.position_index import PositionIndex
+
+MANAGER = AstManager()
+NUM_QUERIES = 100
+
+
+def walk_queries(as_tree, positions):
+    for lineno, col_offset in positions:
+        ssa_visitors.NodeFinder(lambda x: x.lineno == lineno and x.col_offset == col_offset).execute(as_tree)
+    for lineno, _ in positions:
+        ssa_visitors.StatementExprExtractor({lineno: (None, None)}).extract(as_tree)
+
+
+def index_queries(as_tree, positions):
+    index = PositionIndex(as_tree)
+    for lineno, col_offset in positions:
+        index.node_at(lineno, col_offset)
+    for lineno, _ in positions:
+        index.first_node_at_line(lineno)
+
+
+def main(files):
+    MANAGER.initialize(config.Config())
+    for file in files:
+        as_tree = MANAGER.build_tree(read_source(file))
+        all_positions = PositionIndex(as_tree)._positions
+        positions = all_positions[:: max(1, len(all_positions) // NUM_QUERIES)]
+        _, walk_time = timed(walk_queries, as_tree, positions)
+        _, index_time = timed(index_queries, as_tree, positions)
+        print(
+            "{}: {} positions, {} queries, walk {:.3f}s, index (with its build) {:.3f}s ({:.0f}x)".format(
+                file, len(all_positions), len(positions) * 2, walk_time, index_time, walk_time / index_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(get_files())
@@ -0,0 +1,35 @@
+"""Compare the number of phi functions and the time of the SSA conversion with and without pruning.
+Usage: benchmark_pruned_ssa.py [python files...], default to the examples of klara.
+"""
+from benchmark_utils import ROOT, get_files, read_source, timed
+
+from klara.core import cfg, config
+from klara.core.manager import AstManager
+
+MANAGER = AstManager()
+
+
+def convert(source, pruned_ssa):
+    MANAGER.config.pruned_ssa = pruned_ssa
+    as_tree = MANAGER.build_tree(source)
+    cfg_real = cfg.Cfg(as_tree)
+    phi_count = MANAGER.phi_count
+    _, duration = timed(cfg_real.convert_to_ssa)
+    return MANAGER.phi_count - phi_count, duration
+
+
+def main(files):
+    MANAGER.initialize(config.Config())
+    for file in files:
+        source = read_source(file)
+        all_phi, all_time = convert(source, False)
+        pruned_phi, pruned_time = convert(source, True)
+        print(
+            "{}: {} phi functions ({:.3f}s), pruned: {} phi functions ({:.3f}s)".format(
+                file, all_phi, all_time, pruned_phi, pruned_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(get_files(sorted(str(p.relative_to(ROOT)) for p in ROOT.glob("klara/examples/**/*.py"))))
@@ -0,0 +1,69 @@
+"""Measure the time of scope() and statement() of every node of a module, the first resolution and the repeated
+ones, and the time to build the cfg, SSA and conditions and infer every call of a generated module, which resolve
+the scope and statement of the nodes along the way.
+Usage: benchmark_scope_resolution.py [python files...], default to some of the modules of klara.
+"""
+from benchmark_utils import generate_functions, get_files, read_source, timed
+
+from klara.core import cfg, config, nodes
+from klara.core.bases import BaseNode
+from klara.core.manager import AstManager
+
+MANAGER = AstManager()
+REPEAT = 10
+FUNCTION = """\
+def func_{0}(a, b):
+    c = [a, (b, {{"k": a + b * (a - b) // 2}})]
+    if a > b and c[1][0] < 2 or not (a == b):
+        c = c + [(a * b) + (a - (b + (a * (b - 1))))]
+    return c[0] + helper(b, a) if a else helper(a, b)
+
+"""
+
+
+def get_nodes(as_tree):
+    found = []
+    stack = [as_tree]
+    while stack:
+        node = stack.pop()
+        found.append(node)
+        stack.extend(child for child in node.get_children() if isinstance(child, BaseNode))
+    return found
+
+
+def resolve(all_nodes):
+    for node in all_nodes:
+        try:
+            node.scope()
+            node.statement()
+        except AttributeError:
+            pass
+
+
+def build_and_infer(source):
+    as_tree = MANAGER.build_tree(source)
+    cfg_real = cfg.Cfg(as_tree)
+    cfg_real.apply_transform()
+    cfg_real.convert_to_ssa()
+    cfg_real.fill_all_conditions()
+    for node in get_nodes(as_tree):
+        if isinstance(node, nodes.Call):
+            list(node.infer())
+
+
+def main(files):
+    MANAGER.initialize(config.Config())
+    for file in files:
+        all_nodes = get_nodes(MANAGER.build_tree(read_source(file)))
+        _, first = timed(resolve, all_nodes)
+        repeated = sum(timed(resolve, all_nodes)[1] for _ in range(REPEAT)) / REPEAT
+        print(
+            "{}: {} nodes, first {:.2f}ms, repeated {:.2f}ms".format(file, len(all_nodes), first * 1e3, repeated * 1e3)
+        )
+    source = "def helper(a, b):\n    return a\n\n" + generate_functions(100, FUNCTION)
+    _, duration = timed(build_and_infer, source)
+    print("100 functions, cfg, ssa, conditions and inference of calls: {:.3f}s".format(duration))
+
+
+if __name__ == "__main__":
+    main(get_files())
@@ -0,0 +1,44 @@
+"""Compare the time to build the tree, cfg, SSA and conditions with the time to load them from the snapshot
+(--snapshot-cache-dir).
+Usage: benchmark_snapshot.py [python files...], default to some of the modules of klara.
+"""
+import pathlib
+import tempfile
+
+from benchmark_utils import get_files, read_source, timed
+
+from klara.klara_z3.cov_manager import CovManager
+from klara.scripts.cover_gen_ins import config
+
+MANAGER = CovManager()
+
+
+def run(source):
+    as_tree = MANAGER.build_tree(source)
+    return len(MANAGER.build_cfg(as_tree).block_list)
+
+
+def main(files):
+    MANAGER.initialize(config.ConfigNamespace())
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for file in files:
+            source = read_source(file)
+            MANAGER.config.snapshot_cache_dir = None
+            num_blocks, build_time = timed(run, source)
+            MANAGER.config.snapshot_cache_dir = cache_dir
+            # the first run saves the snapshot
+            _, save_time = timed(run, source)
+            loaded_blocks, load_time = timed(run, source)
+            assert loaded_blocks == num_blocks, (loaded_blocks, num_blocks)
+            snapshot_size = sum(f.stat().st_size for f in pathlib.Path(cache_dir).iterdir())
+            for f in pathlib.Path(cache_dir).iterdir():
+                f.unlink()
+            print(
+                "{}: {} blocks, build {:.3f}s, build + save {:.3f}s, load {:.3f}s ({:.1f}x), snapshot {:.1f} Kb".format(
+                    file, num_blocks, build_time, save_time, load_time, build_time / load_time, snapshot_size / 1024
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(get_files())
@@ -0,0 +1,42 @@
+"""Measure the time of every phase of the SSA construction of a generated module, and the time to pickle and
+unpickle the tree and cfg with `snapshot.Snapshot`, which is the least cost of moving the SSA of a scope computed
+in another process back to the module tree.
+Usage: benchmark_ssa_phases.py [number of functions], default to 300 functions.
+"""
+import io
+
+from benchmark_utils import generate_functions, get_number, timed
+
+from klara.core import cfg, config, snapshot
+from klara.core.manager import AstManager
+
+MANAGER = AstManager()
+
+
+def timed_phase(phases, name, func, *args):
+    phases.append((name, timed(func, *args)[1]))
+
+
+def main(num_functions):
+    MANAGER.initialize(config.Config())
+    as_tree = MANAGER.build_tree(generate_functions(num_functions))
+    cfg_real = cfg.Cfg(as_tree)
+    cfg_real.apply_transform()
+    phases = []
+    timed_phase(phases, "dominance frontier", cfg_real.fill_df)
+    timed_phase(phases, "initial info", cfg_real.gather_initial_info)
+    timed_phase(phases, "phi functions", cfg_real.ins_phi_function)
+    timed_phase(phases, "renaming", cfg_real.rename_to_ssa)
+    timed_phase(phases, "conditions", cfg_real.fill_all_conditions)
+    total = sum(duration for _, duration in phases)
+    file = io.BytesIO()
+    timed_phase(phases, "pickle tree and cfg", snapshot.Snapshot(MANAGER.builtins_tree).dump, file, as_tree, cfg_real)
+    file.seek(0)
+    timed_phase(phases, "unpickle tree and cfg", snapshot.Snapshot(MANAGER.builtins_tree).load, file)
+    print("{} functions, {} blocks, ssa and conditions {:.3f}s".format(num_functions, len(cfg_real.block_list), total))
+    for name, duration in phases:
+        print("{}: {:.3f}s ({:.0f}%)".format(name, duration, duration / total * 100))
+
+
+if __name__ == "__main__":
+    main(get_number(300))
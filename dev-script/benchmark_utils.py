@@ -0,0 +1,79 @@
+"""Helpers shared by the benchmark_*.py scripts. The scripts are run from the root of the repository, e.g.
+PYTHONPATH=. python dev-script/benchmark_visitors.py [python files...]
+"""
+import pathlib
+import sys
+import time
+
+from klara.core.cfg import Cfg, RawBasicBlock
+
+ROOT = pathlib.Path(__file__).parent.parent
+DEFAULT_FILES = (
+    "klara/core/bases.py",
+    "klara/core/scoped_node_classes.py",
+    "klara/core/utilities.py",
+    "klara/scripts/py_check/fcf_solver.py",
+)
+# function with a loop and nested branches, `{0}` is the number of the function
+FUNCTION = """\
+def func_{0}(a, b):
+    c = 0
+    for i in range(a):
+        if i > b:
+            c = c + i
+        elif i == b:
+            c = c - 1
+        else:
+            while c < b:
+                c = c + 2
+    return c + a
+
+"""
+
+
+def get_files(default=DEFAULT_FILES):
+    """return the files given in the command line, or `default`"""
+    return sys.argv[1:] or default
+
+
+def get_number(default):
+    """return the number given as the first argument of the command line, or `default`"""
+    return int(sys.argv[1]) if len(sys.argv) > 1 else default
+
+
+def read_source(file):
+    """return the content of `file`, relative to the root of the repository"""
+    return (ROOT / file).read_text()
+
+
+def generate_functions(num_functions, function=FUNCTION):
+    return "".join(function.format(i) for i in range(num_functions))
+
+
+def build_diamonds(num_blocks):
+    """return the blocks of a chain of if/else diamonds, with a loop back edge every 10 diamonds"""
+    blocks = []
+    prev = None
+    loop_head = None
+    for i in range(0, num_blocks - 3, 4):
+        head, left, right, join = (RawBasicBlock(i, i, name="L{}".format(i + n)) for n in range(4))
+        blocks.extend((head, left, right, join))
+        Cfg.connect_2_blocks(prev, head)
+        Cfg.connect_2_blocks(head, left)
+        Cfg.connect_2_blocks(head, right)
+        Cfg.connect_2_blocks(left, join)
+        Cfg.connect_2_blocks(right, join)
+        if loop_head is None:
+            loop_head = head
+        elif (i // 4) % 10 == 9:
+            Cfg.connect_2_blocks(join, loop_head)
+            loop_head = None
+        prev = join
+    return blocks
+
+
+def timed(func, *args):
+    """call func(*args), return its result and the time it took in seconds"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
@@ -0,0 +1,44 @@
+"""Measure the time of the whole tree walks of the visitors, and the time to rewrite the tree with TreeRewriter.
+Usage: benchmark_visitors.py [python files...], default to some of the modules of klara.
+"""
+import ast
+
+from benchmark_utils import get_files, read_source, timed
+
+from klara.core import config, ssa_visitors
+from klara.core.manager import AstManager
+from klara.core.tree_rewriter import TreeRewriter
+
+MANAGER = AstManager()
+REPEAT = 20
+
+
+def repeat(func, *args):
+    for _ in range(REPEAT):
+        func(*args)
+
+
+def repeated(func, *args):
+    return timed(repeat, func, *args)[1] / REPEAT
+
+
+def main(files):
+    MANAGER.initialize(config.Config())
+    total = {}
+    for file in files:
+        source = read_source(file)
+        as_tree = MANAGER.build_tree(source)
+        durations = {
+            "rewrite": repeated(lambda: TreeRewriter().visit_module(ast.parse(source))),
+            "VariableGetter": repeated(ssa_visitors.VariableGetter.get_variable, as_tree),
+            "AstAttrSeparator": repeated(lambda: ssa_visitors.AstAttrSeparator().visit(as_tree)),
+            "NodeFinder": repeated(ssa_visitors.NodeFinder(lambda node: False).execute, as_tree),
+        }
+        print(file + ": " + ", ".join("{} {:.2f}ms".format(name, d * 1000) for name, d in durations.items()))
+        for name, d in durations.items():
+            total[name] = total.get(name, 0) + d
+    print("total: " + ", ".join("{} {:.2f}ms".format(name, d * 1000) for name, d in total.items()))
+
+
+if __name__ == "__main__":
+    main(get_files())
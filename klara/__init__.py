@@ -33,7 +33,8 @@ initialize()
 
 
 def parse(source: str, py2: bool = False) -> Module:
-    """parse python code as ast, apply analysis transformation and return modified tree
+    """parse python code as ast, apply analysis transformation and return modified tree.
+    With `module_cache` set in the config, the same tree is returned for the same source and config.
     :param source: python source file as string
     :param py2: True if `source` is python 2, False if it's in python 3
     :return: a modified abstract syntax tree with inference support
@@ -36,7 +36,8 @@ def add_general_option(parser):
     parser.add_argument(
         "--statistics",
         type=configargparse.FileType("w"),
-        help="Dump the inference and other statistics to the file specified.",
+        help="Dump the inference and other statistics to the file specified, "
+        "including the time taken by every inference handler in json.",
     )
 
 
@@ -74,6 +75,74 @@ def add_analysis_related_group(parser):
         type=int,
     )
 
+    parser.add_argument(
+        "--stream-inference",
+        help="yield inference results as soon as they're inferred, and the combination of the duplicated results "
+        "once all the results are inferred, instead of inferring all the results first.",
+        dest="stream_inference",
+        default=False,
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--pruned-ssa",
+        help="insert phi functions only where the variables are live (pruned SSA), "
+        "to reduce the number of phi functions to infer.",
+        dest="pruned_ssa",
+        default=False,
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--lazy-ssa",
+        help="construct the SSA form and conditions of functions and methods only when they're first inferred, "
+        "to save the time on functions that are never analyzed.",
+        dest="lazy_ssa",
+        default=False,
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--infer-cache-max-entries",
+        help="specify the maximum number of inference results to cache. Default is unlimited",
+        dest="infer_cache_max_entries",
+        metavar="<NUMBER>",
+        type=int,
+    )
+
+    parser.add_argument(
+        "--infer-cache-max-mb",
+        help="specify the approximate memory limit in Mb of the inference cache. Default is unlimited",
+        dest="infer_cache_max_mb",
+        metavar="<NUMBER>",
+        type=float,
+    )
+
+    parser.add_argument(
+        "--infer-cache-dir",
+        help="specify the directory to persist inference summaries across runs. Disabled by default",
+        dest="infer_cache_dir",
+        metavar="<DIRECTORY>",
+    )
+
+    parser.add_argument(
+        "--snapshot-cache-dir",
+        help="specify the directory to store the snapshot of the parsed tree with its cfg and SSA form, "
+        "to load instead of rebuilding them for unchanged files. Disabled by default",
+        dest="snapshot_cache_dir",
+        metavar="<DIRECTORY>",
+    )
+
+    parser.add_argument(
+        "--module-cache",
+        help="specify the number of modules of which the tree and cfg are kept, to reuse them for the files with "
+        "the same path, source and config instead of building them again. The same tree is then analyzed again. "
+        "Disabled by default",
+        dest="module_cache",
+        metavar="<NUMBER>",
+        type=int,
+    )
+
     parser.add_argument(
         "--infer-extension",
         help="specify the external custom inference module to load.",
@@ -1,5 +1,29 @@
+import itertools
 from collections import deque
 
+# bumped on every change of the edges between the blocks, the cached orders of the blocks are keyed by it
+_edge_version = 0
+
+
+def edge_version():
+    return _edge_version
+
+
+def connect_blocks(block1, block2):
+    """add the edge from block 1 to block 2"""
+    global _edge_version
+    block1.nxt_block_list.append(block2)
+    block2.prev_block_list.append(block1)
+    _edge_version += 1
+
+
+def disconnect_blocks(block1, block2):
+    """remove the edge from block 1 to block 2"""
+    global _edge_version
+    block1.nxt_block_list.remove(block2)
+    block2.prev_block_list.remove(block1)
+    _edge_version += 1
+
 
 def is_blocks_same(block1, block2):
     if block1.start_line == block2.start_line and block1.end_line == block2.end_line and block1.name == block2.name:
@@ -13,6 +37,8 @@ class GraphWalker:
         self._call_str = ""
         self.closed_block = set()
         self.queue = deque()
+        # blocks in the queue
+        self.queued_block = set()
         self.blocked_by_call_string = dict()
         self.processed_call_string = set()
 
@@ -20,70 +46,126 @@ class GraphWalker:
         if not self.root:
             return
         self.queue.append(self.root)
+        self.queued_block.add(self.root)
         for block in self._walk_bfs():
             yield block
 
     def _walk_bfs(self):
         while len(self.queue) != 0:
             block = self.queue.popleft()
+            self.queued_block.discard(block)
             if block:
                 yield block
                 for nxt_blk in block.nxt_block_list:
-                    if nxt_blk not in self.queue and nxt_blk not in self.closed_block:
+                    if nxt_blk not in self.queued_block and nxt_blk not in self.closed_block:
                         self.queue.append(nxt_blk)
+                        self.queued_block.add(nxt_blk)
                 self.closed_block.add(block)
 
     def walk_dfs(self):
-        walk_record = []
-        for block in self._walk_dfs(walk_record, self.root):
-            yield block
-
-    def _walk_dfs(self, walk_record, basic_block):
         """
-        yield nodes from bottom
+        yield nodes from bottom, i.e. postorder
         :return:
         """
-        if basic_block is None:
+        if self.root is None:
             return
-        walk_record.append(basic_block)
-        for next_block in basic_block.nxt_block_list:
-            if next_block not in walk_record and next_block is not None:
-                for block in self._walk_dfs(walk_record, next_block):
-                    yield block
-        for block in reversed(self.queue):
-            if block not in walk_record and block is not None:
-                for block in self._walk_dfs(walk_record, block):
-                    yield block
-        yield basic_block
+        walk_record = {self.root}
+        stack = [(self.root, self._dfs_successors(self.root))]
+        while stack:
+            basic_block, successors = stack[-1]
+            for next_block in successors:
+                if next_block not in walk_record and next_block is not None:
+                    walk_record.add(next_block)
+                    stack.append((next_block, self._dfs_successors(next_block)))
+                    break
+            else:
+                stack.pop()
+                yield basic_block
+
+    def _dfs_successors(self, basic_block):
+        return itertools.chain(basic_block.nxt_block_list, reversed(self.queue))
 
 
 def delete_node(root, block_to_delete):
-    delete_record = []
-    root = _delete_node(delete_record, root, block_to_delete)
-    return root
-
-
-def _delete_node(delete_record, root, block_to_delete):
-    if is_blocks_same(root, block_to_delete) or root is None:
+    """disconnect the blocks same as `block_to_delete` from the blocks reachable from `root` without passing through
+    them. Return None if `root` is the block to delete
+    """
+    if root is None or is_blocks_same(root, block_to_delete):
         return None
-
-    delete_record.append(root)
-    for next_block_num in range(len(root.nxt_block_list)):
-        if root.nxt_block_list[next_block_num] not in delete_record:
-            root.nxt_block_list[next_block_num] = _delete_node(
-                delete_record, root.nxt_block_list[next_block_num], block_to_delete
-            )
-
-    # no child left, return yourself
+    # the walker reads the successors of a block after it's yielded, the disconnected blocks are not visited
+    for block in GraphWalker(root).walk_bfs():
+        for nxt_block in [blk for blk in block.nxt_block_list if is_blocks_same(blk, block_to_delete)]:
+            disconnect_blocks(block, nxt_block)
     return root
 
 
 def find_blocks_involved(root, block_list):
     if root not in block_list:
         block_list.append(root)
-    block_involved = []
-    for block in GraphWalker(root).walk_bfs():
-        block_involved.append(block)
+    block_involved = set(GraphWalker(root).walk_bfs())
     # to preserve the sequence of block_list
     result = [blk for blk in block_list if blk in block_involved]
     return result
+
+
+def compute_idoms(succs, roots):
+    """compute the immediate dominators with the Cooper-Harvey-Kennedy iterative algorithm.
+    The graph is given in integer ids, and all the roots are treated as the successors of a
+    virtual root, so that multiple entries are supported.
+    :param succs: list of successors ids, indexed by the node id
+    :param roots: ids of the entries of the graph
+    :return: list of immediate dominator id, indexed by the node id. -1 for the roots,
+        and None for the nodes that are unreachable from the roots.
+    """
+    num = len(succs)
+    virtual_root = num
+    succs = list(succs) + [list(roots)]
+    # iterative dfs to get the postorder number of every reachable node
+    postorder_num = [-1] * (num + 1)
+    visited = [False] * (num + 1)
+    order = []
+    visited[virtual_root] = True
+    stack = [(virtual_root, iter(succs[virtual_root]))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if not visited[child]:
+                visited[child] = True
+                stack.append((child, iter(succs[child])))
+                break
+        else:
+            stack.pop()
+            postorder_num[node] = len(order)
+            order.append(node)
+    preds = [[] for _ in range(num + 1)]
+    for node in order:
+        for child in succs[node]:
+            preds[child].append(node)
+
+    idom = [None] * (num + 1)
+    idom[virtual_root] = virtual_root
+    changed = True
+    while changed:
+        changed = False
+        # reverse postorder, skipping the virtual root
+        for node in reversed(order[:-1]):
+            new_idom = None
+            for pred in preds[node]:
+                if idom[pred] is None:
+                    continue
+                if new_idom is None:
+                    new_idom = pred
+                    continue
+                # intersect the 2 dominator chains
+                finger1, finger2 = pred, new_idom
+                while finger1 != finger2:
+                    while postorder_num[finger1] < postorder_num[finger2]:
+                        finger1 = idom[finger1]
+                    while postorder_num[finger2] < postorder_num[finger1]:
+                        finger2 = idom[finger2]
+                new_idom = finger1
+            if idom[node] != new_idom:
+                idom[node] = new_idom
+                changed = True
+    idom.pop()
+    return [-1 if d == virtual_root else d for d in idom]
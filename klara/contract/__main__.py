@@ -31,12 +31,14 @@ def parse_args(args, namespace=None):
     parser.parse_args(args, namespace=namespace)
 
 
-def run(input_str: str, input_file_name: str):
-    tree = MANAGER.build_tree(ast_str=input_str)
+def run(input_str: str, input_file_name: str, input_path=None):
+    tree = MANAGER.build_tree(ast_str=input_str, path=input_path)
     cfg = MANAGER.build_cfg(tree)
     cs = solver.ContractSolver(cfg, tree, input_file_name)
     MANAGER.logger.info("CONTRACT", "Running algorithm on file: {}", input_file_name)
     module = cs.solve()
+    MANAGER.save_persistent_cache()
+    MANAGER.dump_statistics()
     return astor.to_source(module.to_ast())
 
 
@@ -47,7 +49,7 @@ def main():
     cli.print_info(c)
     input_file = pathlib.Path(c.input_test_file)
     if input_file.exists():
-        output_test = run(input_file.read_text(), input_file.stem)
+        output_test = run(input_file.read_text(), input_file.stem, input_file)
         output_file = c.get_output_file()
         MANAGER.logger.info("CONTRACT", "Converting inferred test case to ast and write to file: {}", output_file)
         with open(output_file, "w") as f:
@@ -142,7 +142,7 @@ class ContractSolver(recipe.ClassInstanceBuilder):
                 )
                 return None
             post_conditions.extend(self._gather_conditions(new_args, cond))
-        ret_val.z3_assumptions.add(z3.And(post_conditions))
+        ret_val.z3_assumptions |= {z3.And(post_conditions)}
 
     def solve_function(self, func: nodes.FunctionDef) -> TestCase:
         def log():
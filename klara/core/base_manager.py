@@ -8,13 +8,18 @@ properties for all instances.
 """
 import collections
 import datetime
+import functools
 import linecache
 import logging
 import os
 import sys
 import tracemalloc
+import weakref
 from textwrap import dedent
 
+from .infer_cache import InferCache
+from .profiler import InferProfiler
+
 
 class Message:
     def __init__(self, fmt, *args):
@@ -55,6 +60,12 @@ class BaseManager:
                 format="(%(levelname)s) - %(message)s",
             )
 
+        self.profiler.clear()
+        self.profiler.enabled = bool(getattr(config, "statistics", None))
+        self.infer_cache.set_limits(
+            getattr(config, "infer_cache_max_entries", None),
+            (getattr(config, "infer_cache_max_mb", None) or 0) * 1024 * 1024,
+        )
         if config.display_mem_usage:
             tracemalloc.start()
             for log_method_repr in self._LOG_METHOD_REPR:
@@ -73,15 +84,28 @@ class BaseManager:
             self.logger = FlowMsgAdapter(logging.getLogger("PYSCA"), {})
             for log_method_repr in self._LOG_METHOD_REPR:
                 log_method = getattr(self.logger, log_method_repr)
-                setattr(self.logger, log_method_repr, CustomLogger(log_method))
+                level = getattr(logging, log_method_repr.upper(), logging.ERROR)
+                is_enabled = functools.partial(self.logger.isEnabledFor, level)
+                setattr(self.logger, log_method_repr, CustomLogger(log_method, is_enabled=is_enabled))
             self.logger.debug("INITIALIZE", "First initialization of manager object")
             # cache for inferring to save time.
-            self.infer_cache = {}
+            self.infer_cache = InferCache()
+            # map of pivot -> {hash of operand: bit of the operand} of the selected operands of the inference
+            # results, see `utilities.SelectedOperand`. Replaced with the inference cache clear, the results kept
+            # across the clear still refer to the previous one.
+            self.operand_bits = {}
+            # per handler statistics, enabled by --statistics
+            self.profiler = InferProfiler()
             self.infer_count = 0
             self.skipped_infer_count = 0
             self.skipped_same_operand_count = 0
             self.skipped_same_operand_nested_count = 0
             self.skipped_z3_operand = 0
+            # number of phi functions inserted, and the number without pruning (see `Config.pruned_ssa`)
+            self.phi_count = 0
+            self.unpruned_phi_count = 0
+            # scopes whose ssa is constructed on the first inference, see `Config.lazy_ssa`
+            self.deferred_scopes = weakref.WeakSet()
 
     def get_infer_statistics(self):
         return dedent(
@@ -91,6 +115,11 @@ class BaseManager:
                 skipped operand: {}
                 skipped operand nested: {}
                 skipped z3 expr: {}
+                infer cache hits: {}
+                infer cache misses: {}
+                infer cache evictions: {}
+                infer cache entries: {} (~{:.1f} Mb)
+                phi functions: {} (without pruning: {})
             """
         ).format(
             self.infer_count,
@@ -98,13 +127,51 @@ class BaseManager:
             self.skipped_same_operand_count,
             self.skipped_same_operand_nested_count,
             self.skipped_z3_operand,
+            self.infer_cache.hits,
+            self.infer_cache.misses,
+            self.infer_cache.evictions,
+            len(self.infer_cache),
+            self.infer_cache.total_bytes / 1024 / 1024,
+            self.phi_count,
+            self.unpruned_phi_count,
         )
 
+    def get_infer_counters(self):
+        return {
+            "infer": self.infer_count,
+            "skipped_infer": self.skipped_infer_count,
+            "skipped_operand": self.skipped_same_operand_count,
+            "skipped_operand_nested": self.skipped_same_operand_nested_count,
+            "skipped_z3_expr": self.skipped_z3_operand,
+            "infer_cache_hits": self.infer_cache.hits,
+            "infer_cache_misses": self.infer_cache.misses,
+            "infer_cache_evictions": self.infer_cache.evictions,
+            "infer_cache_entries": len(self.infer_cache),
+            "phi_functions": self.phi_count,
+            "unpruned_phi_functions": self.unpruned_phi_count,
+        }
+
+    def build_deferred_scopes(self, node):
+        """construct the deferred ssa of the scopes containing `node`, if there is any"""
+        if not self.deferred_scopes:
+            return
+        scope = node
+        while scope is not None:
+            try:
+                scope = scope.scope()
+            except AttributeError:
+                return
+            if scope in self.deferred_scopes:
+                self.deferred_scopes.discard(scope)
+                scope.refer_to_block.build_deferred()
+            scope = scope.parent
+
     def uninitialize(self):
         self.clear_infer_cache()
 
     def clear_infer_cache(self):
-        self.infer_cache = {}
+        self.infer_cache.clear()
+        self.operand_bits = {}
 
     def reset(self):
         BaseManager.core = {}
@@ -152,8 +219,10 @@ class CustomLogger:
     [COV] Running cov took 00:00:01.231
     """
 
-    def __init__(self, ori_log_method, display_mem=False):
+    def __init__(self, ori_log_method, display_mem=False, is_enabled=None):
         self.ori_log_method = ori_log_method
+        # function returning False if the messages are discarded, to skip preparing them
+        self.is_enabled = is_enabled or (lambda: True)
         self.initial_time = None
         self.final_time = None
         self.msg = ""
@@ -164,6 +233,10 @@ class CustomLogger:
 
     def __call__(self, operation="", msg="", *args, display_mem=False, **kwargs):
         self.display_mem_individual = display_mem
+        if not self.is_enabled():
+            # the message is still needed when used as context manager
+            self.msg = msg
+            return self
         msg = dedent(msg)
         if not operation:
             self.msg = msg
@@ -2,17 +2,66 @@ import copy
 from collections import deque
 
 from . import exceptions
+from .decorators import lazyslot
 
+# incremented whenever a node is moved to another parent, which invalidates the scope and statement resolved by every
+# node. Giving a node its first parent keeps them, no node can resolve through a node without a parent
+_parent_generation = 0
+
+
+class _Parent:
+    """The parent of the node, stored in the slot `parent_`."""
+
+    __slots__ = ()
+
+    def __get__(self, inst, objtype=None):
+        if inst is None:
+            return self
+        return inst.parent_
+
+    def __set__(self, inst, parent):
+        global _parent_generation
+        try:
+            # read the slot itself, the proxies forward the missing attributes
+            old_parent = _parent_slot.__get__(inst)
+        except AttributeError:
+            old_parent = None
+        if old_parent is not None and old_parent is not parent:
+            _parent_generation += 1
+        inst.parent_ = parent
 
-class BaseNode:
-    """The base node for every newly created node"""
 
+class BaseNode:
+    """The base node for every newly created node.
+    Nodes are slotted to keep the tree compact, every subclass declares the attributes it sets in `__slots__`.
+    """
+
+    __slots__ = (
+        "lineno",
+        "col_offset",
+        "parent_",
+        "resolved_",
+        "refer_to_block",
+        "explicit_inference",
+        "__weakref__",
+    )
     _fields = ()
+    # the name of the method of the visitor in accept()
+    _visit_method = "visit_basenode"
+    parent = _Parent()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visit_method = "visit_" + cls.__name__.lower()
 
     def __init__(self, lineno=None, col_offset=None, parent=None, refer_to_block=None):
         self.lineno = lineno
         self.col_offset = col_offset
-        self.parent = parent
+        # the first parent of the node, no need to go through `_Parent`
+        self.parent_ = parent
+        # [parent generation, scope, statement] resolved by scope() and statement(), reset when any node is moved to
+        # another parent, e.g. when a transform replaces a subtree
+        self.resolved_ = None
         self.refer_to_block = refer_to_block
         # this will be set in MANAGER.transform to specify custom infer function for this node
         self.explicit_inference = None
@@ -33,8 +82,7 @@ class BaseNode:
                 return value.accept(visitor)
 
     def accept(self, visitor):
-        method = "visit_" + self.__class__.__name__.lower()
-        visitor = getattr(visitor, method, self.generic_visit)
+        visitor = getattr(visitor, self._visit_method, self.generic_visit)
         return visitor(self)
 
     def get_statements(self):
@@ -42,10 +90,23 @@ class BaseNode:
 
     def scope(self):
         """return the first containing scope"""
-        return self.parent.scope()
+        resolved = self.resolved_
+        if resolved is None or resolved[0] != _parent_generation:
+            resolved = self.resolved_ = [_parent_generation, None, None]
+        elif resolved[1] is not None:
+            return resolved[1]
+        scope = resolved[1] = self.parent_.scope()
+        return scope
 
     def statement(self):
-        return self.parent.statement()
+        """return the first containing statement"""
+        resolved = self.resolved_
+        if resolved is None or resolved[0] != _parent_generation:
+            resolved = self.resolved_ = [_parent_generation, None, None]
+        elif resolved[2] is not None:
+            return resolved[2]
+        statement = resolved[2] = self.parent_.statement()
+        return statement
 
     def get_children(self):
         for field in self._fields:
@@ -174,9 +235,15 @@ class BaseNode:
             return set()
 
 
+# the slot descriptor of the parent, see `_Parent.__set__()`
+_parent_slot = BaseNode.parent_
+
+
 class MultiLineBlock:
     """class representing multiple line e.g. FunctionDef, ClassDef, If etc..."""
 
+    __slots__ = ()
+
     def get_statements(self):
         for field, value in self.iter_fields():
             if isinstance(value, list):
@@ -185,11 +252,10 @@ class MultiLineBlock:
                         yield from item.get_statements()
 
 
-class Proxy:
-    """Temporary holding an obj"""
+class ProxyMixin:
+    """Forward the attributes that are not found to `obj`"""
 
-    def __init__(self, obj=None):
-        self.obj = obj
+    __slots__ = ()
 
     def __repr__(self):
         return "Proxy to the object: {}".format(repr(self.obj))
@@ -197,18 +263,27 @@ class Proxy:
     def __getattr__(self, item):
         if item == "obj":
             return getattr(self.__class__, "obj")
-        if item in self.__dict__:
-            return self.__dict__[item]
         return getattr(self.obj, item)
 
 
-class BaseInstance(Proxy):
-    pass
+class Proxy(ProxyMixin):
+    """Temporary holding an obj"""
+
+    def __init__(self, obj=None):
+        self.obj = obj
+
+
+class BaseInstance(ProxyMixin):
+    """Node that forwards its attributes to `obj`. It doesn't derive from Proxy to stay slotted."""
+
+    __slots__ = ()
 
 
 class BaseContainer(BaseNode, BaseInstance):
     """class for node that contain multiple element. E.g.: List, Set, Tuple, Dict"""
 
+    __slots__ = ()
+
     def get_actual_container(self):
         """return the true form of the container.
         E.g. Tuple class will return tuple[self.elts]
@@ -219,6 +294,8 @@ class BaseContainer(BaseNode, BaseInstance):
 
 
 class Sequence(BaseContainer):
+    __slots__ = ("elts", "_iter")
+
     def __init__(self, lineno, col_offset, parent, elts=None):
         super(BaseContainer, self).__init__(lineno, col_offset, parent)
         self.elts = elts
@@ -259,6 +336,8 @@ class Sequence(BaseContainer):
 
 
 class SsaBookKeeping(object):
+    __slots__ = ("counter", "var_version_list", "final_var_version")
+
     def __init__(self, counter=None, var_version_list=None):
         self.counter = counter if counter else {}
         self.var_version_list = var_version_list if var_version_list else {}
@@ -294,17 +373,26 @@ class SsaBookKeeping(object):
 
 
 class LocalsDictNode(BaseNode):
-    """"""
+    """Node with its own scope. The containers of the scope are created on the first access,
+    since most of the scopes in the builtins stubs and the unanalyzed functions are never renamed.
+    """
+
+    __slots__ = ("name", "ssa_record_", "containing_scope_", "instance_dict_", "locals_", "global_var_")
+    ssa_record = lazyslot(SsaBookKeeping)
+    # list of containing scope e.g. FunctionDef/ClassDef
+    containing_scope = lazyslot(list)
+    instance_dict = lazyslot(dict)
+    locals = lazyslot(dict)
+    # set containing variable that is labelled 'global'
+    global_var = lazyslot(dict)
 
     def __init__(self, lineno=None, col_offset=None, parent=None):
         super(LocalsDictNode, self).__init__(lineno, col_offset, parent)
-        self.ssa_record = SsaBookKeeping()
-        # list of containing scope e.g. FunctionDef/ClassDef
-        self.containing_scope = []
-        self.instance_dict = {}
-        self.locals = {}
-        # set containing variable that is labelled 'global'
-        self.global_var = {}
+        self.ssa_record_ = None
+        self.containing_scope_ = None
+        self.instance_dict_ = None
+        self.locals_ = None
+        self.global_var_ = None
 
     def scope(self):
         return self
@@ -388,6 +476,7 @@ class LocalsDictNode(BaseNode):
 
 
 class ClassInstance(LocalsDictNode, BaseInstance):
+    __slots__ = ("obj", "resolved", "target_cls")
     _other_fields = ("obj", "call_context", "resolved", "target_cls")
 
     def __init__(self, obj=None, name=None):
@@ -472,6 +561,8 @@ class ClassInstance(LocalsDictNode, BaseInstance):
 class Uninferable:
     """class that represent invalid inference result"""
 
+    __slots__ = ("msg",)
+
     def __init__(self, node=None, override_msg=None):
         self.msg = override_msg or "Inference failed for node: {}".format(node)
 
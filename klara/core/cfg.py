@@ -1,28 +1,54 @@
-import copy
 from collections import deque
 from typing import Dict, List, Tuple
 
 import klara.common.common as common
-from klara.common.cfg_common import find_blocks_involved
+from klara.common.cfg_common import compute_idoms, connect_blocks, edge_version, find_blocks_involved
 
-from . import exceptions, manager, nodes, utilities
-from .decorators import deprecated
+from . import dataflow, exceptions, manager, nodes, utilities
+from .decorators import lazyslot
 from .ssa import AttributeEnumerator, SsaCode
 from .ssa_visitors import AstAttrSeparator, VariableGetter
 from .use_def_chain import link_stmts_to_def
 
 MANAGER = manager.AstManager()
 TEMP_ASSIGN = "TempAssign"
+# shared by the blocks, an empty frozenset is not a singleton
+EMPTY_SET = frozenset()
 ineq_solver = utilities.make_import_optional(".ineq_solver", "klara.core", manager=MANAGER)
 
 
 class BlockList(list):
+    """list of blocks, with the blocks indexed by name on lookup.
+    The index maps the names to the positions of the blocks. The blocks are only appended, so the length of the list
+    is the mutation counter of the index. It's also rebuilt when the block at the position has been renamed or replaced.
+    """
+
+    def __init__(self, *args):
+        super(BlockList, self).__init__(*args)
+        self._positions = None
+        self._indexed_len = -1
+
+    def _build_index(self):
+        self._positions = {}
+        for position in range(len(self) - 1, -1, -1):
+            self._positions[self[position].name] = position
+        self._indexed_len = len(self)
+
     def get_block_by_name(self, name):
         # type: (str) -> RawBasicBlock
         if type(name) is str:
-            for block in self.__iter__():
-                if block.name == name:
-                    return block
+            rebuilt = self._indexed_len != len(self)
+            if rebuilt:
+                self._build_index()
+            position = self._positions.get(name)
+            if position is not None and self[position].name == name:
+                return self[position]
+            if not rebuilt:
+                # the blocks are renamed or replaced after indexed
+                self._build_index()
+                position = self._positions.get(name)
+                if position is not None:
+                    return self[position]
 
 
 class RawBasicBlock(object):
@@ -32,6 +58,38 @@ class RawBasicBlock(object):
     IS_TRUE_BLOCK = 0
     IS_FALSE_BLOCK = 1
 
+    __slots__ = (
+        "name",
+        "start_line",
+        "end_line",
+        "block_end_type",
+        "block_end_code",
+        "nxt_block_list",
+        "prev_block_list",
+        "dom_parent",
+        "_rev_dom_list",
+        "idom_",
+        "rev_idom",
+        "df_",
+        "var_kill_",
+        "ue_var_",
+        "live_out_",
+        "phi_",
+        "_phi_repr_",
+        "ssa_code",
+        "parent_node",
+        "scope",
+        "conditions",
+    )
+    # containers that are only needed by some phases, created on the first access
+    idom = lazyslot(list)
+    df = lazyslot(list)
+    var_kill = lazyslot(set)
+    ue_var = lazyslot(set)
+    live_out = lazyslot(set)
+    phi = lazyslot(set)
+    _phi_repr = lazyslot(set)
+
     def __init__(
         self,
         start_line=None,
@@ -56,30 +114,28 @@ class RawBasicBlock(object):
         self.block_end_code = block_end_code
         self.nxt_block_list = []
         self.prev_block_list = []
-        self.rev_dom_list = set()
+        # the immediate dominator computed by `ParentScopeBlock.fill_dominates()`. `rev_dom_list` is derived from it
+        self.dom_parent = None
+        self._rev_dom_list = EMPTY_SET
         # the forward link in the dominator tree
-        self.idom = []
+        self.idom_ = None
         # the immediate parent in the dominator tree
         self.rev_idom = None
-        self.df = []
-        self.var_kill = set()
-        self.ue_var = set()
-        self.live_out = set()
-        self.phi = set()
+        self.df_ = None
+        self.var_kill_ = None
+        self.ue_var_ = None
+        self.live_out_ = None
+        self.phi_ = None
         # phi(s) string representation to check the availability of self.phi.
         # this is needed since self.phi is using the node instead of string,
         # and we don't want duplicate.
-        self._phi_repr = set()
+        self._phi_repr_ = None
         self.ssa_code = SsaCode()
         self.parent_node = parent_node
         # a duplicate of the containing node's scope()
         self.scope = scope
         # a set of conditions ast statement that is True to reach this point.
-        self.conditions = set()
-        # dictionary containing value require to reach this block
-        self.cond_requirements = None
-        # condition cache for prompt
-        self.cond_prompt_cache = {}
+        self.conditions = EMPTY_SET
 
     @classmethod
     def from_list(cls, lst, **kwargs):
@@ -96,9 +152,25 @@ class RawBasicBlock(object):
         s = "Block {} from line {} to {}".format(self.name, self.start_line, self.end_line)
         return s
 
+    @property
+    def rev_dom_list(self):
+        """set of blocks dominating this block, including itself"""
+        if self._rev_dom_list is None:
+            doms = {self}
+            blk = self.dom_parent
+            while blk is not None:
+                doms.add(blk)
+                blk = blk.dom_parent
+            self._rev_dom_list = doms
+        return self._rev_dom_list
+
+    @rev_dom_list.setter
+    def rev_dom_list(self, value):
+        # None to derive it from `dom_parent`
+        self._rev_dom_list = value
+
     def insert_doms(self, dom_blks):
         """insert dom_blk such that dom_blks is dominating self"""
-        subtracted_blk = self.rev_dom_list - dom_blks
         self.rev_dom_list = dom_blks
 
     def get_num_of_parents(self):
@@ -112,22 +184,6 @@ class RawBasicBlock(object):
     def has_phi(self, var):
         return str(var) in self._phi_repr
 
-    def recompute_liveout(self):
-        """
-        recompute the liveout of this block
-        :return: True if changed, False if not changed
-        """
-        new_liveout = set()
-        for nxt_block in self.nxt_block_list:
-            new_liveout.update(nxt_block.ue_var)
-            calculated_lo = nxt_block.live_out - (nxt_block.live_out & nxt_block.var_kill)
-            new_liveout.update(calculated_lo)
-            MANAGER.logger.debug("SSA", "updating new liveout for block: ({}) --> {}", nxt_block, calculated_lo)
-        if len(new_liveout - self.live_out) == 0:
-            return False
-        self.live_out = new_liveout
-        return True
-
     def fill_phi(self):
         for phi_var in self.phi:
             existing_phi = self.ssa_code.get_phi_function(phi_var)
@@ -226,6 +282,21 @@ class ParentScopeBlock(RawBasicBlock):
         x = 1   ---> RawBasicBlock
     """
 
+    __slots__ = (
+        "locals",
+        "var_version_list",
+        "counter",
+        "scope_name",
+        "blocks",
+        "phi_stub_block",
+        "ast_node",
+        "is_deferred",
+        "deferred_cfg",
+        "_postorder",
+        "_reverse_postorder",
+        "_postorder_key",
+    )
+
     def __init__(
         self,
         start_line=None,
@@ -250,11 +321,35 @@ class ParentScopeBlock(RawBasicBlock):
         # ast node that this block wrapped
         self.ast_node = ast_node
         self.ssa_code.add_code(ast_node, self)
+        # the ssa of the scope is constructed on demand by `deferred_cfg`, see `Cfg.defer_scopes()`
+        self.is_deferred = False
+        self.deferred_cfg = None
+        self._postorder = None
+        self._reverse_postorder = None
+        self._postorder_key = None
 
     def get_code_to_analyse(self):
         # use to prevent analysing code in ParentScopeBlock
         yield from ()
 
+    def get_postorder(self):
+        """blocks of the scope in postorder, starting from the first block, followed by the blocks that can't be
+        reached from it. Cached until a block is added to the scope or an edge between the blocks changes"""
+        key = (len(self.blocks), edge_version())
+        if self._postorder_key != key:
+            blocks = list(self.blocks)
+            block_ids = {blk: i for i, blk in enumerate(blocks)}
+            succs = [[block_ids[nxt] for nxt in blk.nxt_block_list if nxt in block_ids] for blk in blocks]
+            self._postorder = [blocks[i] for i in dataflow.postorder(succs)]
+            self._reverse_postorder = self._postorder[::-1]
+            self._postorder_key = key
+        return self._postorder
+
+    def get_reverse_postorder(self):
+        """blocks of the scope in reverse postorder, see `get_postorder()`"""
+        self.get_postorder()
+        return self._reverse_postorder
+
     def enumerate(self, cfg_instance=None):
         # enumerate the containing scope as well
         assert len(self.ssa_code.code_list) <= 1, "must only contain 0 or 1 node"
@@ -263,77 +358,67 @@ class ParentScopeBlock(RawBasicBlock):
     def fill_dominates(self):
         """solving the data flow equations
         Dom(n) = {n} | (&=Dom(m)) where m = preds(n)
+        The immediate dominators are computed on the block ids, see `compute_idoms()`. Every block
+        without predecessor is an entry, and every block dominates the blocks that can't be reached,
+        in which case the first predecessor is the immediate dominator.
         """
         MANAGER.logger.debug("CFG", "fill dominates of block: {}", self)
-        all_set = set(self.blocks)
-        all_set.add(self)
-        for blk in self.blocks:
-            blk.insert_doms(all_set)
-        self.rev_dom_list = {self}
-        changed = True
-        while changed:
-            changed = False
-            for blk in self.blocks:
-                if len(blk.prev_block_list) > 0:
-                    preds_dom = set.intersection(*(prev.rev_dom_list for prev in blk.prev_block_list))
-                else:
-                    preds_dom = set()
-                preds_dom.add(blk)
-                if blk.rev_dom_list != preds_dom:
-                    blk.insert_doms(preds_dom)
-                    changed = True
+        scope_blocks = [self]
+        scope_blocks.extend(blk for blk in self.blocks if blk is not self)
+        block_ids = {blk: i for i, blk in enumerate(scope_blocks)}
+        succs = [[block_ids[nxt] for nxt in blk.nxt_block_list if nxt in block_ids] for blk in scope_blocks]
+        roots = [i for i, blk in enumerate(scope_blocks) if i == 0 or len(blk.prev_block_list) == 0]
+        all_set = None
+        for blk, idom_id in zip(scope_blocks, compute_idoms(succs, roots)):
+            if idom_id is None:
+                if all_set is None:
+                    all_set = set(scope_blocks)
+                blk.dom_parent = next(
+                    (prev for prev in blk.prev_block_list if prev is not blk and prev in block_ids), None
+                )
+                blk.insert_doms(all_set)
+            else:
+                blk.dom_parent = scope_blocks[idom_id] if idom_id >= 0 else None
+                blk.insert_doms(None)
         if self.ast_node:
             for scope in self.ast_node.containing_scope:
-                if scope.refer_to_block:
+                if scope.refer_to_block and not scope.refer_to_block.is_deferred:
                     scope.refer_to_block.fill_dominates()
 
     def fill_idom(self):
-        """fill `idom` and `rev_idom` of all blocks.
+        """fill `idom` and `rev_idom` of all blocks from the immediate dominators computed by `fill_dominates()`.
         This essentially build the dominator tree.
         """
-
-        def _find_idom(b, rev_doms):
-            queue = deque()
-            queue.append(b)
-            while len(queue) > 0:
-                block = queue.pop()
-                _visited.append(block)
-                for prev_blk in block.prev_block_list:
-                    if prev_blk != blk and prev_blk not in _visited:
-                        if prev_blk in rev_doms:
-                            return prev_blk
-                        else:
-                            queue.appendleft(prev_blk)
-                    else:
-                        continue
-            return None
-
         for blk in self.blocks:
-            _visited = []
-            idom_blk = _find_idom(blk, blk.rev_dom_list)
+            idom_blk = blk.dom_parent
             blk.rev_idom = idom_blk
             if idom_blk:
                 idom_blk.idom.append(blk)
                 MANAGER.logger.debug("CFG", "make block {}'s idom to point at {}", idom_blk, blk)
         if self.ast_node:
             for scope in self.ast_node.containing_scope:
-                if scope.refer_to_block:
+                if scope.refer_to_block and not scope.refer_to_block.is_deferred:
                     scope.refer_to_block.fill_idom()
 
     def fill_df(self, block_list):
+        """fill the dominance frontier with the runner algorithm, walking the dominator tree on the block ids"""
         block_list = find_blocks_involved(self, block_list)
-        for nd in block_list:
+        block_ids = {blk: i for i, blk in enumerate(block_list)}
+        rev_idom_ids = [block_ids.get(blk.rev_idom) for blk in block_list]
+        for nd_id, nd in enumerate(block_list):
             if nd.get_num_of_parents() > 1:
+                nd_idom_id = rev_idom_ids[nd_id]
                 for pred_node in nd.prev_block_list:
-                    runner = pred_node
-                    if runner in block_list:
-                        while runner is not None and runner != nd.rev_idom:
-                            runner.df.append(nd)
-                            MANAGER.logger.debug("CFG", "applying dominance frontier of block: {} to {}", runner, nd)
-                            runner = runner.rev_idom
+                    runner = block_ids.get(pred_node)
+                    while runner is not None and runner != nd_idom_id:
+                        block_list[runner].df.append(nd)
+                        MANAGER.logger.debug(
+                            "CFG", "applying dominance frontier of block: {} to {}", block_list[runner], nd
+                        )
+                        runner = rev_idom_ids[runner]
         if self.ast_node:
             for scope in self.ast_node.containing_scope:
-                if scope.refer_to_block:
+                if scope.refer_to_block and not scope.refer_to_block.is_deferred:
                     scope.refer_to_block.fill_df(scope.refer_to_block.blocks)
 
     def rename(self):
@@ -348,11 +433,17 @@ class ParentScopeBlock(RawBasicBlock):
                     # for nested labda statement
                     block = LambdaLabel(scope)
                     scope.refer_to_block = block
-                if scope.refer_to_block:
+                if scope.refer_to_block and not scope.refer_to_block.is_deferred:
                     scope.refer_to_block.rename()
             if not isinstance(self.ast_node, nodes.ClassDef):
                 super(ParentScopeBlock, self).rename()
 
+    def build_deferred(self):
+        """construct the ssa of the deferred scope, only for the first time"""
+        cfg, self.deferred_cfg = self.deferred_cfg, None
+        if cfg is not None:
+            cfg.build_deferred_scope(self)
+
     def fill_conditions(self):
         """Fill all the block with a list of conditions to reach.
         Solve for backward simple data flow equation:
@@ -362,28 +453,47 @@ class ParentScopeBlock(RawBasicBlock):
         !. Gather all prev into a list.
         2. Cancel all get_conditions_from_prev() from the list and record whatever left.
         3. Intersect the list and add with the leftover.
+
+        The blocks are visited in reverse postorder, after that only the successors of the blocks
+        with changed conditions are revisited.
         """
-        changed = True
+        blocks = self.get_reverse_postorder()
+        block_ids = {blk: i for i, blk in enumerate(blocks)}
+        succs = [[block_ids[nxt] for nxt in blk.nxt_block_list if nxt in block_ids] for blk in blocks]
         analyzed_block = set()
-        while changed:
-            changed = False
-            for blk in self.blocks:
-                if len(blk.prev_block_list) > 0:
-                    conditions = set.union(*(prev.conditions for prev in blk.prev_block_list))
-                    intersected_conditions = set.intersection(*(prev.conditions for prev in blk.prev_block_list))
-                else:
-                    conditions = intersected_conditions = set()
-                valid_condition = blk.get_conditions_from_prev(analyzed_block)
-                valid_condition = utilities.is_subset(valid_condition, conditions)
-                conditions = intersected_conditions | valid_condition
-                if blk.conditions != conditions:
-                    blk.conditions = conditions
-                    changed = True
-                analyzed_block.add(blk)
+        # identical conditions of different blocks share the same frozenset
+        interned = {}
+        # fields of the conditions of predecessors, to check the subset of split edges
+        conditions_fields = {}
+
+        def update(node):
+            blk = blocks[node]
+            prev_conditions = [prev.conditions for prev in blk.prev_block_list]
+            if len(prev_conditions) > 0:
+                conditions = frozenset(prev_conditions[0]).intersection(*prev_conditions[1:])
+            else:
+                conditions = EMPTY_SET
+            valid_condition = blk.get_conditions_from_prev(analyzed_block)
+            if valid_condition:
+                all_conditions = frozenset().union(*prev_conditions)
+                fields = conditions_fields.get(all_conditions)
+                if fields is None:
+                    fields = conditions_fields[all_conditions] = utilities.get_fields(all_conditions)
+                conditions |= utilities.is_subset(valid_condition, all_conditions, fields)
+            conditions = interned.setdefault(conditions, conditions)
+            # the split edges of the block are only taken into account by the successors once it's analyzed
+            changed = blk not in analyzed_block and len(blk.nxt_block_list) == 2
+            analyzed_block.add(blk)
+            if blk.conditions != conditions:
+                blk.conditions = conditions
+                changed = True
+            return changed
+
+        dataflow.solve_worklist(range(len(blocks)), succs, update)
 
         if self.ast_node:
             for scope in self.ast_node.containing_scope:
-                if scope.refer_to_block:
+                if scope.refer_to_block and not scope.refer_to_block.is_deferred:
                     scope.refer_to_block.fill_conditions()
 
     def apply_transform(self):
@@ -400,6 +510,8 @@ class ParentScopeBlock(RawBasicBlock):
 
 
 class FunctionLabel(ParentScopeBlock):
+    __slots__ = ("func_tail", "args")
+
     def __init__(
         self, start_line=None, end_line=None, name=None, args=None, func_name="", parent_node=None, function_node=None
     ):
@@ -433,12 +545,16 @@ class LambdaLabel(ParentScopeBlock):
     An empty block just to able to set up nested lambda
     """
 
+    __slots__ = ()
+
     def __init__(self, lambda_node):
         super(LambdaLabel, self).__init__()
         self.ast_node = lambda_node
 
 
 class ClassLabel(ParentScopeBlock):
+    __slots__ = ("func_tail", "inherit", "args")
+
     def __init__(
         self, start_line=None, end_line=None, name=None, args=None, class_name="", parent_node=None, class_node=None
     ):
@@ -468,6 +584,8 @@ class ClassLabel(ParentScopeBlock):
 
 
 class ModuleLabel(ParentScopeBlock):
+    __slots__ = ("path",)
+
     def __init__(self, name=None, parent_node=None, module_node=None):
         super(ModuleLabel, self).__init__(
             start_line=None,
@@ -483,6 +601,8 @@ class ModuleLabel(ParentScopeBlock):
 class PhiStubBlock(RawBasicBlock):
     """Block to force phi function at every scope, also forcing update var_version_list to latest"""
 
+    __slots__ = ()
+
     def __init__(self, scope=None):
         super(PhiStubBlock, self).__init__(start_line=-1, end_line=-1, scope=scope, name="PhiStub")
 
@@ -493,6 +613,8 @@ class PhiStubBlock(RawBasicBlock):
 class TempAssignBlock(RawBasicBlock):
     """block for temporary assignment for FunctionDef/ClassDef for renaming purpose"""
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super(TempAssignBlock, self).__init__(*args, **kwargs, name=TEMP_ASSIGN, block_end_type=TEMP_ASSIGN)
 
@@ -503,6 +625,11 @@ class Cfg:
         self.block_list = BlockList()
         self.globals_var = set()
         self.block_set: Dict[nodes.Variable, RawBasicBlock] = {}
+        # blocks containing a call
+        self.call_blocks = set()
+        # scopes with the ssa constructed on demand, see `defer_scopes()`
+        self.deferred_blocks = []
+        self.conditions_filled = False
 
         if as_tree is not None:
             self.as_tree = as_tree
@@ -660,8 +787,7 @@ class Cfg:
         """
         MANAGER.logger.debug("AST2CFG", "connecting block: {} to {}", block1, block2)
         if block1 is not None and block2 is not None:
-            block1.nxt_block_list.append(block2)
-            block2.prev_block_list.append(block1)
+            connect_blocks(block1, block2)
 
     def fill_df(self):
         with MANAGER.logger.info("SSA", "Calculating dominance frontier"):
@@ -669,12 +795,14 @@ class Cfg:
             self.root.fill_idom()
             self.root.fill_df(self.block_list)
 
-    def gather_initial_info(self):
+    def gather_initial_info(self, blocks=None):
         with MANAGER.logger.info("SSA", "Gathering initial information"):
-            for block in self.block_list:
+            for block in self.block_list if blocks is None else blocks:
                 for stmt in block.get_code_to_analyse():
                     sep = AstAttrSeparator()
                     sep.visit(stmt)
+                    if sep.has_call:
+                        self.call_blocks.add(block)
                     for load_var in sep.load:
                         load_var = str(load_var)
                         if load_var not in block.var_kill:
@@ -685,78 +813,176 @@ class Cfg:
                         block.var_kill.add(str(store_var))
                         self.block_set[store_var] = block
 
-    def compute_live_out(self):
+    def compute_live_out(self, all_live_blocks=(), live_at_exit=False, block_list=None):
+        """solve the liveness of all blocks with the variable names interned to bits, see `dataflow.solve_liveness()`
+        :param all_live_blocks: blocks where all variables are live on entry
+        :param live_at_exit: True if all variables are live after the blocks without successor
+        :param block_list: blocks to solve, default to all blocks
+        """
         MANAGER.logger.info("SSA", "Computing Live-out of variables")
-        changed_flag = True
-        while changed_flag:
-            changed_flag = False
-            for blocks in self.block_list:
-                if blocks.recompute_liveout():
-                    changed_flag = True
-
-    @deprecated
-    def ins_phi_function_semi_pruned(self):
-        for var in self.globals_var:
-            worklist = copy.copy(self.block_set.get(var))
-            if worklist is not None:
-                for block in worklist:
-                    for df_block in block.df:
-                        if not df_block.has_phi(var):
-                            df_block.insert_phi(var)
-                            worklist.append(df_block)
-
-    @deprecated
-    def ins_phi_function_pruned(self):
-        MANAGER.logger.info("SSA", "Inserting pruned phi function for all blocks.")
-
-        def need_phi(var, block):
-            if var not in block.ue_var:
-                if var in block.var_kill:
-                    return False
-                else:
-                    if var in block.live_out:
-                        return True
-                    else:
-                        return False
-            else:
-                return True
-
-        no_phi_block = NoPhiDict()
-        for var in self.globals_var:
-            worklist = copy.copy(self.block_set.get(var))
-            if worklist is not None:
-                for block in worklist:
-                    for df_block in block.df:
-                        if not df_block.has_phi(var) and not no_phi_block.is_contain_var_no_phi_block(var, df_block):
-                            if need_phi(var, df_block):
-                                MANAGER.logger.debug("SSA", "insert '{}' as phi function for block: {}", var, df_block)
-                                df_block.insert_phi(var)
-                            else:
-                                no_phi_block.ins_no_phi_block(var, df_block)
-                            worklist.append(df_block)
-
-    def ins_phi_function_all(self):
+        block_list = self.block_list if block_list is None else block_list
+        blocks = list(block_list)
+        block_ids = {blk: i for i, blk in enumerate(blocks)}
+        names = dataflow.BitIndex()
+        succs = []
+        gen = []
+        kill = []
+        for blk in block_list:
+            blk_succs = []
+            for nxt in blk.nxt_block_list:
+                if nxt not in block_ids:
+                    # block outside of the cfg, the liveness at the entry of the block is fixed
+                    block_ids[nxt] = len(blocks)
+                    blocks.append(nxt)
+                blk_succs.append(block_ids[nxt])
+            succs.append(blk_succs)
+            gen.append(names.to_bits(blk.ue_var))
+            kill.append(names.to_bits(blk.var_kill))
+        for blk in blocks[len(block_list) :]:
+            succs.append([])
+            gen.append(names.to_bits(blk.ue_var | (blk.live_out - blk.var_kill)))
+            kill.append(0)
+        all_names = (1 << len(names.items)) - 1
+        for blk in all_live_blocks:
+            if blk in block_ids:
+                gen[block_ids[blk]] = all_names
+        if live_at_exit:
+            exit_id = len(succs)
+            for blk_succs in succs:
+                if len(blk_succs) == 0:
+                    blk_succs.append(exit_id)
+            succs.append([])
+            gen.append(all_names)
+            kill.append(0)
+        live_out = dataflow.solve_liveness(succs, gen, kill, roots=[0] if block_list else None)
+        for blk, bits in zip(block_list, live_out):
+            blk.live_out = names.to_set(bits)
+
+    def ins_phi_function(self, blocks=None):
+        if getattr(MANAGER.config, "pruned_ssa", False):
+            self.ins_phi_function_pruned(blocks)
+        else:
+            self.ins_phi_function_all(blocks)
+
+    def ins_phi_function_all(self, blocks=None):
         with MANAGER.logger.info("SSA", "Inserting phi function for all blocks."):
-            for var, set_block in self.block_set.items():
-                worklist = deque((set_block,))
-                while len(worklist) > 0:
-                    block = worklist.pop()
-                    for df_block in block.df:
-                        if not df_block.has_phi(var):
-                            MANAGER.logger.debug("SSA", "insert '{}' as phi function for block: {}", var, df_block)
-                            df_block.insert_phi(var)
-                            worklist.append(df_block)
+            phi_count = self.insert_phi_functions(blocks=blocks)
+            MANAGER.logger.info("SSA", "inserted {} phi functions", phi_count)
+            MANAGER.phi_count += phi_count
+            MANAGER.unpruned_phi_count += phi_count
+
+    def ins_phi_function_pruned(self, blocks=None):
+        """Insert phi function only in the blocks where the variable is live on entry, i.e. pruned SSA.
+        All variables are assumed to be live at the exit of a scope, since the latest version of the variables
+        are looked up by other scopes, and at a call, since the ssa records at the call are used to infer the
+        callee. See `AttributeEnumerator.visit_call()`.
+        """
+        with MANAGER.logger.info("SSA", "Inserting pruned phi function."):
+            self.compute_live_out(self.call_blocks, live_at_exit=True, block_list=blocks)
+
+            def is_live_in(var, block):
+                var = str(var)
+                if var in block.ue_var or block in self.call_blocks:
+                    return True
+                return var in block.live_out and var not in block.var_kill
+
+            unpruned_phi_count = sum(len(phi) for phi in self.get_phi_placement(blocks=blocks).values())
+            phi_count = self.insert_phi_functions(is_live_in, blocks)
+            MANAGER.logger.info("SSA", "inserted {} phi functions, {} without pruning", phi_count, unpruned_phi_count)
+            MANAGER.phi_count += phi_count
+            MANAGER.unpruned_phi_count += unpruned_phi_count
+
+    def get_phi_placement(self, need_phi=None, blocks=None):
+        """return the phi functions to insert in every block, i.e. the iterated dominance frontier of the blocks
+        defining the variable, in dict of block -> {var repr: var}.
+        :param need_phi: function(var, block) returning False if the phi function is not needed in the block
+        :param blocks: only place the variables defined in these blocks, default to all blocks
+        """
+        placement = {}
+        blocks = None if blocks is None else set(blocks)
+        for var, set_block in self.block_set.items():
+            if blocks is not None and set_block not in blocks:
+                continue
+            var_repr = str(var)
+            worklist = [set_block]
+            while len(worklist) > 0:
+                block = worklist.pop()
+                for df_block in block.df:
+                    block_phi = placement.setdefault(df_block, {})
+                    if var_repr in block_phi or df_block.has_phi(var):
+                        continue
+                    if need_phi is None or need_phi(var, df_block):
+                        block_phi[var_repr] = var
+                        worklist.append(df_block)
+        return placement
+
+    def insert_phi_functions(self, need_phi=None, blocks=None):
+        """insert the phi functions returned by `get_phi_placement()`, return the number of phi functions inserted"""
+        phi_count = 0
+        for block, block_phi in self.get_phi_placement(need_phi, blocks).items():
+            for var in block_phi.values():
+                MANAGER.logger.debug("SSA", "insert '{}' as phi function for block: {}", var, block)
+                block.insert_phi(var)
+                phi_count += 1
+        return phi_count
 
     def rename_to_ssa(self):
         with MANAGER.logger.info("SSA", "Renaming variables using all the information gathered above."):
             self.root.rename()
 
     def convert_to_ssa(self):
+        blocks = None
+        if getattr(MANAGER.config, "lazy_ssa", False):
+            blocks = self.defer_scopes()
         self.fill_df()
-        self.gather_initial_info()
-        self.ins_phi_function_all()
+        self.gather_initial_info(blocks)
+        self.ins_phi_function(blocks)
         self.rename_to_ssa()
 
+    @staticmethod
+    def get_scope_blocks(scope_block):
+        """return the blocks of the scope and all the nested scopes"""
+        blocks = set(scope_block.blocks)
+        for scope in scope_block.ast_node.containing_scope:
+            if scope.refer_to_block:
+                blocks |= Cfg.get_scope_blocks(scope.refer_to_block)
+        return blocks
+
+    def defer_scopes(self):
+        """Defer the ssa construction of the functions and methods that are not nested in another function.
+        The dominators, phi functions, renaming and conditions of the deferred scope are computed in
+        `build_deferred_scope()`, the first time a node in the scope is inferred. See `MANAGER.build_deferred_scopes()`.
+        Return the blocks that are not deferred.
+        """
+        deferred_blocks = set()
+        scopes = [self.root.ast_node] if self.root.ast_node else []
+        while scopes:
+            for scope in scopes.pop().containing_scope:
+                if isinstance(scope, nodes.ClassDef):
+                    scopes.append(scope)
+                elif isinstance(scope, nodes.FunctionDef) and scope.refer_to_block:
+                    block = scope.refer_to_block
+                    block.is_deferred = True
+                    block.deferred_cfg = self
+                    self.deferred_blocks.append(block)
+                    deferred_blocks |= self.get_scope_blocks(block)
+                    MANAGER.deferred_scopes.add(scope)
+        MANAGER.logger.info("SSA", "deferred the ssa construction of {} scopes", len(self.deferred_blocks))
+        return [blk for blk in self.block_list if blk not in deferred_blocks]
+
+    def build_deferred_scope(self, scope_block):
+        MANAGER.logger.info("SSA", "Constructing the ssa of deferred scope: {}", scope_block)
+        scope_blocks = self.get_scope_blocks(scope_block)
+        blocks = [blk for blk in self.block_list if blk in scope_blocks]
+        scope_block.fill_dominates()
+        scope_block.fill_idom()
+        scope_block.fill_df(scope_block.blocks)
+        self.gather_initial_info(blocks)
+        self.ins_phi_function(blocks)
+        scope_block.rename()
+        if self.conditions_filled:
+            scope_block.fill_conditions()
+
     def apply_root_transform(self):
         # apply transform also to the generated statement.
         self.root.apply_transform()
@@ -768,7 +994,12 @@ class Cfg:
 
     def fill_all_conditions(self):
         with MANAGER.logger.info("SSA", "Filling all conditions in the cfg"):
+            self.conditions_filled = True
             self.root.fill_conditions()
+            for block in self.deferred_blocks:
+                if block.deferred_cfg is None:
+                    # the deferred scope has been constructed
+                    block.fill_conditions()
 
 
 class GetBlocks(object):
@@ -937,18 +1168,6 @@ class GetBlocks(object):
         return block_list_generated
 
 
-class NoPhiDict(dict):
-    def ins_no_phi_block(self, var, block):
-        if self.get(var) is None:
-            self.__setitem__(var, [block])
-
-    def is_contain_var_no_phi_block(self, var, block):
-        if self.get(var) is None:
-            return False
-        else:
-            return block in self.get(var)
-
-
 def build_blocks(*args, **kwargs):
     block_links = kwargs.get("block_links")
     block_list = []
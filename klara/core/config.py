@@ -16,6 +16,22 @@ class Config:
     html_server_port = 5000
     enable_infer_sequence = False
     statistics = None
+    # limits of the inference cache. None means unlimited
+    infer_cache_max_entries = None
+    infer_cache_max_mb = None
+    # directory of the on disk inference cache. None to disable
+    infer_cache_dir = None
+    # yield the inference results as soon as they're inferred instead of collecting them all first
+    stream_inference = False
+    # insert phi functions only where the variable is live, instead of at every dominance frontier
+    pruned_ssa = False
+    # construct the ssa of functions and methods the first time they're inferred, instead of all upfront
+    lazy_ssa = False
+    # directory of the on disk snapshot of the tree, cfg and ssa. None to disable
+    snapshot_cache_dir = None
+    # number of modules of which the tree and cfg are returned again for the same path, source, name and config.
+    # 0 to disable
+    module_cache = 0
 
     def __init__(
         self,
@@ -5,6 +5,10 @@ from . import exceptions, nodes, utilities
 from .config import Config
 
 
+_EMPTY_CHAIN_HASH = hash(())
+_EMPTY_LOCALS_HASH = hash(frozenset())
+
+
 class ConditionsMode(enum.Enum):
     """Enum for status in expanding conditions"""
 
@@ -13,13 +17,100 @@ class ConditionsMode(enum.Enum):
     IN_PROGRESS = 2
 
 
+class CallContext(dict):
+    """map of function argument -> argument of the call.
+    The hash of the items is maintained as the mapping is modified, so that the inference path
+    can be looked up without hashing all the items again.
+    """
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, *args, **kwargs):
+        super(CallContext, self).__init__(*args, **kwargs)
+        self._hash = 0
+        for item in dict.items(self):
+            self._hash ^= hash(item)
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self._hash ^= hash((key, dict.__getitem__(self, key)))
+        dict.__setitem__(self, key, value)
+        self._hash ^= hash((key, value))
+
+    def __delitem__(self, key):
+        self._hash ^= hash((key, dict.__getitem__(self, key)))
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        if key in self:
+            self._hash ^= hash((key, dict.__getitem__(self, key)))
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self._hash ^= hash(item)
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        dict.clear(self)
+        self._hash = 0
+
+    def copy(self):
+        return CallContext(self)
+
+    def __reduce__(self):
+        return CallContext, (dict(self),)
+
+    def items_hash(self):
+        """hash of all the items, independent of the insertion order"""
+        return self._hash
+
+
+class FrozenDict(dict):
+    """read-only mapping used for the scope locals snapshot at a call.
+    Any modification raise TypeError, so the hash can be computed once and kept.
+    """
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, *args, **kwargs):
+        super(FrozenDict, self).__init__(*args, **kwargs)
+        self._hash = None
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("{} is immutable".format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    pop = popitem = setdefault = update = clear = _immutable
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(dict.items(self)))
+        return self._hash
+
+    def copy(self):
+        return self
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
 class InferenceContext(object):
     """manages context for analyzing different scope"""
 
     id = 0
 
     __slots__ = (
-        "call_context",
+        "_call_context",
         "bound_instance",
         "globals_context",
         "instance_mode",
@@ -29,7 +120,10 @@ class InferenceContext(object):
         "cache",
         "is_node_ignore_mode",
         "_id",
-        "inverted_conds",
+        "_inverted_conds",
+        "_inverted_conds_hash",
+        "_decorator_ignore_hash",
+        "_call_chain_hashes",
         "model",
         "no_cache",
         "conditions_mode",
@@ -49,7 +143,7 @@ class InferenceContext(object):
         node_ignore=None,
         is_node_ignore_mode=False,
     ):
-        self.call_context = call_context if call_context else {}
+        self.call_context = call_context
         self.bound_instance = bound_instance
         # global context is used to store the context just before any call.
         self.globals_context = global_context if global_context else GlobalContext()
@@ -61,21 +155,75 @@ class InferenceContext(object):
         # original function into the decorator func)
         # see (#vqca3)
         self.decorator_ignore = decorator_ignore or set()
+        self._decorator_ignore_hash = None
         self.path = set()
         # node ignored will be substituted to the field
         # specified by the decorators @substitute(["field"])
         self.is_node_ignore_mode = is_node_ignore_mode
         # unique id for each object. Used guarantee comparison between 2 context object always stand.
         self._id = InferenceContext.id
-        self.inverted_conds = set()
+        self.inverted_conds = frozenset()
         InferenceContext.id += 1
         self.model = None
         self.no_cache = False
         self.conditions_mode = ConditionsMode.ENABLE
         self.z3_model_used = {}
         self.call_chain = collections.OrderedDict()
+        # map of function -> hash of the call nodes in call_chain up to the function.
+        # Rebuilt lazily after call_chain is modified. See `call_chain_hash()`
+        self._call_chain_hashes = None
         self.z3_result_hash = None
 
+    @property
+    def call_context(self):
+        return self._call_context
+
+    @call_context.setter
+    def call_context(self, value):
+        self._call_context = value if type(value) is CallContext else CallContext(value or ())
+
+    @property
+    def inverted_conds(self):
+        return self._inverted_conds
+
+    @inverted_conds.setter
+    def inverted_conds(self, value):
+        self._inverted_conds = value if type(value) is frozenset else frozenset(value)
+        self._inverted_conds_hash = None
+
+    @property
+    def inverted_conds_hash(self):
+        """hash of the identity of the inverted conditions, used in the fingerprint of the context.
+        Conditions are compared by value (`hash(context.inverted_conds)`) when caching the result of a phi.
+        """
+        if self._inverted_conds_hash is None:
+            self._inverted_conds_hash = hash(frozenset(id(i) for i in self._inverted_conds))
+        return self._inverted_conds_hash
+
+    @property
+    def decorator_ignore_hash(self):
+        if self._decorator_ignore_hash is None:
+            self._decorator_ignore_hash = hash(frozenset(self.decorator_ignore))
+        return self._decorator_ignore_hash
+
+    def add_decorator_ignore(self, func):
+        self.decorator_ignore.add(func)
+        self._decorator_ignore_hash = None
+
+    def fingerprint(self, node):
+        """return the hash of all the state relevant to inferring `node` in this context"""
+        return hash(
+            (
+                self.call_chain_hash(node),
+                self.globals_context.locals_hash,
+                id(node),
+                self._id,
+                self.inverted_conds_hash,
+                self.conditions_mode,
+                self.decorator_ignore_hash,
+            )
+        )
+
     def map_args_to_func(self, *args, kwargs=None, func_node=None, offset=0, remove_default=True):
         """
         map arbitrary number of args to the target func_node.
@@ -170,7 +318,7 @@ class InferenceContext(object):
                     self.call_context.pop(arg)
 
     def hash_call_context(self):
-        return hash(frozenset(self.call_context.items()))
+        return self._call_context.items_hash()
 
     def push_path(self, node):
         """to handle the inference path.
@@ -190,11 +338,32 @@ class InferenceContext(object):
             pass
 
     def add_call_chain(self, call_node, func_node):
-        self.call_chain[func_node] = call_node
+        if self.call_chain.get(func_node) is not call_node:
+            self.call_chain[func_node] = call_node
+            self._call_chain_hashes = None
 
     def remove_call_chain(self, call_node):
         if call_node in self.call_chain:
             self.call_chain.pop(call_node)
+            self._call_chain_hashes = None
+
+    def call_chain_hash(self, any_node):
+        """return the hash of `get_call_node_chain(any_node)` without walking the call chain"""
+        try:
+            scope = any_node.scope()
+        except AttributeError:
+            return _EMPTY_CHAIN_HASH
+        if not isinstance(scope, nodes.FunctionDef):
+            return _EMPTY_CHAIN_HASH
+        if self._call_chain_hashes is None:
+            self._call_chain_hashes = {}
+            chain_hash = _EMPTY_CHAIN_HASH
+            for func, call_node in self.call_chain.items():
+                chain_hash = hash((chain_hash, call_node))
+                if isinstance(func, nodes.Proxy):
+                    func = func.obj
+                self._call_chain_hashes.setdefault(func, chain_hash)
+        return self._call_chain_hashes.get(scope, _EMPTY_CHAIN_HASH)
 
     def get_call_node_chain(self, any_node):
         try:
@@ -218,12 +387,24 @@ class InferenceContext(object):
 class GlobalContext:
     """Class to store global variable for other scope"""
 
-    __slots__ = ("ssa_record", "locals")
+    __slots__ = ("ssa_record", "_locals")
 
     def __init__(self, ssa_record=None, locals=None):
         self.ssa_record = ssa_record
         self.locals = locals
 
+    @property
+    def locals(self):
+        return self._locals
+
+    @locals.setter
+    def locals(self, value):
+        self._locals = value if value is None or type(value) is FrozenDict else FrozenDict(value)
+
+    @property
+    def locals_hash(self):
+        return hash(self._locals) if self._locals else _EMPTY_LOCALS_HASH
+
     def get_latest_stmt(self, var: str):
         """return the latest statement in locals dict
         Raise exceptions.VariableNotExistStackError if it's not in locals
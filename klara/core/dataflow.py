@@ -0,0 +1,118 @@
+"""
+Iterative dataflow framework on integer block ids.
+
+The blocks are numbered by the caller, and the graph is given as lists of successor ids.
+Set of variables are interned to bits of python int by `BitIndex`, so that union, intersection
+and difference of sets are integer operations.
+"""
+import heapq
+
+
+class BitIndex:
+    """intern hashable items (e.g. variable names) to bits"""
+
+    __slots__ = ("_bits", "items")
+
+    def __init__(self):
+        self._bits = {}
+        self.items = []
+
+    def bit(self, item):
+        bit = self._bits.get(item)
+        if bit is None:
+            bit = self._bits[item] = 1 << len(self.items)
+            self.items.append(item)
+        return bit
+
+    def to_bits(self, items):
+        bits = 0
+        for item in items:
+            bits |= self.bit(item)
+        return bits
+
+    def to_set(self, bits):
+        result = set()
+        while bits:
+            lowest = bits & -bits
+            result.add(self.items[lowest.bit_length() - 1])
+            bits ^= lowest
+        return result
+
+
+def reverse_graph(succs):
+    preds = [[] for _ in succs]
+    for node, node_succs in enumerate(succs):
+        for succ in node_succs:
+            preds[succ].append(node)
+    return preds
+
+
+def postorder(succs, roots=None):
+    """postorder of the graph with iterative dfs. Nodes that can't be reached from `roots` are visited
+    after, as if they're roots. Default to visit from node 0"""
+    visited = [False] * len(succs)
+    order = []
+    for root in list(roots or ()) + list(range(len(succs))):
+        if visited[root]:
+            continue
+        visited[root] = True
+        stack = [(root, iter(succs[root]))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if not visited[child]:
+                    visited[child] = True
+                    stack.append((child, iter(succs[child])))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+    return order
+
+
+def solve_worklist(order, dependents, update):
+    """call `update(node)` until no node change.
+    Every node is visited once in `order`, after that only the dependents of a changed node are
+    revisited, still prioritized by `order`.
+    :param order: list of all node ids in the order to visit
+    :param dependents: list of ids to revisit when a node changes, indexed by node id
+    :param update: function that recompute the node, returns True if changed
+    """
+    position = [0] * len(order)
+    for pos, node in enumerate(order):
+        position[node] = pos
+    queued = [True] * len(order)
+    heap = list(range(len(order)))
+    while heap:
+        node = order[heapq.heappop(heap)]
+        queued[node] = False
+        if update(node):
+            for dependent in dependents[node]:
+                if not queued[dependent]:
+                    queued[dependent] = True
+                    heapq.heappush(heap, position[dependent])
+
+
+def solve_liveness(succs, gen, kill, roots=None):
+    """solve the live out sets
+    LiveOut(n) = | (gen(m) | (LiveOut(m) & ~kill(m))) where m = succs(n)
+    :param gen: list of bitset of upward exposed variables, indexed by node id
+    :param kill: list of bitset of variables defined, indexed by node id
+    :return: list of bitset of live out variables
+    """
+    live_out = [0] * len(succs)
+    live_in = list(gen)
+
+    def update(node):
+        out = 0
+        for succ in succs[node]:
+            out |= live_in[succ]
+        if out == live_out[node]:
+            return False
+        live_out[node] = out
+        live_in[node] = gen[node] | (out & ~kill[node])
+        return True
+
+    # backward problem, visit the successors first
+    solve_worklist(postorder(succs, roots), reverse_graph(succs), update)
+    return live_out
@@ -2,7 +2,7 @@ import functools
 import logging
 import warnings
 
-from klara.core import base_manager, context_mod
+from klara.core import base_manager, context_mod, profiler
 
 BASE_MANAGER = base_manager.BaseManager()
 
@@ -73,6 +73,57 @@ class cachedproperty:
         return val
 
 
+class lazyslot:
+    """Attribute of a class with __slots__ that is created with `factory` on the first access.
+    The value is stored in the slot `<name>_`, which must be initialized to None.
+    """
+
+    __slots__ = ("factory", "slot")
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.slot = None
+
+    def __set_name__(self, owner, name):
+        self.slot = name + "_"
+
+    def __get__(self, inst, objtype=None):
+        if inst is None:
+            return self
+        val = getattr(inst, self.slot)
+        if val is None:
+            val = self.factory()
+            setattr(inst, self.slot, val)
+        return val
+
+    def __set__(self, inst, val):
+        setattr(inst, self.slot, val)
+
+
+class cachedslot:
+    """cachedproperty for a class with __slots__. The value is stored in the slot `<property_name>_`, which must be
+    initialized to None. Setting the property to None empties the cache.
+    """
+
+    __slots__ = ("wrapped", "slot")
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+        self.slot = wrapped.__name__ + "_"
+
+    def __get__(self, inst, objtype=None):
+        if inst is None:
+            return self
+        val = getattr(inst, self.slot)
+        if val is None:
+            val = self.wrapped(inst)
+            setattr(inst, self.slot, val)
+        return val
+
+    def __set__(self, inst, val):
+        setattr(inst, self.slot, val)
+
+
 def log_yielded_result(msg, *var, log_level=logging.INFO):
     """decorators to log the yield result for any func
     the yielded result is parsed as first argument. Use {0} in the string
@@ -116,7 +167,10 @@ def lru_cache_context(user_function):
     It's different than @functools.lru_cache since it's not comparing the object itself,
     but the state.
     All the relevant attribute in context are hashed, along with the unique_id of context for
-    comparing different instances.
+    comparing different instances. The context maintains the hash of its state as it changes,
+    see `InferenceContext.fingerprint()`.
+    The results are cached once the generator is exhausted. A partly consumed generator is never resumed by
+    another caller, it runs with the context of its own caller, whose state changes as the generator runs.
     """
     # object for determining failed cached retrieving, since `None` can't be used.
     sentinel = object()
@@ -124,40 +178,29 @@ def lru_cache_context(user_function):
     def _hash(node, context):
         if not context:
             return hash(id(node))
-        call_chains = context.get_call_node_chain(node)
-        _global_context_sets = frozenset()
-        if context.globals_context.locals:
-            _global_context_sets |= frozenset(context.globals_context.locals.items())
-        return hash(
-            (
-                tuple(call_chains),
-                _global_context_sets,
-                id(node),
-                context._id,
-                frozenset({id(i) for i in context.inverted_conds}),
-                context.conditions_mode,
-                frozenset(context.decorator_ignore),
-            ),
-        )
+        return context.fingerprint(node)
 
     @functools.wraps(user_function)
     def wrapper(node, context=None, inferred_attr=None):
-        if not hasattr(BASE_MANAGER.config, "force_infer") or not BASE_MANAGER.config.force_infer:
-            if not context or not context.no_cache:
-                key = _hash(node, context)
-                result = BASE_MANAGER.infer_cache.get(key, sentinel)
-                if result is not sentinel:
-                    for res in result:
-                        yield res
-                    return
+        if (hasattr(BASE_MANAGER.config, "force_infer") and BASE_MANAGER.config.force_infer) or (
+            context and context.no_cache
+        ):
+            yield from user_function(node, context, inferred_attr)
+            return
+        key = _hash(node, context)
+        result = BASE_MANAGER.infer_cache.get(key, sentinel)
+        if BASE_MANAGER.profiler.enabled:
+            handler = getattr(type(node), "_infer", user_function)
+            BASE_MANAGER.profiler.record_cache(profiler.handler_name(handler), result is not sentinel)
+        if result is not sentinel:
+            yield from result
+            return
         # cached the result into a list
         results = []
         for res in user_function(node, context, inferred_attr):
             results.append(res)
             yield res
-        if not hasattr(BASE_MANAGER.config, "force_infer") or not BASE_MANAGER.config.force_infer:
-            if not context or not context.no_cache:
-                BASE_MANAGER.infer_cache[key] = results
+        BASE_MANAGER.infer_cache[key] = results
 
     return wrapper
 
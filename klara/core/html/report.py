@@ -1,5 +1,5 @@
 from klara.html import report
-from klara.core import manager, nodes, ssa_visitors
+from klara.core import manager, nodes
 
 MANAGER = manager.AstManager()
 
@@ -24,8 +24,7 @@ class InferHtmlReport(report.HtmlReporter):
                     -> [type] (str)
         - "status"
         """
-        nf = ssa_visitors.NodeFinder(lambda x: x.lineno == lineno and x.col_offset == col_offset)
-        node = nf.execute(self.tree)
+        node = MANAGER.get_position_index(self.tree).node_at(lineno, col_offset)
         infer_path_results = {}
         context.path.clear()
         if node:
@@ -0,0 +1,110 @@
+"""
+Bounded cache for storing the results of infer().
+Like base_manager, this module must not import any other klara module
+to avoid cyclic dependencies.
+"""
+import collections
+import sys
+
+
+def approximate_size(obj):
+    """return the approximate size in bytes of a cached value.
+    Only the container and the items one level deep are counted. The items themselves are
+    shared with the tree and other cached entries, so counting them recursively would
+    overestimate the memory held by the cache.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            if isinstance(item, (list, tuple, dict)):
+                size += approximate_size(item)
+            else:
+                size += sys.getsizeof(item)
+    elif isinstance(obj, dict):
+        for k, v in obj.items():
+            size += sys.getsizeof(k) + sys.getsizeof(v)
+    return size
+
+
+class InferCache:
+    """A LRU cache with optional limits on the number of entries and on the approximate bytes.
+    When any of the limits is exceeded, the least recently used entries are evicted until the
+    cache is within the limits again. A single value larger than `max_bytes` is never stored.
+    >>> cache = InferCache(max_entries=2)
+    >>> cache["a"], cache["b"], cache["c"] = [1], [2], [3]
+    >>> "a" in cache
+    False
+    """
+
+    __slots__ = ("max_entries", "max_bytes", "hits", "misses", "evictions", "total_bytes", "_data")
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        # map of key -> (value, approximate size of value)
+        self._data = collections.OrderedDict()
+
+    def set_limits(self, max_entries=None, max_bytes=None):
+        """change the limits, and evict entries that are not within the new limits"""
+        self.max_entries = max_entries if max_entries and max_entries > 0 else None
+        self.max_bytes = max_bytes if max_bytes and max_bytes > 0 else None
+        self._evict()
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return value
+
+    def __getitem__(self, key):
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        size = approximate_size(value)
+        if key in self._data:
+            self.total_bytes -= self._data.pop(key)[1]
+        if self.max_bytes is not None and size > self.max_bytes:
+            # storing it would evict everything else in the cache
+            self.evictions += 1
+            return
+        self._data[key] = (value, size)
+        self.total_bytes += size
+        self._evict()
+
+    def __delitem__(self, key):
+        self.total_bytes -= self._data.pop(key)[1]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def _evict(self):
+        while self._data and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._data.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """remove all entries. The hit/miss/eviction counters are kept for statistics"""
+        self._data.clear()
+        self.total_bytes = 0
+
+    def reset_statistics(self):
+        self.hits = self.misses = self.evictions = 0
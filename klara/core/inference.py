@@ -1,6 +1,5 @@
 import builtins
 import contextlib
-import copy
 import enum
 import functools
 import itertools
@@ -8,7 +7,7 @@ from typing import Union
 
 import z3
 
-from . import context_mod, decorators, exceptions, manager, nodes, utilities
+from . import context_mod, decorators, exceptions, manager, nodes, profiler, utilities
 from .node_classes import BUILT_IN_TYPE
 from .protocols import (
     BIN_OP_DUNDER_METHOD,
@@ -24,9 +23,29 @@ from .protocols import (
 
 MANAGER = manager.AstManager()
 
+_EMPTY_SET = frozenset()
+
+
+def _frozen(value):
+    return value if type(value) is frozenset else frozenset(value or ())
+
+
+def _union(shared, other):
+    """union of frozenset `shared` and `other`. `shared` is returned as is if `other` adds nothing to it"""
+    if not other:
+        return shared
+    if not shared:
+        return _frozen(other)
+    if other is shared or shared.issuperset(other):
+        return shared
+    return shared.union(other)
+
 
 class InferenceResult(object):
-    """Object for every result to `node.infer()`"""
+    """Object for every result to `node.infer()`
+    The set attributes (bound_conditions, z3_assumptions, abutments and inverted_conditions) are frozensets
+    that are shared between results, modify them by assigning a new set, e.g. `res.bound_conditions |= conds`.
+    """
 
     __slots__ = (
         "result",
@@ -39,8 +58,8 @@ class InferenceResult(object):
         "_z3_assumptions",
         "_hash_only_result",
         "_hash",
-        "abutments",
-        "inverted_conditions",
+        "_abutments",
+        "_inverted_conditions",
     )
 
     def __init__(
@@ -62,18 +81,18 @@ class InferenceResult(object):
         self.bound_instance = bound_instance
         self.infer_path = infer_path or []
         # conditions attach to the statement of inferring
-        self._bound_conditions = set()
-        self._selected_operand = {}
-        self._z3_assumptions = set()
+        self._bound_conditions = _EMPTY_SET
+        self._selected_operand = utilities.SelectedOperand()
+        self._z3_assumptions = _EMPTY_SET
         # flag to determine what field to hash. Set it to True to hash only the result.
         self._hash_only_result = False
         self._hash = None
-        self.abutments = abutments or set()
-        self.init(bound_conditions, selected_operand, inference_results)
+        self._abutments = _frozen(abutments)
         # keep track of which conditions is inverted, so that in evaluate the bound conditions path,
         # the condition might evaluated to the pre-inverted conditions that is suppose to be inverted,
         # but not, and will result in unsat
-        self.inverted_conditions = set()
+        self._inverted_conditions = _EMPTY_SET
+        self.init(bound_conditions, selected_operand, inference_results)
 
     @property
     def hash_only_result(self):
@@ -91,7 +110,7 @@ class InferenceResult(object):
     @z3_assumptions.setter
     def z3_assumptions(self, value):
         self._hash = None
-        self._z3_assumptions = value
+        self._z3_assumptions = _frozen(value)
 
     @property
     def bound_conditions(self):
@@ -100,7 +119,23 @@ class InferenceResult(object):
     @bound_conditions.setter
     def bound_conditions(self, value):
         self._hash = None
-        self._bound_conditions = value
+        self._bound_conditions = _frozen(value)
+
+    @property
+    def abutments(self):
+        return self._abutments
+
+    @abutments.setter
+    def abutments(self, value):
+        self._abutments = _frozen(value)
+
+    @property
+    def inverted_conditions(self):
+        return self._inverted_conditions
+
+    @inverted_conditions.setter
+    def inverted_conditions(self, value):
+        self._inverted_conditions = _frozen(value)
 
     @property
     def selected_operand(self):
@@ -109,24 +144,26 @@ class InferenceResult(object):
     @selected_operand.setter
     def selected_operand(self, value):
         self._hash = None
+        if type(value) is not utilities.SelectedOperand:
+            value = utilities.SelectedOperand.from_operands(value)
         self._selected_operand = value
 
     def init(self, bound_conditions=None, selected_operand=None, inference_results=None, inverted_conds=None):
         if bound_conditions:
-            self.bound_conditions |= bound_conditions
+            self.bound_conditions = _union(self._bound_conditions, bound_conditions)
         if selected_operand:
-            self.selected_operand.update(selected_operand)
+            self.selected_operand.add_operands(selected_operand)
         if inference_results:
             self.merge_other_results(inference_results)
         if inverted_conds:
-            self.inverted_conditions |= inverted_conds
+            self._inverted_conditions = _union(self._inverted_conditions, inverted_conds)
 
     def merge_other_results(self, inference_results):
         for result in inference_results:
-            self.bound_conditions |= result.bound_conditions
-            self.z3_assumptions |= result.z3_assumptions
+            self.bound_conditions = _union(self._bound_conditions, result.bound_conditions)
+            self.z3_assumptions = _union(self._z3_assumptions, result.z3_assumptions)
             self.selected_operand.update(result.selected_operand)
-            self.abutments |= result.abutments
+            self._abutments = _union(self._abutments, result.abutments)
             self.hash_only_result |= result.hash_only_result
 
     def __repr__(self):
@@ -137,9 +174,8 @@ class InferenceResult(object):
             if self.hash_only_result:
                 self._hash = hash(self.result)
             else:
-                self._hash = hash(
-                    tuple(self.bound_conditions) + (self.result, self.result_type) + tuple(self.z3_assumptions)
-                )
+                # hash of frozenset is cached by the set itself
+                self._hash = hash((self._bound_conditions, self.result, self.result_type, self._z3_assumptions))
         return self._hash
 
     @property
@@ -165,11 +201,10 @@ class InferenceResult(object):
         c = cls()
         c.result = result
         c.status = True
-        c.bound_conditions = set()
-        c.selected_operand = {}
+        c.selected_operand = utilities.SelectedOperand()
         c.hash_only_result = hash_only_result
         if abutments:
-            c.abutments |= abutments
+            c.abutments = _union(c.abutments, abutments)
         c.init(bound_conditions, selected_operand, inference_results, inverted_conds)
         try:
             if isinstance(result, (nodes.Const, nodes.NameConstant)):
@@ -183,7 +218,7 @@ class InferenceResult(object):
                 c.status = 2
             c.bound_instance = bound_instance
             r_bound = result.get_bound_conditions()
-            c.bound_conditions |= r_bound
+            c.bound_conditions = _union(c.bound_conditions, r_bound)
         except AttributeError:
             pass
         return c
@@ -198,14 +233,13 @@ class InferenceResult(object):
         abutments=None,
     ):
         c = cls()
-        c.bound_conditions = set()
-        c.selected_operand = {}
+        c.selected_operand = utilities.SelectedOperand()
         c.result_type = overwrite_type if overwrite_type else MANAGER.builtins_ast_cls[result_type]
         c.result = "<type({})>".format(c.result_type)
         c.init(inference_results=inference_results)
         c.hash_only_result = hash_only_result
         if abutments:
-            c.abutments |= abutments
+            c.abutments = _union(c.abutments, abutments)
         return c
 
     @classmethod
@@ -213,29 +247,29 @@ class InferenceResult(object):
         cls, other, bound_conditions=None, selected_operand=None, inference_results=None, inverted_conditions=None
     ):
         c = cls()
-        c.selected_operand = copy.copy(other.selected_operand)
+        c.selected_operand = other.selected_operand.copy()
         if selected_operand:
-            c.selected_operand.update(selected_operand)
+            c.selected_operand.add_operands(selected_operand)
         c.infer_path = other.infer_path
         c.result = other.result
         c.result_type = other.result_type
         c.status = other.status
         c.bound_instance = other.bound_instance
-        c.bound_conditions = copy.copy(other.bound_conditions)
-        c.z3_assumptions |= other.z3_assumptions
+        c.bound_conditions = other.bound_conditions
+        c.z3_assumptions = other.z3_assumptions
         c.hash_only_result = other.hash_only_result
-        c.abutments |= other.abutments
+        c.abutments = other.abutments
         c.init(bound_conditions, selected_operand, inference_results, inverted_conditions)
         return c
 
     def __add__(self, other):
         """merge some properties from other Inference result"""
         if other:
-            self.bound_conditions |= other.bound_conditions
+            self.bound_conditions = _union(self._bound_conditions, other.bound_conditions)
             self.selected_operand.update(other.selected_operand)
-            self.z3_assumptions |= other.z3_assumptions
+            self.z3_assumptions = _union(self._z3_assumptions, other.z3_assumptions)
             self.hash_only_result |= other.hash_only_result
-            self.abutments |= other.abutments
+            self.abutments = _union(self._abutments, other.abutments)
         return self
 
     def __radd__(self, other):
@@ -258,21 +292,7 @@ class MultiInferenceResult(InferenceResult):
 
     def combine_selected_operand(self, results):
         for res in results:
-            for k, v in res.selected_operand.items():
-                if k in self.selected_operand:
-                    if type(self.selected_operand[k]) is set:
-                        if type(v) is set:
-                            self.selected_operand[k] |= v
-                        else:
-                            self.selected_operand[k].add(v)
-                    else:
-                        val = self.selected_operand[k]
-                        if type(v) is set:
-                            self.selected_operand[k] = v | {val}
-                        else:
-                            self.selected_operand[k] = {v, val}
-                else:
-                    self.selected_operand[k] = v
+            self.selected_operand.combine(res.selected_operand)
 
     @classmethod
     def combine_inference_results(cls, results):
@@ -318,10 +338,32 @@ class UseInferredAttr(Exception):
         self.inferred_attr = kwargs
 
 
+def _stream_yield_different(results):
+    """yield the first result of every hash as soon as it's inferred, without changing it afterwards.
+    The later results with the same hash are kept, and once the inference is exhausted, the results of every hash
+    that had duplicates are combined into a new MultiInferenceResult, the same as the one yielded by the default
+    mode. The consumer will see the first result of such hash, and later its complete combination.
+    """
+    records = {}
+    for res in results:
+        res_hash = hash(res)
+        if res_hash not in records:
+            records[res_hash] = [res]
+            yield res
+        else:
+            records[res_hash].append(res)
+    for same_results in records.values():
+        if len(same_results) > 1:
+            yield MultiInferenceResult.combine_inference_results(same_results)
+
+
 def cache_yield_different(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         """when hash() return True, it will not be combined"""
+        if getattr(MANAGER.config, "stream_inference", False):
+            yield from _stream_yield_different(func(*args, **kwargs))
+            return
         _cache = {}
         results = list(func(*args, **kwargs))
         for res in results:
@@ -341,12 +383,16 @@ def cache_yield_different(func):
 @MANAGER.infer_wrapper
 def infer(self, context=context_mod.context_ins, inferred_attr=None):
     """inference entry point"""
+    MANAGER.build_deferred_scopes(self)
     inference_count = 0
     inferred_attr = {} if inferred_attr is None else inferred_attr
     has_next = True
     expl = None
+    profiling = MANAGER.profiler.enabled
     if self.explicit_inference is not None:
         expl = self.explicit_inference(self, context=context)
+        if profiling:
+            expl = MANAGER.profiler.profile(profiler.handler_name(self.explicit_inference), expl)
     while has_next:
         has_next = False
         try:
@@ -366,7 +412,10 @@ def infer(self, context=context_mod.context_ins, inferred_attr=None):
         except StopIteration:
             return
 
-        yield from self._infer(context, inferred_attr)
+        if profiling:
+            yield from MANAGER.profiler.profile(profiler.handler_name(self._infer), self._infer(context, inferred_attr))
+        else:
+            yield from self._infer(context, inferred_attr)
 
 
 @decorators.register_infer(nodes.BaseNode)
@@ -412,7 +461,7 @@ def infer_function_def(self: nodes.FunctionDef, context=context_mod.context_ins,
                         continue
                     else:
                         context.map_args_to_func(func, func_node=dec.result)
-                    context.decorator_ignore.add(func)
+                    context.add_decorator_ignore(func)
                     wrapped_decorator[:] = []
                     wrapped_decorator.extend(list(dec.result.infer_return_value(context)))
         yield from wrapped_decorator
@@ -429,10 +478,25 @@ def infer_return_value(self, context=context_mod.context_ins, inferred_attr=None
         except exceptions.UnannotatedError:
             yield InferenceResult.load_result(nodes.Uninferable(None, override_msg="node is unannotated"))
     else:
+        MANAGER.build_deferred_scopes(self)
+        summary_key = None
+        if MANAGER.persistent_cache is not None:
+            summary_key = MANAGER.persistent_cache.summary_key(self, context)
+            if summary_key is not None:
+                values = MANAGER.persistent_cache.get(summary_key)
+                if values is not None:
+                    for value in values:
+                        yield from const_factory(value)
+                    return
+        results = []
         for tail in self.refer_to_block.func_tail:
             val = tail.ssa_code.code_list[-1].value
             if val:
-                yield from val.infer(context=context)
+                for res in val.infer(context=context):
+                    results.append(res)
+                    yield res
+        if summary_key is not None:
+            MANAGER.persistent_cache.put(summary_key, results)
 
 
 @decorators.register_return_value_handler(nodes.Lambda)
@@ -909,8 +973,7 @@ def infer_phi(self: nodes.Phi, context=context_mod.context_ins, inferred_attr=No
     # hash the ifexp as well because phi and ifexp is served as the pivot point
     # for variable having different value. Different phi/ifexp will have different
     # set of value
-    call_chains = context.get_call_node_chain(self)
-    result_hash = hash((self, frozenset(context.inverted_conds), tuple(call_chains)))
+    result_hash = hash((self, context.inverted_conds, context.call_chain_hash(self)))
     for val in self.value:
         # this value might get replaced by other value in this phi function.
         curr_bound = set()
@@ -1225,7 +1288,7 @@ def infer_const_comp_op(self, op, other, _, context=None, self_result=None):
 def _make_call_from_dunder_method(instance, dunder_method, context, *args):
     call_node = _make_call_from_func(dunder_method, *args)
     # TODO: handle the scope of the function call
-    call_node.locals["scope"] = {}
+    call_node.locals["scope"] = context_mod.FrozenDict()
     context.bound_instance = instance
     yield call_node
     context.bound_instance = None
@@ -1233,7 +1296,7 @@ def _make_call_from_dunder_method(instance, dunder_method, context, *args):
 
 def _make_call_from_func(function, *args):
     call_node = nodes.Call()
-    call_node.locals["scope"] = {}
+    call_node.locals["scope"] = context_mod.FrozenDict()
     call_node.postinit(func=function, args=list(args), keywords=[])
     MANAGER.add_weak_ref(call_node)
     MANAGER.apply_transform(call_node)
@@ -1468,8 +1531,7 @@ def infer_ifexp(self, context=context_mod.context_ins, inferred_attr=None):
     # hash the ifexp as well because phi and ifexp is served as the pivot point
     # for variable having different value. Different phi/ifexp will have different
     # set of value
-    call_chains = context.get_call_node_chain(self)
-    result_hash = hash((self, frozenset(context.inverted_conds), tuple(call_chains)))
+    result_hash = hash((self, context.inverted_conds, context.call_chain_hash(self)))
     for res in self.body.infer(context):
         yield InferenceResult.from_other(res, bound_conditions={self.test}, selected_operand={result_hash: res})
     for res in self.orelse.infer(context):
@@ -3,11 +3,15 @@ import contextlib
 import copy
 import functools
 import pathlib
+import weakref
 from runpy import run_path
 
-from klara.core import nodes, utilities
+from klara.core import nodes, snapshot, utilities
 from klara.core.base_manager import BaseManager
 from klara.core.config import Config
+from klara.core.infer_cache import InferCache
+from klara.core.persistent_cache import PersistentInferCache
+from klara.core.position_index import PositionIndex
 from klara.core.protocols import (
     BIN_OP_DUNDER_METHOD,
     BIN_OP_METHOD,
@@ -51,8 +55,27 @@ class AstManager(BaseManager):
 
     def uninitialize(self):
         super(AstManager, self).uninitialize()
+        self.clear_module_cache()
+        self.save_persistent_cache()
         self.weakrefs.clear()
 
+    def get_infer_statistics(self):
+        statistics = super(AstManager, self).get_infer_statistics()
+        if self.persistent_cache is not None:
+            statistics += "persistent cache hits: {}, misses: {}\n".format(
+                self.persistent_cache.hits, self.persistent_cache.misses
+            )
+        return statistics
+
+    def dump_statistics(self):
+        """dump the statistics of every inference handler in json to the file specified by --statistics"""
+        if getattr(self.config, "statistics", None):
+            counters = self.get_infer_counters()
+            if self.persistent_cache is not None:
+                counters["persistent_cache_hits"] = self.persistent_cache.hits
+                counters["persistent_cache_misses"] = self.persistent_cache.misses
+            self.profiler.dump(self.config.statistics, counters=counters)
+
     def bootstrap_builtins(self):
         """Construct builtin class type (e.g. int, float) in ast form
         This will need to only parse builtins.pyi for the class definition,
@@ -99,6 +122,16 @@ class AstManager(BaseManager):
             # the variable map from var to z3var for all the conditions
             self.z3var_maps = {}
             # map for default value for each param
+            # on disk cache of inference summaries, enabled by config.infer_cache_dir
+            self.persistent_cache = None
+            # map of tree -> (snapshot file, loaded cfg or None), enabled by config.snapshot_cache_dir
+            self.snapshots = weakref.WeakKeyDictionary()
+            # map of tree -> PositionIndex, built on the first query of the tree
+            self.position_indexes = weakref.WeakKeyDictionary()
+            # LRU map of module key -> [tree, cfg], and of tree -> module key, enabled by config.module_cache.
+            # Unlike the inference cache, it's kept until uninitialize()
+            self.module_cache = InferCache()
+            self.module_keys = weakref.WeakKeyDictionary()
 
     @contextlib.contextmanager
     def temp_manager(self):
@@ -117,17 +150,136 @@ class AstManager(BaseManager):
         self.logger.debug("AST", "Applying transformation for tree: {}", tree)
         self.transform.visit(tree)
 
-    def build_tree(self, ast_str, name="", tree_rewriter=None):
+    def build_tree(self, ast_str, name="", tree_rewriter=None, path=None):
+        module_key = self.get_module_key(ast_str, name, path) if tree_rewriter is None else None
+        if module_key in self.module_cache:
+            self.logger.info("AST", "Reusing the tree of the module: {}", name)
+            new_tree = self.built_tree[name] = self.module_cache[module_key][0]
+            self.reload_protocol()
+            return new_tree
         self.logger.info("AST", "Converting source code into AST")
-        # TODO: implement cache for importing multiple module
-        new_tree = AstBuilder(py2=self.config.py_version == 2, tree_rewriter=tree_rewriter).string_build(
-            ast_str, name=name
-        )
+        snapshot_file = self.get_snapshot_file(ast_str, name) if tree_rewriter is None else None
+        new_tree = self.load_snapshot(snapshot_file)
+        if new_tree is None:
+            new_tree = AstBuilder(py2=self.config.py_version == 2, tree_rewriter=tree_rewriter).string_build(
+                ast_str, name=name
+            )
+            if snapshot_file is not None:
+                self.snapshots[new_tree] = (snapshot_file, None)
         self.built_tree[name] = new_tree
+        self.load_persistent_cache(new_tree, ast_str)
         self.reload_protocol()
         self.apply_transform(new_tree)
+        if module_key is not None:
+            self.module_cache[module_key] = [new_tree, None]
+            self.module_keys[new_tree] = module_key
         return new_tree
 
+    def build_modules(self, file_paths):
+        """return the trees of the files, built with build_tree() and named after their path"""
+        return [self.build_tree(pathlib.Path(path).read_text(), name=str(path), path=path) for path in file_paths]
+
+    def get_module_key(self, ast_str, name, path=None):
+        """return the key of the source in the module cache, or None if the module cache is disabled.
+        The key is the resolved path of the file the source is read from, and the snapshot key of the source, name
+        and config. config.module_cache is the number of modules kept in the cache.
+        """
+        max_modules = getattr(self.config, "module_cache", None)
+        if not max_modules:
+            return None
+        self.module_cache.set_limits(max_entries=max_modules)
+        path = str(pathlib.Path(path).resolve()) if path is not None else ""
+        return path, snapshot.snapshot_key(ast_str, name, self.config)
+
+    def get_module_cfg(self, tree):
+        """return the cfg built for the tree of the module cache, or None"""
+        module_key = self.module_keys.get(tree)
+        if module_key is None or module_key not in self.module_cache:
+            return None
+        return self.module_cache[module_key][1]
+
+    def set_module_cfg(self, tree, cfg):
+        """keep the cfg built for the tree if the tree is in the module cache"""
+        module_key = self.module_keys.get(tree)
+        if module_key is not None and module_key in self.module_cache:
+            self.module_cache[module_key][1] = cfg
+
+    def clear_module_cache(self):
+        self.module_cache.clear()
+        self.module_keys.clear()
+
+    def get_position_index(self, tree):
+        """return the position index of the tree. It's built once for each tree returned by build_tree, on the first
+        query after the transforms.
+        """
+        try:
+            return self.position_indexes[tree]
+        except KeyError:
+            index = self.position_indexes[tree] = PositionIndex(tree)
+            return index
+
+    def load_persistent_cache(self, tree, ast_str):
+        """load the inference summaries of `tree` from the cache directory if it's enabled"""
+        cache_dir = getattr(self.config, "infer_cache_dir", None)
+        if not cache_dir:
+            return
+        if self.persistent_cache is None or self.persistent_cache.cache_dir != pathlib.Path(cache_dir):
+            self.save_persistent_cache()
+            self.persistent_cache = PersistentInferCache(cache_dir)
+        self.logger.info("AST", "Loading inference summaries from {}", cache_dir)
+        self.persistent_cache.load(tree, ast_str, self.config)
+
+    def save_persistent_cache(self):
+        if self.persistent_cache is not None:
+            self.persistent_cache.save()
+
+    def get_snapshot_file(self, ast_str, name):
+        """return the snapshot file of the source, or None if the snapshot is disabled"""
+        cache_dir = getattr(self.config, "snapshot_cache_dir", None)
+        if not cache_dir:
+            return None
+        return pathlib.Path(cache_dir) / "{}.snapshot".format(snapshot.snapshot_key(ast_str, name, self.config))
+
+    def load_snapshot(self, snapshot_file):
+        """return the tree stored in the snapshot file, its cfg is returned by `pop_snapshot_cfg()`.
+        Return None if there is no usable snapshot"""
+        if snapshot_file is None:
+            return None
+        try:
+            loaded = snapshot.load(snapshot_file, self.builtins_tree)
+        except snapshot.SnapshotError as e:
+            self.logger.warning("AST", "Failed to load the snapshot {}: {}", snapshot_file, e)
+            return None
+        if loaded is None:
+            return None
+        self.logger.info("AST", "Loaded the tree and cfg from the snapshot {}", snapshot_file)
+        tree, cfg = loaded
+        self.snapshots[tree] = (snapshot_file, cfg)
+        return tree
+
+    def pop_snapshot_cfg(self, tree):
+        """return the cfg of the tree loaded from the snapshot, or None if it's not loaded from a snapshot"""
+        _, cfg = self.snapshots.get(tree, (None, None))
+        if cfg is None:
+            return None
+        del self.snapshots[tree]
+        for block in cfg.deferred_blocks:
+            if block.deferred_cfg is not None:
+                self.deferred_scopes.add(block.ast_node)
+        return cfg
+
+    def save_snapshot(self, tree, cfg):
+        """save the tree and the cfg built for it, if the tree is built with the snapshot enabled"""
+        snapshot_file, _ = self.snapshots.pop(tree, (None, None))
+        if snapshot_file is None:
+            return
+        try:
+            snapshot.dump(snapshot_file, self.builtins_tree, tree, cfg)
+        except snapshot.SnapshotError as e:
+            self.logger.warning("AST", "Failed to save the snapshot {}: {}", snapshot_file, e)
+        else:
+            self.logger.info("AST", "Saved the tree and cfg to the snapshot {}", snapshot_file)
+
     def reload_protocol(self):
         """reload all necessary protocol based on config
         reload the dunder method based on py_version in config
@@ -11,6 +11,8 @@ BASE_MANAGER = base_manager.BaseManager()
 
 
 class InvertCondMixin:
+    __slots__ = ()
+
     @lru_cache(maxsize=None)
     def invert_condition(self: BaseNode):
         """Invert the condition of this node.
@@ -26,9 +28,15 @@ class InvertCondMixin:
         return bool_node
 
 
+# the slots of Statement, declared by every concrete statement instead of Statement itself, since FunctionDef is
+# both a Statement and a LocalsDictNode, and a class can only derive from one base with non-empty slots.
+STATEMENT_SLOTS = ("replaced_links", "is_phi")
+
+
 class Statement(BaseNode):
     """Node representing statement"""
 
+    __slots__ = ()
     _other_fields = ("is_phi", "replaced_links")
 
     def __init__(self, lineno=None, col_offset=None, parent=None, is_phi=False, replaced_links=None):
@@ -156,6 +164,7 @@ class Statement(BaseNode):
 
 
 class Assign(Statement):
+    __slots__ = STATEMENT_SLOTS + ("targets", "value")
     _fields = ("targets", "value")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -181,6 +190,7 @@ class Assign(Statement):
 
 
 class AugAssign(Statement):
+    __slots__ = STATEMENT_SLOTS + ("target", "op", "value")
     _fields = ("target", "op", "value")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -201,6 +211,7 @@ class AugAssign(Statement):
 
 
 class AnnAssign(Statement):
+    __slots__ = STATEMENT_SLOTS + ("target", "annotation", "value", "simple")
     _fields = ("target", "annotation", "value", "simple")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -217,6 +228,8 @@ class AnnAssign(Statement):
 class Variable(BaseNode, abc.ABC, InvertCondMixin):
     """mixin for variable related"""
 
+    __slots__ = ("links", "version")
+
     def __init__(self, lineno=None, col_offset=None, parent=None, links=None, version=-1):
         self.links = links
         self.version = version
@@ -312,6 +325,7 @@ BUILT_IN_TYPE_MAP = {
 class Name(Variable):
     """Class represents name (variable) that have ssa attributes (version) and use-def chains"""
 
+    __slots__ = ("id", "ctx")
     _fields = ("id", "ctx")  # preserved ctx even though it's not necessary for compatibility issues
     # links represent use-def chain links
     _other_fields = ("lineno", "col_offset", "parent", "links")
@@ -380,6 +394,7 @@ class Name(Variable):
 class AssignName(Name):
     """class represents name that are being assigned to in Assign statement"""
 
+    __slots__ = ()
     _fields = ("id", "ctx")  # preserved ctx even though it's not necessary for compatibility issues
     # links represent def-use chain links
     _other_fields = ("lineno", "col_offset", "parent", "links")
@@ -411,8 +426,11 @@ class AssignName(Name):
 class DelName(Name):
     """class for representing `del var`"""
 
+    __slots__ = ()
+
 
 class Attribute(Variable):
+    __slots__ = ("value", "attr", "ctx")
     _fields = ("value", "attr", "ctx")
     _other_fields = ("lineno", "col_offset", "parent", "links")
 
@@ -526,6 +544,7 @@ class Attribute(Variable):
 
 
 class AssignAttribute(Attribute):
+    __slots__ = ()
     _fields = ("value", "attr", "ctx")
     _other_fields = ("lineno", "col_offset", "parent", "links")
 
@@ -573,8 +592,11 @@ class AssignAttribute(Attribute):
 class DelAttribute(Attribute):
     """class for `del ins.attr`"""
 
+    __slots__ = ()
+
 
 class Starred(Variable):
+    __slots__ = ("value",)
     _fields = ("value",)
     _other_fields = ("lineno", "col_offset", "parent", "links")
 
@@ -601,11 +623,13 @@ class Starred(Variable):
 
 
 class AssignStarred(Starred):
+    __slots__ = ()
     _fields = ("value",)
     _other_fields = ("lineno", "col_offset", "parent", "links")
 
 
 class BinOp(BaseNode, InvertCondMixin):
+    __slots__ = ("left", "op", "right")
     _fields = ("left", "right")
     _other_fields = ("op", "lineno", "col_offset", "parent")
 
@@ -628,6 +652,7 @@ class BinOp(BaseNode, InvertCondMixin):
 
 
 class Const(BaseNode, BaseInstance, InvertCondMixin):
+    __slots__ = ("value",)
     _fields = ("value",)
 
     def __init__(self, value, lineno=None, col_offset=None, parent=None):
@@ -653,6 +678,7 @@ class Const(BaseNode, BaseInstance, InvertCondMixin):
 
 
 class UnaryOp(BaseNode, InvertCondMixin):
+    __slots__ = ("op", "operand")
     _fields = ("op", "operand")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -671,6 +697,7 @@ class UnaryOp(BaseNode, InvertCondMixin):
 
 
 class BoolOp(BaseNode, InvertCondMixin):
+    __slots__ = ("op", "values")
     _fields = ("op", "values")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -695,6 +722,7 @@ class BoolOp(BaseNode, InvertCondMixin):
 
 
 class Phi(BaseNode):
+    __slots__ = ("value", "base_name", "replaced_map")
     _fields = ("value",)
     _other_fields = ("base_name", "lineno", "col_offset", "parent", "replaced_map")
 
@@ -720,6 +748,7 @@ class Phi(BaseNode):
 
 
 class Call(BaseNode, InvertCondMixin):
+    __slots__ = ("ssa_record", "locals", "func", "args", "keywords")
     _fields = ("func", "args", "keywords")
     _other_fields = ("lineno", "col_offset", "parent", "ssa_records", "locals")
 
@@ -759,6 +788,7 @@ class Call(BaseNode, InvertCondMixin):
 
 
 class Keyword(BaseNode):
+    __slots__ = ("arg", "value")
     _fields = ("arg", "value")
 
     def __init__(self, lineno=None, col_offset=None, parent=None):
@@ -772,6 +802,8 @@ class Keyword(BaseNode):
 class Pass(Statement):
     """Also useless"""
 
+    __slots__ = STATEMENT_SLOTS
+
     def __init__(self, lineno=None, col_offset=None, parent=None):
         super(Pass, self).__init__(lineno, col_offset, parent)
 
@@ -780,6 +812,7 @@ class Pass(Statement):
 
 
 class If(MultiLineBlock, Statement):
+    __slots__ = STATEMENT_SLOTS + ("test", "body", "orelse")
     _fields = ("test", "body", "orelse")
 
     def __init__(self, lineno=None, col_offset=None, parent=None):
@@ -796,6 +829,7 @@ class If(MultiLineBlock, Statement):
 
 
 class IfExp(BaseNode):
+    __slots__ = ("test", "body", "orelse")
     _fields = ("test", "body", "orelse")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -812,6 +846,7 @@ class IfExp(BaseNode):
 
 
 class While(MultiLineBlock, Statement):
+    __slots__ = STATEMENT_SLOTS + ("test", "body", "orelse")
     _fields = ("test", "body", "orelse")
 
     def __init__(self, lineno=None, col_offset=None, parent=None):
@@ -828,6 +863,7 @@ class While(MultiLineBlock, Statement):
 
 
 class For(MultiLineBlock, Statement):
+    __slots__ = STATEMENT_SLOTS + ("target", "iter", "body", "orelse")
     _fields = ("target", "iter", "body", "orelse")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -862,6 +898,7 @@ class ForIter(BaseNode):
     i = ForIter(value=z.iter())
     """
 
+    __slots__ = ("value",)
     _fields = ("value",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -876,6 +913,7 @@ class ForIter(BaseNode):
 
 
 class Return(Statement):
+    __slots__ = STATEMENT_SLOTS + ("value",)
     _fields = ("value",)
 
     def __init__(self, lineno=None, col_offset=None, parent=None):
@@ -897,6 +935,7 @@ class Return(Statement):
 
 
 class Expr(Statement, InvertCondMixin):
+    __slots__ = STATEMENT_SLOTS + ("value",)
     _fields = ("value",)
 
     def __init__(self, lineno=None, col_offset=None, parent=None):
@@ -920,6 +959,7 @@ class Expr(Statement, InvertCondMixin):
 
 
 class NameConstant(BaseNode, InvertCondMixin):
+    __slots__ = ("value",)
     _fields = ("value",)
 
     def __init__(self, value, lineno=None, col_offset=None, parent=None):
@@ -937,6 +977,7 @@ class NameConstant(BaseNode, InvertCondMixin):
 
 
 class Compare(BaseNode, InvertCondMixin):
+    __slots__ = ("left", "ops", "comparators")
     _fields = ("left", "ops", "comparators")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -970,6 +1011,7 @@ class Bool(BaseNode, InvertCondMixin):
     The Bool is created during rewriting of the tree.
     """
 
+    __slots__ = ("value",)
     _fields = ("value",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -993,6 +1035,7 @@ class Bool(BaseNode, InvertCondMixin):
 
 
 class Arguments(BaseNode):
+    __slots__ = ("args", "vararg", "kwonlyargs", "kwarg", "defaults", "kw_defaults")
     _fields = ("args", "vararg", "kwonlyargs", "kwarg", "defaults", "kw_defaults")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1020,6 +1063,7 @@ class Arguments(BaseNode):
 
 
 class Arg(Variable):
+    __slots__ = ("arg", "annotation")
     _fields = ("arg", "annotation")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1055,6 +1099,7 @@ class Arg(Variable):
 
 
 class List(Sequence, InvertCondMixin):
+    __slots__ = ()
     _fields = ("elts",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1082,6 +1127,7 @@ class List(Sequence, InvertCondMixin):
 
 
 class Set(Sequence, InvertCondMixin):
+    __slots__ = ()
     _fields = ("elts",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1106,6 +1152,7 @@ class Set(Sequence, InvertCondMixin):
 
 
 class Tuple(Sequence, InvertCondMixin):
+    __slots__ = ()
     _fields = ("elts",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1131,6 +1178,7 @@ class Tuple(Sequence, InvertCondMixin):
 
 
 class Dict(BaseContainer, InvertCondMixin):
+    __slots__ = ("keys", "values")
     _fields = ("keys", "values")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1162,6 +1210,7 @@ class Dict(BaseContainer, InvertCondMixin):
 
 
 class Subscript(Variable):
+    __slots__ = ("value", "slice", "ctx")
     _fields = ("value", "slice", "ctx")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1212,6 +1261,7 @@ class Subscript(Variable):
 
 
 class Index(BaseNode):
+    __slots__ = ("value",)
     _fields = ("value",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1237,6 +1287,7 @@ class Index(BaseNode):
 
 
 class Slice(BaseNode):
+    __slots__ = ("lower", "upper", "step")
     _fields = ("lower", "upper", "step")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1285,6 +1336,7 @@ def built_slice_node(lineno=None, col_offset=None, parent=None, value=None):
 
 
 class ExtSlice(BaseNode):
+    __slots__ = ("dims",)
     _fields = ("dims",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1296,21 +1348,25 @@ class ExtSlice(BaseNode):
 
 
 class Store(BaseNode):
+    __slots__ = ()
     _fields = tuple()
     _other_fields = ("lineno", "col_offset", "parent")
 
 
 class Load(BaseNode):
+    __slots__ = ()
     _fields = tuple()
     _other_fields = ("lineno", "col_offset", "parent")
 
 
 class Del(BaseNode):
+    __slots__ = ()
     _fields = tuple()
     _other_fields = ("lineno", "col_offset", "parent")
 
 
 class Delete(BaseNode):
+    __slots__ = ("targets",)
     _fields = ("targets",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1322,6 +1378,7 @@ class Delete(BaseNode):
 
 
 class Global(Statement):
+    __slots__ = STATEMENT_SLOTS + ("names",)
     _fields = ("names",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1333,6 +1390,7 @@ class Global(Statement):
 
 
 class Alias(Variable):
+    __slots__ = ("name", "asname")
     _fields = ("name", "asname")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1390,6 +1448,7 @@ class Alias(Variable):
 
 
 class Import(Statement):
+    __slots__ = STATEMENT_SLOTS + ("names",)
     _fields = ("names",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1407,6 +1466,7 @@ class Import(Statement):
 
 
 class ImportFrom(Statement):
+    __slots__ = STATEMENT_SLOTS + ("module", "names", "level")
     _fields = ("module", "names", "level")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1426,6 +1486,7 @@ class ImportFrom(Statement):
 
 
 class Ellipsis(BaseNode):
+    __slots__ = ()
     _fields = ()
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1437,6 +1498,7 @@ class Ellipsis(BaseNode):
 
 
 class Raise(Statement):
+    __slots__ = STATEMENT_SLOTS + ("exc", "cause")
     _fields = ("exc", "cause")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1449,6 +1511,7 @@ class Raise(Statement):
 
 
 class Assert(Statement):
+    __slots__ = STATEMENT_SLOTS + ("test", "msg")
     _fields = ("test", "msg")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1461,6 +1524,7 @@ class Assert(Statement):
 
 
 class Print(Statement):
+    __slots__ = STATEMENT_SLOTS + ("dest", "values", "nl")
     _fields = ("dest", "values", "nl")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1474,6 +1538,7 @@ class Print(Statement):
 
 
 class Delete(Statement):
+    __slots__ = STATEMENT_SLOTS + ("targets",)
     _fields = ("targets",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1495,6 +1560,7 @@ class KillVarCall(BaseNode):
               the vars to indicate it's killing it.
     """
 
+    __slots__ = ("var", "value", "value_scope")
     _fields = ("value", "var", "scope")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1520,10 +1586,11 @@ class TempInstance(BaseNode):
     present. That's where UselessStub help
     """
 
-    pass
+    __slots__ = ()
 
 
 class Try(Statement):
+    __slots__ = STATEMENT_SLOTS + ("body", "handlers", "orelse", "finalbody")
     _fields = ("body", "handlers", "orelse", "finalbody")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1540,6 +1607,7 @@ class Try(Statement):
 class TryFinally(Statement):
     """Try blocks up to Python3.2"""
 
+    __slots__ = STATEMENT_SLOTS + ("body", "finalbody")
     _fields = ("body", "finalbody")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1554,6 +1622,7 @@ class TryFinally(Statement):
 class TryExcept(Statement):
     """Try blocks up to Python3.2"""
 
+    __slots__ = STATEMENT_SLOTS + ("body", "handlers", "orelse")
     _fields = ("body", "handlers", "orelse")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1567,6 +1636,7 @@ class TryExcept(Statement):
 
 
 class ExceptHandler(BaseNode):
+    __slots__ = ("type", "name", "body")
     _fields = ("type", "name", "body")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1580,6 +1650,7 @@ class ExceptHandler(BaseNode):
 
 
 class Break(Statement):
+    __slots__ = STATEMENT_SLOTS
     _fields = ()
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1588,6 +1659,7 @@ class Break(Statement):
 
 
 class Continue(Statement):
+    __slots__ = STATEMENT_SLOTS
     _fields = ()
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1596,6 +1668,7 @@ class Continue(Statement):
 
 
 class With(Statement):
+    __slots__ = STATEMENT_SLOTS + ("items", "body")
     _fields = ("items", "body")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1608,6 +1681,7 @@ class With(Statement):
 
 
 class WithItem(BaseNode):
+    __slots__ = ("context_expr", "optional_vars")
     _fields = ("context_expr", "optional_vars")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1620,6 +1694,7 @@ class WithItem(BaseNode):
 
 
 class Comprehension(BaseNode):
+    __slots__ = ("target", "iter", "ifs")
     _fields = ("target", "iter", "ifs")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1633,6 +1708,7 @@ class Comprehension(BaseNode):
 
 
 class TypeStub(BaseNode):
+    __slots__ = ("_type", "type", "value")
     _fields = ("type", "value")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1649,6 +1725,7 @@ class TypeStub(BaseNode):
 class JoinedStr(BaseNode):
     """Representing list of string expression to join"""
 
+    __slots__ = ("values",)
     _fields = ("values",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -1672,6 +1749,7 @@ class FormattedValue(BaseNode):
     Represents a :pep:`498` format string.
     """
 
+    __slots__ = ("value", "conversion", "format_spec")
     _fields = ("value", "conversion", "format_spec")
     _other_fields = ("lineno", "col_offset", "parent")
     CONVERSION = {-1: "", 115: "str", 114: "repr", 97: "ascii"}
@@ -1706,14 +1784,15 @@ class FormattedValue(BaseNode):
 
 
 class AsyncFor(For):
-    pass
+    __slots__ = ()
 
 
 class AsyncWith(With):
-    pass
+    __slots__ = ()
 
 
 class Await(BaseNode):
+    __slots__ = ("value",)
     _fields = ("value",)
 
     def postinit(self, value: BaseNode) -> None:
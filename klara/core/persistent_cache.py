@@ -0,0 +1,240 @@
+"""
+Opt-in on-disk cache for per-function inference summaries.
+
+The summaries of a module are stored in a json file named after the hash of the module source,
+the relevant config and the klara version, so a modified module, a different config or an upgrade
+of klara will never read a stale summary.
+
+Only summaries that are independent of the tree can survive across runs, that is results of
+constant values without any bound conditions, z3 assumptions or selected operand, inferred in a
+call context where every argument of the function and of its enclosing functions is either a
+constant or unbound. The locals of the calling scope are identified by their position in the
+module. Any other result is simply not persisted and inferred as usual.
+"""
+import ast
+import functools
+import hashlib
+import json
+import pathlib
+import weakref
+
+from klara.version import __version__
+
+from . import nodes
+
+_PERSISTABLE_TYPES = (int, float, complex, str, bytes, bool, type(None))
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path, mtime_ns, size):
+    return hashlib.sha256(pathlib.Path(path).read_bytes()).hexdigest()
+
+
+def file_fingerprint(path):
+    """return the path with the hash of the content of the file, so that editing the file changes it"""
+    try:
+        stat = pathlib.Path(path).stat()
+        return "{}:{}".format(path, _file_digest(path, stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        return path
+
+
+def config_fingerprint(config):
+    """return a string of all config value that can affect the inference result"""
+    fields = (
+        "py_version",
+        "type_inference",
+        "max_inference_value",
+        "enable_infer_sequence",
+        "eq_neq",
+        "typeshed_select",
+        "stubs",
+        "infer_extension_files",
+    )
+    # the content of the files can affect the result too
+    file_fields = ("stubs", "infer_extension_files")
+    values = []
+    for field in fields:
+        value = getattr(config, field, None)
+        if isinstance(value, (list, tuple)):
+            value = [str(getattr(v, "name", v)) for v in value]
+            if field in file_fields:
+                value = [file_fingerprint(v) for v in value]
+        values.append((field, value))
+    return repr(values)
+
+
+def source_hash(source, config):
+    h = hashlib.sha256()
+    for part in (__version__, config_fingerprint(config), source):
+        h.update(part.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _function_key(func):
+    """qualified name of the function, e.g. `Kls.method:12`"""
+    names = []
+    scope = func
+    while not isinstance(scope, nodes.Module):
+        names.append(getattr(scope, "name", type(scope).__name__))
+        scope = scope.parent.scope()
+    return "{}:{}".format(".".join(reversed(names)), func.lineno), scope
+
+
+def _node_key(node, module):
+    """position of `node` in `module`, or None if it's not a node of `module`"""
+    try:
+        scope = node.scope()
+        while scope is not module:
+            scope = scope.parent.scope()
+    except AttributeError:
+        return None
+    return "{}:{}:{}".format(type(node).__name__, node.lineno, node.col_offset)
+
+
+def _arg_key(value):
+    """repr of the constant argument, "" if the argument is unbound, or None if it can't be persisted"""
+    if value is None:
+        return ""
+    if isinstance(value, (nodes.Const, nodes.NameConstant)) and type(value.value) in _PERSISTABLE_TYPES:
+        return repr(value.value)
+    return None
+
+
+def _persist_value(result):
+    """return the repr of the constant in `result`, or None if the result can't be persisted"""
+    if (
+        result.status is not True
+        or result.bound_conditions
+        or result.z3_assumptions
+        or result.selected_operand
+        or not isinstance(result.result, (nodes.Const, nodes.NameConstant))
+        or type(result.result.value) not in _PERSISTABLE_TYPES
+    ):
+        return None
+    value_repr = repr(result.result.value)
+    try:
+        # e.g. float("nan") can't be round trip
+        if ast.literal_eval(value_repr) != result.result.value:
+            return None
+    except (ValueError, SyntaxError):
+        return None
+    return value_repr
+
+
+class PersistentInferCache:
+    """Summaries of `FunctionDef.infer_return_value` stored in `cache_dir`"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        # map of module -> (cache file, {function key: {call key: [value repr]}})
+        self._modules = weakref.WeakKeyDictionary()
+        # summaries that are modified and not yet saved, map of cache file -> summaries
+        self._dirty = {}
+        # map of id of the globals locals and ssa record -> (locals, ssa record, key), see `_globals_key()`
+        self._globals_keys = {}
+
+    def load(self, module, source, config):
+        """load the summaries of `module` that is built from `source`"""
+        cache_file = self.cache_dir / "{}.json".format(source_hash(source, config))
+        try:
+            summaries = json.loads(cache_file.read_text())
+        except (OSError, ValueError):
+            summaries = {}
+        self._modules[module] = (cache_file, summaries)
+
+    def summary_key(self, func, context):
+        """return the key of the summary for `func` in `context`, or None if the summary
+        depends on anything that can't be identified across runs.
+        Besides the arguments of `func`, the key has the arguments of the functions enclosing it, that its closures
+        can capture, and the locals of the call statement reloaded into the global context.
+        """
+        if context is not None and (
+            context.bound_instance is not None
+            or context.inverted_conds
+            or context.model is not None
+            or context.decorator_ignore
+        ):
+            return None
+        try:
+            func_key, module = _function_key(func)
+        except AttributeError:
+            return None
+        if module not in self._modules:
+            return None
+        call_key = []
+        scope = func
+        while not isinstance(scope, nodes.Module):
+            if isinstance(scope, (nodes.FunctionDef, nodes.Lambda)):
+                for arg in scope.args.args:
+                    arg_key = _arg_key(context.call_context.get(arg) if context is not None else None)
+                    if arg_key is None:
+                        return None
+                    call_key.append(arg_key)
+            scope = scope.parent.scope()
+        globals_key = self._globals_key(context.globals_context, module) if context is not None else ""
+        if globals_key is None:
+            return None
+        conditions_mode = context.conditions_mode.value if context is not None else None
+        return module, func_key, repr((call_key, globals_key, conditions_mode))
+
+    def _globals_key(self, globals_context, module):
+        """return the positions of the locals in the global context with their latest versions, or None if a local
+        is not in `module`. The key is kept for the frozen locals and the ssa record, which is replaced instead of
+        mutated"""
+        locals_, ssa_record = globals_context.locals, globals_context.ssa_record
+        if locals_ is None:
+            return ""
+        cached = self._globals_keys.get((id(locals_), id(ssa_record)))
+        if cached is not None and cached[0] is locals_ and cached[1] is ssa_record:
+            return cached[2]
+        items = []
+        for name, node in locals_.items():
+            node_key = _node_key(node, module)
+            if node_key is None:
+                key = None
+                break
+            items.append((name, node_key))
+        else:
+            versions = []
+            if ssa_record is not None:
+                versions = sorted((var, v[-1]) for var, v in ssa_record.var_version_list.items() if v)
+            key = repr((sorted(items), versions))
+        self._globals_keys[(id(locals_), id(ssa_record))] = (locals_, ssa_record, key)
+        return key
+
+    def get(self, key):
+        """return list of python constant for the summary, or None if not cached"""
+        module, func_key, call_key = key
+        value_reprs = self._modules[module][1].get(func_key, {}).get(call_key)
+        if value_reprs is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [ast.literal_eval(v) for v in value_reprs]
+
+    def put(self, key, results):
+        """store the results if all of them can be persisted"""
+        value_reprs = []
+        for res in results:
+            value_repr = _persist_value(res)
+            if value_repr is None:
+                return
+            value_reprs.append(value_repr)
+        if not value_reprs:
+            return
+        module, func_key, call_key = key
+        cache_file, summaries = self._modules[module]
+        summaries.setdefault(func_key, {})[call_key] = value_reprs
+        self._dirty[cache_file] = summaries
+
+    def save(self):
+        """write all modified summaries to the cache directory"""
+        if not self._dirty:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for cache_file, summaries in self._dirty.items():
+            cache_file.write_text(json.dumps(summaries))
+        self._dirty.clear()
@@ -0,0 +1,130 @@
+"""
+Index of the nodes of a tree by their position (lineno, col_offset).
+
+The index is built with a single walk of the tree, and answers the queries that otherwise require a walk of the
+whole tree with `ssa_visitors.NodeFinder` or `ssa_visitors.StatementExprExtractor`. Point lookups are dictionary
+lookups, and line-range and enclosing node queries are binary searches over the sorted positions.
+
+Klara nodes only know where they start, so the extent of a node is taken to end where the next node after its
+children starts, or at the start of the line of that node if it's the first node of its line. The enclosing node of
+a position is the innermost node with an extent containing the position, from which the enclosing statement and scope
+are looked up.
+"""
+import bisect
+
+from . import nodes
+from .ssa_visitors import AstVisitor
+
+
+class _PositionCollector(AstVisitor):
+    def __init__(self):
+        self.order = 0
+        self.in_variable = 0
+        # position -> [node], in preorder
+        self.positions = {}
+        # position -> the last node in preorder, without the children of variables, like NodeFinder
+        self.points = {}
+        # lineno -> the first node in preorder, like StatementExprExtractor
+        self.lines = {}
+        # (position, node) of the nodes with a position in preorder
+        self.preorder = []
+        # id of node -> index in `preorder` of the first node after the children of the node
+        self.subtree_ends = {}
+
+    def generic_visit(self, node):
+        lineno, col_offset = node.lineno, node.col_offset
+        if lineno is not None:
+            if lineno not in self.lines:
+                self.lines[lineno] = (self.order, node)
+            if col_offset is not None:
+                position = (lineno, col_offset)
+                self.positions.setdefault(position, []).append(node)
+                self.preorder.append((position, node))
+                if not self.in_variable:
+                    self.points[position] = node
+        self.order += 1
+        if isinstance(node, nodes.Variable):
+            self.in_variable += 1
+            super(_PositionCollector, self).generic_visit(node)
+            self.in_variable -= 1
+        else:
+            super(_PositionCollector, self).generic_visit(node)
+        self.subtree_ends[id(node)] = len(self.preorder)
+
+
+class PositionIndex:
+    """Index of the nodes of `tree` by their position. The index doesn't follow the changes of the tree,
+    a tree that is modified must be indexed again.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        collector = _PositionCollector()
+        collector.visit(tree)
+        self._positions = sorted(collector.positions)
+        self._nodes = collector.positions
+        self._points = collector.points
+        self._lines = collector.lines
+        self._preorder = collector.preorder
+        self._subtree_ends = collector.subtree_ends
+
+    def node_at(self, lineno, col_offset):
+        """return the node at lineno:col_offset, or None. If more than one node starts at the position, the last node
+        in preorder is returned without considering the children of variables (e.g. the `x` of `x.y` is never
+        returned), the same as `NodeFinder`.
+        """
+        return self._points.get((lineno, col_offset))
+
+    def first_node_at_line(self, lineno):
+        """return the first node in preorder starting at the line, usually the statement of the line, or None"""
+        try:
+            return self._lines[lineno][1]
+        except KeyError:
+            return None
+
+    def first_nodes_at_lines(self, linenos):
+        """return the first node of each of the line in `linenos` that has a node, in preorder"""
+        found = sorted(self._lines[lineno] for lineno in set(linenos) if lineno in self._lines)
+        return [node for _, node in found]
+
+    def nodes_in_lines(self, first_lineno, last_lineno):
+        """return all nodes starting from first_lineno up to last_lineno inclusive, sorted by position"""
+        start = bisect.bisect_left(self._positions, (first_lineno,))
+        end = bisect.bisect_left(self._positions, (last_lineno + 1,))
+        return [node for position in self._positions[start:end] for node in self._nodes[position]]
+
+    def _extent_end(self, node):
+        """return the position where the extent of `node` ends, or None if it extends to the end of the tree"""
+        end_index = self._subtree_ends.get(id(node))
+        if end_index is None or end_index == len(self._preorder):
+            return None
+        (lineno, col_offset), next_node = self._preorder[end_index]
+        if self._lines[lineno][1] is next_node:
+            # the indentation before the next statement is not part of the node
+            return lineno, 0
+        return lineno, col_offset
+
+    def enclosing_node(self, lineno, col_offset=0):
+        """return the innermost node enclosing lineno:col_offset, or None if the position is before any node"""
+        position = (lineno, col_offset)
+        index = bisect.bisect_right(self._positions, position)
+        if index == 0:
+            return None
+        # the last node starting at or before the position, or one of its parents, is the enclosing node
+        node = self._nodes[self._positions[index - 1]][-1]
+        while node is not None:
+            end = self._extent_end(node)
+            if end is None or position < end:
+                return node
+            node = node.parent
+        return None
+
+    def enclosing_statement(self, lineno, col_offset=0):
+        """return the statement enclosing lineno:col_offset, or None"""
+        node = self.enclosing_node(lineno, col_offset)
+        return node.statement() if node is not None else None
+
+    def enclosing_scope(self, lineno, col_offset=0):
+        """return the scope enclosing lineno:col_offset, or the module if the position is before any node"""
+        node = self.enclosing_node(lineno, col_offset)
+        return node.scope() if node is not None else self.tree
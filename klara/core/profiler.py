@@ -0,0 +1,103 @@
+"""
+Profiler attributing the inference time to each inference handler.
+
+A handler is any generator producing inference results, i.e. the functions registered by
+`register_infer`, the explicit inference of plugins and z3 checks. For each handler,
+the number of calls, number of results yielded, the total wall time (including the nested
+handlers), the self time (excluding the nested handlers) and the hits/misses of the
+inference cache are recorded.
+"""
+import json
+import time
+
+
+class HandlerStatistics:
+    __slots__ = ("calls", "results", "time", "self_time", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.calls = 0
+        self.results = 0
+        self.time = 0.0
+        self.self_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+def handler_name(func):
+    """name of the handler to report, e.g. `klara.core.inference.infer_call`"""
+    func = getattr(func, "__func__", func)
+    return "{}.{}".format(getattr(func, "__module__", ""), getattr(func, "__qualname__", repr(func)))
+
+
+class InferProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.handlers = {}
+        # accumulated time of the nested handlers for each running handler
+        self._nested_time = []
+
+    def get(self, name):
+        stats = self.handlers.get(name)
+        if stats is None:
+            stats = self.handlers[name] = HandlerStatistics()
+        return stats
+
+    def _start(self):
+        self._nested_time.append(0.0)
+        return time.perf_counter()
+
+    def _stop(self, stats, start):
+        elapsed = time.perf_counter() - start
+        nested = self._nested_time.pop()
+        stats.time += elapsed
+        stats.self_time += elapsed - nested
+        if self._nested_time:
+            self._nested_time[-1] += elapsed
+
+    def profile(self, name, iterator):
+        """yield from `iterator`, recording the time taken to produce every result under `name`"""
+        stats = self.get(name)
+        stats.calls += 1
+        iterator = iter(iterator)
+        while True:
+            start = self._start()
+            try:
+                res = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._stop(stats, start)
+            stats.results += 1
+            yield res
+
+    def call(self, name, func, *args, **kwargs):
+        """call `func` and record the time taken under `name`"""
+        stats = self.get(name)
+        stats.calls += 1
+        start = self._start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._stop(stats, start)
+
+    def record_cache(self, name, hit):
+        stats = self.get(name)
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+    def clear(self):
+        self.handlers.clear()
+        self._nested_time.clear()
+
+    def to_dict(self):
+        """statistics of all handlers, sorted by the self time"""
+        items = sorted(self.handlers.items(), key=lambda item: item[1].self_time, reverse=True)
+        return {name: stats.to_dict() for name, stats in items}
+
+    def dump(self, file, **extra):
+        json.dump({"handlers": self.to_dict(), **extra}, file, indent=4)
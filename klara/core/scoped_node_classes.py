@@ -1,12 +1,25 @@
 import ast
 from collections import deque
 
-from . import exceptions
+from . import base_manager, exceptions
 from .bases import BaseNode, LocalsDictNode, Proxy
-from .decorators import cachedproperty
-from .node_classes import Arg, Assign, AssignName, Expr, List, MultiLineBlock, Sequence, Statement, Variable
+from .decorators import cachedslot
+from .node_classes import (
+    STATEMENT_SLOTS,
+    Arg,
+    Assign,
+    AssignName,
+    Expr,
+    List,
+    MultiLineBlock,
+    Sequence,
+    Statement,
+    Variable,
+)
 from .ssa_visitors import VariableGetter
 
+BASE_MANAGER = base_manager.BaseManager()
+
 
 def _c3_merge(sequences):
     """Merges MROs in *sequences* to a single MRO using the C3 algorithm.
@@ -49,6 +62,8 @@ def clean_duplicates_mro(sequences):
 
 
 class ScopeSsaMixin:
+    __slots__ = ()
+
     def generate_ssa_func(self):
         """generate multiple statement to simulate renaming of Scope without body.
         1. generate Name object for scope name.
@@ -64,10 +79,7 @@ class ScopeSsaMixin:
 class Module(LocalsDictNode, MultiLineBlock):
     """Class representing ast.Module"""
 
-    body = []
-    name = ""
-    path = None
-
+    __slots__ = ("path", "body")
     _fields = ("body",)
     _other_fields = ("name", "path")
 
@@ -76,6 +88,7 @@ class Module(LocalsDictNode, MultiLineBlock):
         super(Module, self).__init__()
         self.name = name
         self.path = path
+        self.body = []
 
     def __repr__(self):
         return "Module {}".format(self.name).strip()
@@ -89,6 +102,8 @@ class Module(LocalsDictNode, MultiLineBlock):
 
 
 class FunctionMixin:
+    __slots__ = ()
+
     def mock_args(self, offset=0):
         """
         insert a statement with targets=all the argument starting with offset. Mainly for renaming
@@ -115,6 +130,7 @@ class FunctionMixin:
 
 
 class FunctionDef(LocalsDictNode, MultiLineBlock, Statement, ScopeSsaMixin, FunctionMixin):
+    __slots__ = STATEMENT_SLOTS + ("return_nodes", "called_by", "args", "body", "decorator_list", "returns", "type_")
     _fields = ("name", "args", "body", "decorator_list", "returns")
     _other_fields = ("lineno", "col_offset", "parent", "return_nodes", "called_by")
 
@@ -122,6 +138,7 @@ class FunctionDef(LocalsDictNode, MultiLineBlock, Statement, ScopeSsaMixin, Func
         super(FunctionDef, self).__init__(lineno, col_offset, parent)
         self.return_nodes = []
         self.called_by = []
+        self.type_ = None
 
     def __repr__(self):
         return "Function {} in scope {}".format(self.name, self.parent)
@@ -150,6 +167,7 @@ class FunctionDef(LocalsDictNode, MultiLineBlock, Statement, ScopeSsaMixin, Func
         :param arg_number: the position of argument to
         :return:
         """
+        BASE_MANAGER.build_deferred_scopes(self)
         try:
             arg = self.args.args[arg_number]
             ins = self.instance_dict.get(arg)
@@ -159,7 +177,7 @@ class FunctionDef(LocalsDictNode, MultiLineBlock, Statement, ScopeSsaMixin, Func
         except IndexError:
             raise ValueError("arg number: {} exceed the argument length".format(arg_number))
 
-    @cachedproperty
+    @cachedslot
     def type(self):
         """return the function type for this node
         Possibles values are method, function, staticmethod and classmethod.
@@ -258,10 +276,11 @@ class FunctionDef(LocalsDictNode, MultiLineBlock, Statement, ScopeSsaMixin, Func
 
 
 class AsyncFunctionDef(FunctionDef):
-    pass
+    __slots__ = ()
 
 
 class Lambda(LocalsDictNode, FunctionMixin):
+    __slots__ = ("args", "body")
     _fields = ("args", "body")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -277,6 +296,7 @@ class Lambda(LocalsDictNode, FunctionMixin):
 
 
 class ClassDef(LocalsDictNode, MultiLineBlock, ScopeSsaMixin):
+    __slots__ = ("bases", "keywords", "starargs", "kwargs", "body", "decorator_list")
     _fields = ("name", "bases", "keywords", "starargs", "kwargs", "body", "decorator_list")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -362,6 +382,7 @@ class ClassDef(LocalsDictNode, MultiLineBlock, ScopeSsaMixin):
 class Yield(BaseNode):
     """Yield is an expression , must be wrapped with expr"""
 
+    __slots__ = ("value",)
     _fields = ("value",)
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -373,10 +394,11 @@ class Yield(BaseNode):
 
 
 class YieldFrom(Yield):
-    pass
+    __slots__ = ()
 
 
 class GeneratorExp(LocalsDictNode):
+    __slots__ = ("elt", "generators")
     _fields = ("elt", "generators")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -389,6 +411,7 @@ class GeneratorExp(LocalsDictNode):
 
 
 class DictComp(LocalsDictNode):
+    __slots__ = ("key", "value", "generators")
     _fields = ("key", "value", "generators")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -402,6 +425,7 @@ class DictComp(LocalsDictNode):
 
 
 class ListComp(LocalsDictNode):
+    __slots__ = ("elt", "generators")
     _fields = ("elt", "generators")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -414,6 +438,7 @@ class ListComp(LocalsDictNode):
 
 
 class SetComp(LocalsDictNode):
+    __slots__ = ("elt", "generators")
     _fields = ("elt", "generators")
     _other_fields = ("lineno", "col_offset", "parent")
 
@@ -429,6 +454,8 @@ class OverloadedFunc(Sequence):
     """Class that represents @overload decorated FunctionDef.
     Contains list of overloaded function"""
 
+    __slots__ = ("name",)
+
     def __init__(self, lineno, col_offset, parent, first_func):
         super(OverloadedFunc, self).__init__(lineno, col_offset, parent, [first_func])
         self.name = first_func.name
@@ -0,0 +1,303 @@
+"""
+Opt-in on-disk snapshot of the rewritten tree together with its cfg and ssa annotations.
+
+Building the tree, the cfg, the ssa and the conditions is identical for an unchanged module, so the
+whole object graph reachable from the tree and the cfg is stored in a file named after the hash
+of the module source, its name, the relevant config and the klara version.
+
+The graph is flattened before pickling, since pickling the linked nodes and blocks recursively
+would overflow the stack on any non trivial module. Every klara object is given an index, and
+its state is pickled with the references to other klara objects replaced by their index.
+Nodes of the builtins tree are referred to by their position in the builtins tree, so that they
+are the same objects after loading.
+
+The explicit inference set by the transforms is not stored, the transforms are applied again
+after loading instead.
+"""
+import collections
+import enum
+import functools
+import hashlib
+import io
+import pathlib
+import pickle
+import types
+import weakref
+
+from klara.version import __version__
+
+from . import nodes
+from .persistent_cache import config_fingerprint
+
+SNAPSHOT_PROTOCOL = pickle.HIGHEST_PROTOCOL
+# the empty frozensets are shared, see `cfg.EMPTY_SET`
+_EMPTY_SET = frozenset()
+# map of builtins tree -> (list of nodes, map of id(node) -> position)
+_BUILTINS_INDEX = weakref.WeakKeyDictionary()
+# the errors of a corrupted snapshot or a snapshot of classes that are changed
+_LOAD_ERRORS = (
+    OSError,
+    EOFError,
+    pickle.UnpicklingError,
+    AttributeError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+)
+_SHAREABLE_TYPES = (list, dict, set)
+_NOT_INDEXED_TYPES = (type, types.FunctionType, types.MethodType, types.ModuleType, enum.Enum, tuple)
+# the slots that are not saved, see `_get_state()`
+_UNSAVED_SLOTS = ("explicit_inference", "resolved_")
+
+
+class SnapshotError(Exception):
+    """the snapshot can't be saved or loaded"""
+
+
+def snapshot_key(source, name, config):
+    h = hashlib.sha256()
+    ssa_mode = repr((getattr(config, "pruned_ssa", False), getattr(config, "lazy_ssa", False)))
+    for part in (__version__, config_fingerprint(config), ssa_mode, name, source):
+        h.update(part.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _is_indexed(obj):
+    cls = type(obj)
+    return (
+        cls.__module__.startswith("klara.")
+        and not isinstance(obj, _NOT_INDEXED_TYPES)
+        and cls.__reduce__ is object.__reduce__
+        and cls.__reduce_ex__ is object.__reduce_ex__
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_descriptors(cls):
+    """return the descriptors of all slots, including the slots of the base classes"""
+    descriptors = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in ("__dict__", "__weakref__"):
+                descriptors.append(klass.__dict__[name])
+    return tuple(descriptors)
+
+
+def _get_state(obj):
+    """return (attributes, slots, contents) of the object, where slots is list of (slot index, value) of the
+    slots that are set, and contents is the items of list, dict and set subclass"""
+    try:
+        attributes = object.__getattribute__(obj, "__dict__")
+    except AttributeError:
+        attributes = None
+    else:
+        if attributes.get("explicit_inference") is not None:
+            attributes = dict(attributes, explicit_inference=None)
+    slots = []
+    for i, descriptor in enumerate(_slot_descriptors(type(obj))):
+        try:
+            value = descriptor.__get__(obj)
+        except AttributeError:
+            continue
+        # the explicit inference is set again by the transform of the loaded tree, and the scope and statement
+        # are resolved again
+        slots.append((i, None if descriptor.__name__ in _UNSAVED_SLOTS else value))
+    if isinstance(obj, dict):
+        contents = list(obj.items())
+    elif isinstance(obj, (list, set)):
+        contents = list(obj)
+    else:
+        contents = None
+    return attributes, slots, contents
+
+
+def _set_state(obj, attributes, slots, contents):
+    if attributes:
+        object.__getattribute__(obj, "__dict__").update(attributes)
+    if slots:
+        descriptors = _slot_descriptors(type(obj))
+        for i, value in slots:
+            descriptors[i].__set__(obj, value)
+    if contents is None:
+        return
+    if isinstance(obj, dict):
+        dict.update(obj, contents)
+    elif isinstance(obj, list):
+        list.extend(obj, contents)
+    else:
+        set.update(obj, contents)
+
+
+def _builtins_index(builtins_tree):
+    """list of all nodes of the builtins tree in a deterministic order"""
+    if builtins_tree is None:
+        return [], {}
+    if builtins_tree in _BUILTINS_INDEX:
+        return _BUILTINS_INDEX[builtins_tree]
+    index = []
+    stack = [builtins_tree]
+    while stack:
+        node = stack.pop()
+        index.append(node)
+        children = []
+        for field in node._fields:
+            value = getattr(node, field, None)
+            children.extend(value if isinstance(value, (list, tuple)) else (value,))
+        stack.extend(reversed([child for child in children if isinstance(child, nodes.BaseNode)]))
+    result = _BUILTINS_INDEX[builtins_tree] = index, {id(node): i for i, node in enumerate(index)}
+    return result
+
+
+class Snapshot:
+    """Save and load the object graph reachable from the roots"""
+
+    def __init__(self, builtins_tree=None):
+        self.builtins, self.builtins_ids = _builtins_index(builtins_tree)
+        self.objects = []
+        self.object_ids = {}
+        # loading state
+        self.states = None
+        self.restored = None
+
+    def persistent_id(self, obj):
+        if type(obj) is frozenset and not obj:
+            return "e", 0
+        obj_id = id(obj)
+        if obj_id in self.builtins_ids:
+            return "b", self.builtins_ids[obj_id]
+        if obj_id in self.object_ids:
+            return "o", self.object_ids[obj_id]
+        if _is_indexed(obj):
+            # only reachable through an object that is pickled by value, it would be copied
+            raise SnapshotError("object is not indexed: {}".format(type(obj)))
+        return None
+
+    def persistent_load(self, pid):
+        kind, index = pid
+        if kind == "e":
+            return _EMPTY_SET
+        if kind == "b":
+            return self.builtins[index]
+        obj = self.objects[index]
+        if self.restored is not None and not self.restored[index] and type(obj).__hash__ is not object.__hash__:
+            # the object may be hashed when it's put in a set or used as a key, before the state is restored
+            # in order. Restore all objects that are hashed by their content first.
+            self._restore(index)
+        return obj
+
+    def _add(self, obj):
+        self.object_ids[id(obj)] = len(self.objects)
+        self.objects.append(obj)
+
+    def _index(self, roots, root_module):
+        # map of id -> [container, number of references] of the list, dict and set
+        containers = {}
+        for root in roots:
+            self._add(root)
+        for obj in self.objects:
+            attributes, slots, contents = _get_state(obj)
+            values = [v for _, v in slots]
+            if attributes:
+                values.extend(attributes.values())
+            if contents is not None:
+                values.extend(contents)
+            for value in _find_indexed(values, containers):
+                if id(value) in self.object_ids or id(value) in self.builtins_ids:
+                    continue
+                if isinstance(value, nodes.Module) and value is not root_module:
+                    raise SnapshotError("the tree refers to the external module: {}".format(value))
+                self._add(value)
+        # the containers referred by multiple objects are indexed, so that they're still shared after loading
+        for container, num_refs in containers.values():
+            if num_refs > 1:
+                self._add(container)
+
+    def dump(self, file, root_module, *roots):
+        """pickle the object graph reachable from `root_module` and `roots` to `file`"""
+        self._index((root_module,) + roots, root_module)
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, protocol=SNAPSHOT_PROTOCOL)
+        pickler.persistent_id = self.persistent_id
+        states = []
+        try:
+            for obj in self.objects:
+                buffer.seek(0)
+                buffer.truncate()
+                pickler.clear_memo()
+                pickler.dump(_get_state(obj))
+                states.append(buffer.getvalue())
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise SnapshotError(str(e)) from e
+        classes = [type(obj) for obj in self.objects]
+        pickle.dump((classes, len(roots), states), file, protocol=SNAPSHOT_PROTOCOL)
+
+    def load(self, file):
+        """return the root module and the roots, in the order given to `dump()`"""
+        classes, num_roots, self.states = pickle.load(file)
+        self.objects = [cls.__new__(cls) for cls in classes]
+        self.restored = [False] * len(self.objects)
+        for index in range(len(self.objects)):
+            self._restore(index)
+        return self.objects[: num_roots + 1]
+
+    def _restore(self, index):
+        if self.restored[index]:
+            return
+        self.restored[index] = True
+        unpickler = pickle.Unpickler(io.BytesIO(self.states[index]))
+        unpickler.persistent_load = self.persistent_load
+        _set_state(self.objects[index], *unpickler.load())
+
+
+def _find_indexed(values, containers):
+    """yield the klara objects in the values, looking into the builtin containers that are not visited yet"""
+    stack = list(values)
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type in _SHAREABLE_TYPES:
+            value_id = id(value)
+            if value_id in containers:
+                containers[value_id][1] += 1
+                continue
+            containers[value_id] = [value, 1]
+            stack.extend(value.items() if value_type is dict else value)
+        elif _is_indexed(value):
+            yield value
+        elif isinstance(value, dict):
+            stack.extend(value.items())
+        elif isinstance(value, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(value)
+
+
+def dump(cache_file, builtins_tree, tree, cfg):
+    """write the snapshot of `tree` and its `cfg` to `cache_file`"""
+    cache_file = pathlib.Path(cache_file)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = cache_file.with_suffix(".tmp")
+    try:
+        with temp_file.open("wb") as f:
+            Snapshot(builtins_tree).dump(f, tree, cfg)
+    except BaseException:
+        try:
+            temp_file.unlink()
+        except FileNotFoundError:
+            pass
+        raise
+    temp_file.replace(cache_file)
+
+
+def load(cache_file, builtins_tree):
+    """return (tree, cfg) stored in `cache_file`, or None if there is no usable snapshot"""
+    try:
+        with pathlib.Path(cache_file).open("rb") as f:
+            tree, cfg = Snapshot(builtins_tree).load(f)
+    except FileNotFoundError:
+        return None
+    except _LOAD_ERRORS as e:
+        raise SnapshotError(str(e)) from e
+    return tree, cfg
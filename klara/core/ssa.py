@@ -4,7 +4,7 @@ from typing import List, Optional
 
 import klara.core.nodes as nodes
 import klara.core.use_def_chain as use_def_chain
-from klara.core import exceptions, utilities
+from klara.core import context_mod, exceptions, utilities
 from klara.core.ssa_visitors import TargetRemover
 from . import manager
 from .ssa_visitors import AstVisitor
@@ -13,6 +13,8 @@ MANAGER = manager.AstManager()
 
 
 class SsaCode(object):
+    __slots__ = ("code_list", "parent_node")
+
     def __init__(self, parent_node=None):
         self.code_list = []
         self.parent_node = parent_node
@@ -163,7 +165,7 @@ class AttributeEnumerator(AstVisitor):
             # store scope() locals and instance locals. E.g.
             # >>> f.g() # store scope().locals and f.locals
             node.locals["instance"] = instance.locals.copy()
-            node.locals["scope"] = scope.locals.copy()
+            node.locals["scope"] = context_mod.FrozenDict(scope.locals)
             node.ssa_record = instance.ssa_record.copy()
         except (exceptions.InstanceNotExistError, NotImplementedError, AttributeError):
             return
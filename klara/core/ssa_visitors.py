@@ -5,13 +5,32 @@ BASE_MANAGER = base_manager.BaseManager()
 
 
 class AstVisitor:
+    """Visit the node with the method `visit_<node class name>`, or generic_visit if there's none.
+    The method of every node class is looked up once for each visitor class, and kept in `_dispatch`.
+    """
+
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    @classmethod
+    def _get_visitor(cls, node_cls):
+        visitor = getattr(cls, "visit_" + node_cls.__name__.lower(), cls.generic_visit)
+        cls._dispatch[node_cls] = visitor
+        return visitor
+
     def visit(self, node):
-        method = "visit_" + node.__class__.__name__.lower()
-        visitor = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        try:
+            visitor = self._dispatch[node.__class__]
+        except KeyError:
+            visitor = self._get_visitor(node.__class__)
+        return visitor(self, node)
 
     def generic_visit(self, node):
-        for field, value in node.iter_fields():
+        for field in node._fields:
+            value = getattr(node, field, None)
             if isinstance(value, list):
                 for item in value:
                     if isinstance(item, BaseNode):  # noqa: F405
@@ -64,11 +83,16 @@ class AstAttrSeparator(AstVisitor):
         self.load = set()
         self.store = set()
         self._base = ""
+        self.has_call = False
 
     def visit_attribute(self, node):
         self.visit(node.value)
         self.load.add(node)
 
+    def visit_call(self, node):
+        self.has_call = True
+        self.generic_visit(node)
+
     def visit_assignattribute(self, node):
         self.visit(node.value)
         self.store.add(node)
@@ -38,8 +38,9 @@ class CustomTransform:
     def transform(self, node):
         cls = node.__class__
         if cls not in self.transform_cache or len(self.transform_cache[cls]) == 0:
-            # reset the explicit inference in order for unregister to properly clear the tree
-            if hasattr(node, "explicit_inference"):
+            # reset the explicit inference in order for unregister to properly clear the tree.
+            # The ctx of the variables is the node class itself (e.g. nodes.Store), which is left untouched.
+            if hasattr(node, "explicit_inference") and not isinstance(node, type):
                 node.explicit_inference = None
             return node
         for trans_func, predicate in self.transform_cache[cls]:
@@ -67,16 +67,15 @@ class TreeRewriter:
 
     def visit(self, node, parent):
         cls = node.__class__
-        method = "visit_" + cls.__name__.lower()
-        if method not in self._visit_cache:
+        try:
+            visitor = self._visit_cache[cls]
+        except KeyError:
             if isinstance(node, list):
                 # to differentiate between _ast.list and the actual list
                 visitor = self.generic_visit
             else:
-                visitor = getattr(self, method, self.generic_visit)
+                visitor = getattr(self, "visit_" + cls.__name__.lower(), self.generic_visit)
             self._visit_cache[cls] = visitor
-        else:
-            visitor = self._visit_cache[cls]
         return visitor(node, parent)
 
     def generic_visit(self, node, parent):
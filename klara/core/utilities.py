@@ -6,7 +6,9 @@ from xml.etree import ElementTree
 
 import z3
 
-from klara.core import nodes
+from klara.core import base_manager, nodes
+
+BASE_MANAGER = base_manager.BaseManager()
 
 
 def methdispatch(func):
@@ -57,13 +59,36 @@ class ElementTreeRepr(ElementTree.ElementTree):
             return str(self.file)
 
 
-def is_subset(main_container: set, container_checker: set) -> set:
-    """cancel element in main container that is subset/superset to the container_checker"""
-    result = main_container.copy()
-    for main, checker in itertools.product(main_container, container_checker):
-        if main in checker or checker in main:
-            result.remove(main)
-    return result
+def is_subset(main_container: set, container_checker: set, checker_fields: set = None) -> set:
+    """cancel element in main container that is subset/superset to the container_checker.
+    An element is a subset of a node if it's one of the fields of the node (see `BaseNode.__contains__`), so instead of
+    checking every pair, the fields are looked up in sets.
+    :param checker_fields: `get_fields(container_checker)` if it's computed already
+    """
+    if not main_container or not container_checker:
+        return set(main_container)
+    if checker_fields is None:
+        checker_fields = get_fields(container_checker)
+    return {
+        main
+        for main in main_container
+        if main not in checker_fields and all(field not in container_checker for field in _hashable_fields(main))
+    }
+
+
+def get_fields(nodes_container) -> set:
+    """return all the hashable fields of the nodes"""
+    fields = set()
+    for node in nodes_container:
+        fields.update(_hashable_fields(node))
+    return fields
+
+
+def _hashable_fields(node):
+    for field in getattr(node, "_fields", ()):
+        value = getattr(node, field, None)
+        if value is not None and getattr(type(value), "__hash__", None) is not None:
+            yield value
 
 
 class TempAttr:
@@ -135,49 +160,171 @@ def temp_config(manager, config):
     manager.reload_protocol()
 
 
+def _operand_bit(numbering, pivot, operand_hash):
+    bits = numbering.setdefault(pivot, {})
+    bit = bits.get(operand_hash)
+    if bit is None:
+        bit = bits[operand_hash] = 1 << len(bits)
+    return bit
+
+
+class SelectedOperand(dict):
+    """map of pivot (the hash of a phi/ifexp) -> bitset of the selected operands of the pivot.
+    Every operand is interned to a bit of its pivot, so that checking the conflict and combining
+    selected operands are bitwise operations. The bits are numbered by `numbering`, the table
+    `BaseManager.operand_bits` of the selected operand creation. The table is replaced when the inference
+    cache is cleared, and the bits of the results kept across the clear are translated to the numbering
+    of the other selected operand when they're compared or merged.
+    """
+
+    __slots__ = ("numbering",)
+
+    def __init__(self, *args, numbering=None):
+        super(SelectedOperand, self).__init__(*args)
+        self.numbering = BASE_MANAGER.operand_bits if numbering is None else numbering
+
+    @classmethod
+    def from_operands(cls, operands):
+        c = cls()
+        c.add_operands(operands)
+        return c
+
+    def add_operands(self, operands):
+        """add map of pivot -> operand or set of operands, overwriting the pivot already selected"""
+        if type(operands) is SelectedOperand:
+            self.update(operands)
+            return
+        for pivot, operand in operands.items():
+            if type(operand) is set:
+                bits = 0
+                for o in operand:
+                    bits |= _operand_bit(self.numbering, pivot, hash(o))
+            else:
+                bits = _operand_bit(self.numbering, pivot, hash(operand))
+            self[pivot] = bits
+
+    def _renumbered(self, other):
+        """return `other` with the bits in the numbering of self"""
+        if other.numbering is self.numbering or not other:
+            return other
+        renumbered = SelectedOperand(numbering=self.numbering)
+        for pivot, bits in other.items():
+            new_bits = 0
+            for index, operand_hash in enumerate(other.numbering[pivot]):
+                if bits & (1 << index):
+                    new_bits |= _operand_bit(self.numbering, pivot, operand_hash)
+            renumbered[pivot] = new_bits
+        return renumbered
+
+    def is_conflict(self, other):
+        """return True if any of the common pivot doesn't share a selected operand"""
+        other = self._renumbered(other)
+        small, large = (self, other) if len(self) <= len(other) else (other, self)
+        for pivot, bits in small.items():
+            other_bits = large.get(pivot)
+            if other_bits is not None and not bits & other_bits:
+                return True
+        return False
+
+    def combine(self, other):
+        """select the operands of `other` in addition to the operands selected"""
+        for pivot, bits in self._renumbered(other).items():
+            self[pivot] = self.get(pivot, 0) | bits
+
+    def update(self, other):
+        """overwrite the pivots selected by `other`"""
+        if type(other) is not SelectedOperand:
+            self.add_operands(other)
+            return
+        super(SelectedOperand, self).update(self._renumbered(other))
+
+    def copy(self):
+        return SelectedOperand(self, numbering=self.numbering)
+
+
+def _get_selected_operand(res):
+    if hasattr(res, "selected_operand"):
+        return res.selected_operand
+    elif type(res) is SelectedOperand:
+        return res
+    elif isinstance(res, dict):
+        return SelectedOperand.from_operands(res)
+    return None
+
+
 def check_selected_operand(results):
     """
     check selected_operand in the results to see if they're matched
     :param results: can be list of (InferenceResult or dict)
     :return: bool
     """
-
-    def _hash_to_set(v):
-        if type(v) is set:
-            return set(hash(va) for va in v)
-        else:
-            return {hash(v)}
-
-    def _check_conflict(ds):
-        if len(ds) > 1:
-            all_items = ds[0].copy()
-        else:
-            return True
-        for d in ds[1:]:
-            for k in all_items.keys() & d:
-                val_left, val_right = _hash_to_set(all_items[k]), _hash_to_set(d[k])
-                if len(val_left & val_right) == 0:
-                    return False
-            all_items.update(d)
-        return True
-
-    all_dicts = []
+    all_items = None
+    copied = False
     for res in results:
-        if hasattr(res, "selected_operand"):
-            all_dicts.append(res.selected_operand)
-        elif isinstance(res, dict):
-            all_dicts.append(res)
-    return _check_conflict(all_dicts)
+        d = _get_selected_operand(res)
+        if d is None:
+            continue
+        if all_items is None:
+            all_items = d
+            continue
+        if all_items.is_conflict(d):
+            return False
+        if not copied:
+            all_items = all_items.copy()
+            copied = True
+        all_items.update(d)
+    return True
 
 
 def infer_product(*iterators, disable_caching=False):
-    """implementation of products of operand in binop/boolop/compare etc..."""
-    if not disable_caching:
-        for product_it in itertools.product(*iterators):
-            if check_selected_operand(product_it):
-                yield product_it
-    else:
-        yield from itertools.product(*iterators)
+    """implementation of products of operand in binop/boolop/compare etc...
+    Same as itertools.product, but the product is built by backtracking. The selected_operand of an operand is
+    checked against the operands before it as soon as it's bound, so that a conflict prunes all the products
+    sharing the conflicted operands.
+    Like itertools.product, every operand is inferred in order before the first product, since inferring an
+    operand can change the context used by the next one (e.g. instance_mode in infer_attribute).
+    """
+    pools = [tuple(it) for it in iterators]
+    if not pools:
+        yield ()
+        return
+    last = len(pools) - 1
+    indexes = [0] * len(pools)
+    values = [None] * len(pools)
+    # merged selected_operand of the operands before each level
+    merged = [SelectedOperand()] * (len(pools) + 1)
+    level = 0
+    while True:
+        index = indexes[level]
+        level_values = pools[level]
+        if index == len(level_values):
+            # all values of this operand are tried. Backtrack to the previous operand
+            if level == 0:
+                return
+            indexes[level] = 0
+            level -= 1
+            indexes[level] += 1
+            continue
+        value = level_values[index]
+        values[level] = value
+        prefix = merged[level]
+        selected = None if disable_caching else _get_selected_operand(value)
+        if selected:
+            if prefix and prefix.is_conflict(selected):
+                indexes[level] += 1
+                continue
+            if prefix:
+                merged[level + 1] = prefix.copy()
+                merged[level + 1].update(selected)
+            else:
+                merged[level + 1] = selected
+        else:
+            merged[level + 1] = prefix
+        if level == last:
+            yield tuple(values)
+            indexes[level] += 1
+        else:
+            level += 1
 
 
 def strip_constant_node(node):
@@ -59,6 +59,15 @@ class CovManager(manager.AstManager):
         self.predicate_expr = True
 
     def build_cfg(self, as_tree):
+        c = self.get_module_cfg(as_tree)
+        if c is not None:
+            return c
+        c = self.pop_snapshot_cfg(as_tree)
+        if c is not None:
+            # the explicit inference of the transform is not in the snapshot
+            c.apply_root_transform()
+            self.set_module_cfg(as_tree, c)
+            return c
         backup_infer_sequence = MANAGER.config.enable_infer_sequence
         MANAGER.config.enable_infer_sequence = False
         c = cfg.Cfg(as_tree)
@@ -66,13 +75,24 @@ class CovManager(manager.AstManager):
         c.convert_to_ssa()
         c.fill_all_conditions()
         MANAGER.config.enable_infer_sequence = backup_infer_sequence
+        self.save_snapshot(as_tree, c)
+        self.set_module_cfg(as_tree, c)
         return c
 
     def check_assumptions_and_get_model(self, assumptions: set):
         """check assumption for satisfiability. Return True if assumptions is empty"""
+        if self.profiler.enabled:
+            return self.profiler.call(
+                "z3.check_assumptions", self._check_assumptions_and_get_model, assumptions
+            )
+        return self._check_assumptions_and_get_model(assumptions)
+
+    def _check_assumptions_and_get_model(self, assumptions: set):
         self.z3_solver.reset()
         assumptions_hash = hash(frozenset(assumptions))
         assumptions_with_predicate = tuple(assumptions) + (self.predicate_expr,)
+        if self.profiler.enabled:
+            self.profiler.record_cache("z3.check_assumptions", assumptions_hash in self.z3_assumptions_computed_cache)
         if assumptions_hash in self.z3_assumptions_computed_cache:
             return self.z3_assumptions_computed_cache[assumptions_hash]
         else:
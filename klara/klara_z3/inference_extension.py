@@ -50,7 +50,7 @@ def evaluate_paths(conditions, z3_assumptions, context, inverted_conds=None):
     for val_paths in expand_condition(top_bool_node, context):
         # accumulate the selected operand when evaluating bound conditions
         # since the caller will construct a new InferenceResult
-        total_selected_operand = {}
+        total_selected_operand = utilities.SelectedOperand()
         assumptions = set()
         if utilities.check_selected_operand(val_paths):
             yielded = True
@@ -135,7 +135,7 @@ def infer_check_sat(func):
                             yield res
                         else:
                             other_res = inference.InferenceResult.from_other(res, selected_operand=selected_operand)
-                            other_res.bound_conditions.clear()
+                            other_res.bound_conditions = set()
                             other_res.z3_assumptions |= z3_result.assumptions
                             yield other_res
             it = (inference.MultiInferenceResult.combine_inference_results(value) for value in cache.values())
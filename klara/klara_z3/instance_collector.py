@@ -136,6 +136,9 @@ class InstanceCollector:
             hard_constraints = z3.BoolVal(True)
         solver = MSSSolver(hard_constraints, soft_constraints)
         results = []
+        # the solver is shared, drop the assumptions left by the last `MANAGER.check_assumptions_and_get_model()`
+        MANAGER.z3_solver.reset()
+        MANAGER.z3_solver.add(hard_constraints)
         for lits in solver.enumerate_sets():
             cons = [soft_constraints[j] for j in lits]
             if MANAGER.z3_solver.check(*cons) == z3.sat:
@@ -89,18 +89,20 @@ def run(args):
         output_stream = args.output_file or sys.stdout
         if not any((args.cover_return, args.cover_lines, args.cover_all)):
             MANAGER.logger.info("COV", "No coverage strategy is selected. Using cover_return by default")
-            result = solver.solve(text, args)
+            result = solver.solve(text, args, path=file_path)
         else:
             if args.cover_return:
-                result = solver.solve(text, args)
+                result = solver.solve(text, args, path=file_path)
             elif args.cover_lines or args.cover_all:
-                result = line_fix_solver.solve(text, args)
+                result = line_fix_solver.solve(text, args, path=file_path)
             else:
                 MANAGER.logger.warning("COV", "No coverage strategy is selected!")
                 return
         json.dump(result, output_stream, indent=4)
         print("Needed {} amount of instances".format(len(result)))
+    MANAGER.save_persistent_cache()
     MANAGER.logger.info("COV", MANAGER.get_infer_statistics())
+    MANAGER.dump_statistics()
 
 
 def main():
@@ -1,7 +1,6 @@
 import z3
 
 from klara.core import cfg, nodes, utilities
-from klara.core.ssa_visitors import StatementExprExtractor
 from klara.klara_z3 import cov_manager
 from klara.klara_z3 import inference_extension
 from klara.scripts.cover_gen_ins import solver
@@ -58,6 +57,7 @@ class LineFix(solver.DepFinder):
 
     def fix_stmt(self, stmt):
         total = set()
+        MANAGER.build_deferred_scopes(stmt)
         block = stmt.statement().refer_to_block
         conditions = block.conditions
         conditions_hash = hash(block)
@@ -75,26 +75,24 @@ class LineFix(solver.DepFinder):
             self.ins_collector.add_cond(total, str(conditions))
 
     def fix_selected_lines(self, linenos: list):
-        line_dict = {lineno: (None, None) for lineno in linenos}
-        extractor = StatementExprExtractor(line_dict)
         MANAGER.logger.info("LINE-FIX", "fixing lines: {}", linenos)
-        value = extractor.extract(self.as_tree)
-        stmts = list(value)
-        stmts.remove(self.as_tree)
-        for stmt in stmts:
+        for stmt in MANAGER.get_position_index(self.as_tree).first_nodes_at_lines(linenos):
             self.fix_stmt(stmt)
 
 
-def solve(ast_str, config=None):
+def solve(ast_str, config=None, path=None):
     cov_config = config or ConfigNamespace()
     with utilities.temp_config(MANAGER, cov_config):
         MANAGER.reload_protocol()
-        as_tree = MANAGER.build_tree(ast_str)
-        MANAGER.apply_transform(as_tree)
-        c = cfg.Cfg(as_tree)
-        c.apply_transform()
-        c.convert_to_ssa()
-        c.fill_all_conditions()
+        as_tree = MANAGER.build_tree(ast_str, path=path)
+        c = MANAGER.get_module_cfg(as_tree)
+        if c is None:
+            MANAGER.apply_transform(as_tree)
+            c = cfg.Cfg(as_tree)
+            c.apply_transform()
+            c.convert_to_ssa()
+            c.fill_all_conditions()
+            MANAGER.set_module_cfg(as_tree, c)
         df = LineFix(c, as_tree)
         if cov_config.cover_lines:
             df.fix_selected_lines(cov_config.cover_lines)
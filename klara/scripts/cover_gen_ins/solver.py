@@ -110,10 +110,10 @@ class DepFinder(recipe.ClassInstanceBuilder):
                 ins_collector.add_cond(cond)
 
 
-def solve(ast_str, cov_config=None):
+def solve(ast_str, cov_config=None, path=None):
     cov_config = cov_config or config.ConfigNamespace()
     with utilities.temp_config(MANAGER, cov_config):
-        as_tree = MANAGER.build_tree(ast_str)
+        as_tree = MANAGER.build_tree(ast_str, path=path)
         c = MANAGER.build_cfg(as_tree)
         df = DepFinder(c, as_tree)
         df.solve_classdef()
@@ -102,14 +102,19 @@ def run(args, output_stream=sys.stdout, error_stream=sys.stderr):
         MANAGER.logger.info("FCF", "analyzing file: {}\n", file_path_text)
         with utilities.temp_config(MANAGER, args):
             MANAGER.reload_protocol()
-            as_tree = MANAGER.build_tree(text)
-            MANAGER.apply_transform(as_tree)
-            cfg_ir = cfg.Cfg(as_tree)
-            cfg_ir.apply_transform()
-            cfg_ir.convert_to_ssa()
+            as_tree = MANAGER.build_tree(text, path=file_path)
+            cfg_ir = MANAGER.get_module_cfg(as_tree)
+            if cfg_ir is None:
+                MANAGER.apply_transform(as_tree)
+                cfg_ir = cfg.Cfg(as_tree)
+                cfg_ir.apply_transform()
+                cfg_ir.convert_to_ssa()
+                MANAGER.set_module_cfg(as_tree, cfg_ir)
             for checker_mod in get_checker(args):
                 result += checker_mod.solve(cfg_ir, as_tree, text, file_path_text, args)
+    MANAGER.save_persistent_cache()
     MANAGER.logger.info("COV", MANAGER.get_infer_statistics())
+    MANAGER.dump_statistics()
     if result:
         error_stream.write(result)
         sys.exit(1)
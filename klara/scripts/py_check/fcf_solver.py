@@ -248,6 +248,7 @@ class ComparisonSolver(AstVisitor):
         if not root:
             return
         elif isinstance(root, ParentScopeBlock):
+            MANAGER.build_deferred_scopes(root.ast_node)
             self._visited_blk.append(root)
             node = root.ast_node
             if node.parent:
@@ -213,6 +213,18 @@ class BaseTestInference(BaseTest):
         cfg_real.fill_all_conditions()
         return expr, cfg_real
 
+    def infer_with_option(self, source, option, *names):
+        """return the inferred values of the marked nodes, with the config `option` enabled and then disabled"""
+        results = []
+        for enabled in (True, False):
+            setattr(MANAGER.config, option, enabled)
+            MANAGER.infer_cache.clear()
+            ast_nodes, _ = self.build_tree_cfg(source)
+            results.append(
+                [sorted(str(res.result) for res in getattr(ast_nodes, name).value.infer()) for name in names]
+            )
+        return results
+
     @staticmethod
     def extract_results(results_combination):
         """extract the result from InferenceResult in the container"""
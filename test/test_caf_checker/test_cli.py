@@ -41,6 +41,18 @@ class TestCli(BaseTestCli):
             in result
         )
 
+    def test_module_cache(self):
+        f = self.makepyfile(
+            mod_1=dedent(
+                """\
+            x = 1.5
+            x == 1
+            """
+            )
+        )
+        result = self.run_fcf_with_arg([str(f), str(f), "--module-cache", "4"])
+        assert result.count("x = 1.5 (<class 'float'>)") == 2
+
     def test_config_file(self):
         f = self.makepyfile(
             mod_1=dedent(
@@ -1,7 +1,7 @@
 from textwrap import dedent
 
 from klara.common import cfg_common
-from klara.core.cfg import TEMP_ASSIGN, Cfg, GetBlocks, RawBasicBlock
+from klara.core.cfg import TEMP_ASSIGN, BlockList, Cfg, GetBlocks, ParentScopeBlock, RawBasicBlock
 from klara.core.tree_rewriter import AstBuilder
 from test.helper.base_test import BaseTest
 from test.helper.cfg_th import CfgTestAssertion
@@ -346,8 +346,14 @@ class TestCfg(BaseTest, CfgTestAssertion):
         )
 
         cfg_real = Cfg(as_tree)
-        cfg_real.root = cfg_common.delete_node(cfg_real.root, RawBasicBlock(1, 1))
-        # TODO: test assert code
+        get_block = cfg_real.block_list.get_block_by_name
+        assert "L3" in [blk.name for blk in cfg_real.root.get_postorder()]
+        cfg_real.root = cfg_common.delete_node(cfg_real.root, RawBasicBlock(3, 3, name="L3"))
+        assert get_block("L2").nxt_block_list == [get_block("L6")]
+        assert get_block("L3").prev_block_list == []
+        # the cached order of the blocks is updated, the blocks after L3 can't be reached anymore
+        assert [blk.name for blk in cfg_real.root.get_postorder()][:4] == ["PhiStub", "L6", "L2", "L1"]
+        assert cfg_common.delete_node(cfg_real.root, RawBasicBlock(name="Module")) is None
 
     def test_multi_line(self):
         as_tree = AstBuilder().string_build(
@@ -387,3 +393,70 @@ class TestCondition(BaseTest):
         l5 = cfg_real.block_list.get_block_by_name("L5")
         results = {str(s) for s in l5.get_conditions_from_prev(analyzed_block)}
         assert results == {"not(x > 1)"}
+
+
+class TestBlockList:
+    def test_get_block_by_name(self):
+        block_list = BlockList(RawBasicBlock(name=name) for name in ("A", "B", "A"))
+        assert block_list.get_block_by_name("A") is block_list[0]
+        assert block_list.get_block_by_name("C") is None
+        block_list.append(RawBasicBlock(name="C"))
+        assert block_list.get_block_by_name("C") is block_list[3]
+        block_list[1].name = "D"
+        assert block_list.get_block_by_name("B") is None
+        assert block_list.get_block_by_name("D") is block_list[1]
+
+    def test_get_block_by_name_after_change(self):
+        block_list = BlockList(RawBasicBlock(name=name) for name in ("A", "B"))
+        assert block_list.get_block_by_name("A") is block_list[0]
+        block_list[0] = RawBasicBlock(name="A")
+        assert block_list.get_block_by_name("A") is block_list[0]
+        block_list.pop(0)
+        block_list.append(RawBasicBlock(name="A"))
+        assert block_list.get_block_by_name("A") is block_list[1]
+        del block_list[:]
+        assert block_list.get_block_by_name("A") is None
+
+    def test_slotted_block(self):
+        as_tree = AstBuilder().string_build(
+            dedent(
+                """                x = 2
+                if x > 1:
+                    y = 1
+                """
+            )
+        )
+        cfg_real = Cfg(as_tree)
+        assert not hasattr(cfg_real.block_list[1], "__dict__")
+
+
+class TestScopeOrder:
+    def test_reverse_postorder(self):
+        r"""
+          A <---
+         / \   |
+        B   C --
+         \ /
+          D
+        """
+        scope = ParentScopeBlock()
+        scope.blocks.extend(
+            BaseTest.build_arbitrary_blocks(block_links={"A": ["B", "C"], "B": ["D"], "C": ["D", "A"], "D": []})
+        )
+        rpo = scope.get_reverse_postorder()
+        assert [blk.name for blk in rpo] == ["A", "C", "B", "D"]
+        assert scope.get_reverse_postorder() is rpo
+        assert scope.get_postorder() == rpo[::-1]
+        scope.blocks.append(RawBasicBlock(name="E"))
+        assert [blk.name for blk in scope.get_reverse_postorder()] == ["E", "A", "C", "B", "D"]
+
+    def test_reverse_postorder_edge_changed(self):
+        scope = ParentScopeBlock()
+        scope.blocks.extend(
+            BaseTest.build_arbitrary_blocks(block_links={"A": ["B", "C"], "B": ["D"], "C": ["D", "A"], "D": []})
+        )
+        a, b, c, _ = scope.blocks
+        assert [blk.name for blk in scope.get_reverse_postorder()] == ["A", "C", "B", "D"]
+        cfg_common.disconnect_blocks(a, c)
+        Cfg.connect_2_blocks(b, c)
+        assert [blk.name for blk in scope.get_reverse_postorder()] == ["A", "B", "C", "D"]
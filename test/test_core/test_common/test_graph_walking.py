@@ -1,4 +1,5 @@
 from klara.common.cfg_common import GraphWalker
+from klara.core.cfg import Cfg, RawBasicBlock
 from test.helper.base_test import BaseTest
 
 
@@ -56,3 +57,10 @@ class TestDfs:
         gw = GraphWalker(blocks[0])
         blocks_returned = [blk for blk in gw.walk_dfs()]
         assert blocks_returned == [blocks[2], blocks[3], blocks[1], blocks[0]]
+
+    def test_deep_chain(self):
+        blocks = [RawBasicBlock(i, i, name=str(i)) for i in range(5000)]
+        for block, nxt in zip(blocks, blocks[1:]):
+            Cfg.connect_2_blocks(block, nxt)
+        assert list(GraphWalker(blocks[0]).walk_dfs()) == blocks[::-1]
+        assert list(GraphWalker(blocks[0]).walk_bfs()) == blocks
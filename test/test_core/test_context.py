@@ -0,0 +1,105 @@
+import pytest
+
+from klara.core import context_mod, nodes
+from test.helper.base_test import BaseTestInference
+
+
+class TestContextFingerprint(BaseTestInference):
+    def setUp(self):
+        ast_nodes, _ = self.build_tree_cfg(
+            """\
+            def foo(a):
+                return a  #@ ret
+
+            def bar(b):
+                return foo(b)  #@ call
+        """
+        )
+        self.ret = ast_nodes.ret.value
+        self.call = ast_nodes.call.value
+        self.foo = ast_nodes.module.body[0]
+        self.bar = ast_nodes.module.body[1]
+
+    def test_call_chain_hash(self):
+        context = context_mod.InferenceContext()
+        empty_hash = context.call_chain_hash(self.ret)
+        context.add_call_chain(self.call, self.bar)
+        # `ret` is not in scope `bar`, the chain is empty
+        assert context.call_chain_hash(self.ret) == empty_hash
+        context.add_call_chain(self.call, self.foo)
+        assert context.call_chain_hash(self.ret) != empty_hash
+        assert context.get_call_node_chain(self.ret) == [self.call, self.call]
+
+    def test_call_chain_hash_proxy(self):
+        context = context_mod.InferenceContext()
+        other = context_mod.InferenceContext()
+        context.add_call_chain(self.call, nodes.Proxy(self.foo))
+        other.add_call_chain(self.call, self.foo)
+        assert context.call_chain_hash(self.ret) == other.call_chain_hash(self.ret)
+
+    def test_fingerprint_changes(self):
+        context = context_mod.InferenceContext()
+        initial = context.fingerprint(self.ret)
+        assert context.fingerprint(self.ret) == initial
+        context.inverted_conds = {self.call}
+        assert context.fingerprint(self.ret) != initial
+        context.inverted_conds = set()
+        assert context.fingerprint(self.ret) == initial
+        context.globals_context.locals = {"a": self.call}
+        assert context.fingerprint(self.ret) != initial
+        context.globals_context.locals = None
+        context.add_decorator_ignore(self.foo)
+        assert context.fingerprint(self.ret) != initial
+
+    def test_frozen_conditions_and_locals(self):
+        context = context_mod.InferenceContext()
+        context.inverted_conds = {self.call}
+        assert type(context.inverted_conds) is frozenset
+        context.globals_context.locals = {"a": self.call}
+        with pytest.raises(TypeError):
+            context.globals_context.locals["b"] = self.ret
+        with pytest.raises(TypeError):
+            context.globals_context.locals.update(b=self.ret)
+        assert context.globals_context.locals_hash == hash(frozenset({"a": self.call}.items()))
+
+    def test_inverted_conds_hashed_by_value(self):
+        context = context_mod.InferenceContext()
+        other = context_mod.InferenceContext()
+        context.inverted_conds = {nodes.Const(True)}
+        other.inverted_conds = {nodes.Const(True)}
+        # the result of a phi is cached by the value of the conditions, the fingerprint by their identity
+        assert hash(context.inverted_conds) == hash(other.inverted_conds)
+        assert context.inverted_conds_hash != other.inverted_conds_hash
+
+
+class TestCallContext:
+    def test_hash_independent_of_order(self):
+        first = context_mod.CallContext()
+        first["a"] = 1
+        first["b"] = 2
+        second = context_mod.CallContext({"b": 2})
+        second["a"] = 1
+        assert first.items_hash() == second.items_hash()
+
+    def test_hash_maintained(self):
+        call_context = context_mod.CallContext()
+        empty_hash = call_context.items_hash()
+        call_context["a"] = 1
+        call_context["a"] = 2
+        assert call_context.items_hash() == context_mod.CallContext({"a": 2}).items_hash()
+        call_context.pop("a")
+        assert call_context.items_hash() == empty_hash
+        call_context.update(a=1, b=2)
+        del call_context["b"]
+        assert call_context.items_hash() == context_mod.CallContext({"a": 1}).items_hash()
+
+    def test_context_path(self):
+        context = context_mod.InferenceContext(call_context={"a": 1})
+        assert type(context.call_context) is context_mod.CallContext
+        assert context.push_path("node") is False
+        assert context.push_path("node") is True
+        context.call_context["b"] = 2
+        assert context.push_path("node") is False
+        context.call_context.pop("b")
+        context.remove_path("node")
+        assert context.push_path("node") is False
@@ -0,0 +1,40 @@
+from klara.core import dataflow
+
+
+class TestBitIndex:
+    def test_round_trip(self):
+        index = dataflow.BitIndex()
+        bits = index.to_bits(["a", "b", "c"])
+        assert index.to_bits(["b"]) == index.bit("b")
+        assert index.to_set(bits & ~index.bit("b")) == {"a", "c"}
+        assert index.to_set(0) == set()
+
+
+class TestSolve:
+    def test_postorder(self):
+        # 0 -> 1 -> 2, 0 -> 2, 3 unreachable
+        assert dataflow.postorder([[1, 2], [2], [], [2]]) == [2, 1, 0, 3]
+
+    def test_worklist_only_revisit_dependents(self):
+        visited = []
+        values = [0, 0, 0]
+
+        def update(node):
+            visited.append(node)
+            if node == 0 and values[0] == 0:
+                values[0] = 1
+                return True
+            return False
+
+        dataflow.solve_worklist([0, 1, 2], [[2], [], []], update)
+        assert visited == [0, 1, 2]
+        assert values == [1, 0, 0]
+
+    def test_liveness_loop(self):
+        # 0: i = 0; 1: while i: ; 2: i = i + 1 -> 1; 3: return s
+        index = dataflow.BitIndex()
+        succs = [[1], [2, 3], [1], []]
+        gen = [0, index.to_bits("i"), index.to_bits("i"), index.to_bits("s")]
+        kill = [index.to_bits("i"), 0, index.to_bits("i"), 0]
+        live_out = [index.to_set(bits) for bits in dataflow.solve_liveness(succs, gen, kill)]
+        assert live_out == [{"i", "s"}, {"i", "s"}, {"i", "s"}, set()]
@@ -0,0 +1,132 @@
+import pytest
+
+from klara.core import decorators
+from klara.core.manager import AstManager
+
+MANAGER = AstManager()
+
+
+class _Node:
+    pass
+
+
+class TestLruCacheContext:
+    def setup_method(self):
+        self.calls = []
+        self.produced = []
+
+        @decorators.lru_cache_context
+        def infer(node, context=None, inferred_attr=None):
+            self.calls.append(node)
+            for i in range(3):
+                self.produced.append(i)
+                yield i
+
+        self.infer = infer
+        MANAGER.clear_infer_cache()
+
+    def teardown_method(self):
+        MANAGER.clear_infer_cache()
+
+    def test_complete_results_cached(self):
+        node = _Node()
+        assert list(self.infer(node)) == [0, 1, 2]
+        assert list(self.infer(node)) == [0, 1, 2]
+        assert len(self.calls) == 1
+
+    def test_partially_consumed_not_cached(self):
+        node = _Node()
+        assert next(self.infer(node)) == 0
+        assert list(self.infer(node)) == [0, 1, 2]
+        assert len(self.calls) == 2
+        assert list(self.infer(node)) == [0, 1, 2]
+        assert len(self.calls) == 2
+
+    def test_interleaved_consumers(self):
+        node = _Node()
+        first = self.infer(node)
+        second = self.infer(node)
+        assert next(first) == 0
+        assert list(second) == [0, 1, 2]
+        assert list(first) == [1, 2]
+        # every consumer ran its own generator
+        assert self.produced == [0, 0, 1, 2, 1, 2]
+
+    def test_failed_generator_not_cached(self):
+        node = _Node()
+
+        @decorators.lru_cache_context
+        def infer(n, context=None, inferred_attr=None):
+            self.calls.append(n)
+            yield 1
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            list(infer(node))
+        with pytest.raises(ValueError):
+            list(infer(node))
+        assert len(self.calls) == 2
+
+    def test_recursive_infer(self):
+        node = _Node()
+
+        @decorators.lru_cache_context
+        def infer(n, context=None, inferred_attr=None):
+            self.calls.append(n)
+            yield 1
+            if len(self.calls) < 2:
+                yield from infer(n)
+
+        assert list(infer(node)) == [1, 1]
+        assert list(infer(node)) == [1, 1]
+        assert len(self.calls) == 2
+
+
+class _Slotted:
+    __slots__ = ("items_",)
+    items = decorators.lazyslot(list)
+
+    def __init__(self):
+        self.items_ = None
+
+
+class TestLazySlot:
+    def test_created_on_first_access(self):
+        obj = _Slotted()
+        assert obj.items_ is None
+        obj.items.append(1)
+        assert obj.items == [1]
+        assert obj.items_ is obj.items
+
+    def test_set(self):
+        obj = _Slotted()
+        obj.items = [2]
+        assert obj.items == [2]
+        assert not hasattr(obj, "__dict__")
+
+
+class _Cached:
+    __slots__ = ("computed", "value_")
+
+    def __init__(self):
+        self.computed = 0
+        self.value_ = None
+
+    @decorators.cachedslot
+    def value(self):
+        self.computed += 1
+        return self.computed
+
+
+class TestCachedSlot:
+    def test_computed_once(self):
+        obj = _Cached()
+        assert obj.value == 1
+        assert obj.value == 1
+        assert obj.value_ == 1
+
+    def test_reset(self):
+        obj = _Cached()
+        assert obj.value == 1
+        obj.value = None
+        assert obj.value == 2
@@ -1,5 +1,6 @@
 from textwrap import dedent
 
+from klara.common.cfg_common import compute_idoms
 from klara.core.cfg import Cfg, ParentScopeBlock, RawBasicBlock
 from klara.core.tree_rewriter import AstBuilder
 from test.helper.base_test import BaseTest
@@ -427,3 +428,36 @@ class TestMultipleScope(BaseTest, DominatorHelper):
         expected_idom = {"foo": ["L2"], "L2": ["L3", "L5", "L6"], "L3": [], "L5": [], "L6": ["PhiStub"], "PhiStub": []}
         self.assert_idom_equal(cfg_real, expected_idom)
         assert cfg_real.block_list[4].df == [cfg_real.block_list[6]]
+
+
+class TestComputeIdoms:
+    def test_loop(self):
+        # A -> B, B -> C/F, C -> D/E, D -> E, E -> F, F -> B
+        succs = [[1], [2, 5], [3, 4], [4], [5], [1]]
+        assert compute_idoms(succs, [0]) == [-1, 0, 1, 2, 2, 1]
+
+    def test_multiple_roots(self):
+        # A -> C, B -> C
+        assert compute_idoms([[2], [2], []], [0, 1]) == [-1, -1, -1]
+
+    def test_unreachable(self):
+        # B <-> C can't be reached from A
+        assert compute_idoms([[], [2], [1]], [0]) == [-1, None, None]
+
+
+class TestUnreachableDominator(BaseTest, DominatorHelper):
+    def test_unreachable_loop(self):
+        blocks = self.build_arbitrary_blocks(
+            block_links={"A": ["B"], "B": [], "C": ["D"], "D": ["C"]},
+            block_type={"A": ParentScopeBlock},
+        )
+        cfg_real = Cfg()
+        cfg_real.root = blocks[0]
+        cfg_real.root.blocks = blocks
+        cfg_real.block_list = blocks
+        cfg_real.root.fill_dominates()
+        cfg_real.root.fill_idom()
+        self.assert_dominator_equal(
+            cfg_real, {"A": {"A"}, "B": {"A", "B"}, "C": {"A", "B", "C", "D"}, "D": {"A", "B", "C", "D"}}
+        )
+        self.assert_rev_idom_equal(cfg_real, {"A": None, "B": "A", "C": "D", "D": "C"})
@@ -0,0 +1,60 @@
+from klara.core.infer_cache import InferCache, approximate_size
+
+
+class TestInferCache:
+    def test_unlimited(self):
+        cache = InferCache()
+        for i in range(100):
+            cache[i] = [i]
+        assert len(cache) == 100
+        assert cache.evictions == 0
+
+    def test_max_entries_evict_lru(self):
+        cache = InferCache(max_entries=2)
+        cache["a"] = [1]
+        cache["b"] = [2]
+        # access "a" so that "b" is the least recently used
+        assert cache.get("a") == [1]
+        cache["c"] = [3]
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.evictions == 1
+
+    def test_max_bytes(self):
+        value = [1, 2, 3]
+        size = approximate_size(value)
+        cache = InferCache(max_bytes=size * 2)
+        cache["a"] = value
+        cache["b"] = list(value)
+        cache["c"] = list(value)
+        assert len(cache) == 2
+        assert "a" not in cache
+        assert cache.total_bytes <= size * 2
+
+    def test_too_large_value_not_stored(self):
+        cache = InferCache(max_bytes=10)
+        cache["a"] = [1, 2, 3]
+        assert "a" not in cache
+        assert cache.total_bytes == 0
+
+    def test_statistics(self):
+        sentinel = object()
+        cache = InferCache()
+        cache["a"] = [1]
+        assert cache.get("a", sentinel) == [1]
+        assert cache.get("b", sentinel) is sentinel
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.total_bytes == 0
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_set_limits(self):
+        cache = InferCache()
+        for i in range(10):
+            cache[i] = [i]
+        cache.set_limits(max_entries=3)
+        assert list(range(7, 10)) == [i for i in range(10) if i in cache]
+        cache.set_limits(max_entries=0)
+        assert cache.max_entries is None
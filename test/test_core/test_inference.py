@@ -2307,3 +2307,22 @@ class TestImpossiblInference(BaseTestInference):
         )
         res = [r for r in as_tree.d.targets[0].infer()]
         assert str(res[0]) == "[1.2]"
+
+
+class TestInferenceResult(BaseTestInference):
+    def test_sets_shared_until_modified(self):
+        cond = nodes.Const(True)
+        res = inference.InferenceResult.load_result(nodes.Const(1), bound_conditions={cond})
+        other = inference.InferenceResult.from_other(res)
+        assert other.bound_conditions is res.bound_conditions
+        assert hash(other) == hash(res)
+        other.bound_conditions |= {nodes.Const(False)}
+        assert res.bound_conditions == {cond}
+        assert len(other.bound_conditions) == 2
+        assert hash(other) != hash(res)
+
+    def test_merge_without_new_conditions(self):
+        cond = nodes.Const(True)
+        res = inference.InferenceResult.load_result(nodes.Const(1), bound_conditions={cond})
+        merged = inference.InferenceResult.from_other(res, inference_results=(res,))
+        assert merged.bound_conditions is res.bound_conditions
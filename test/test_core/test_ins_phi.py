@@ -1,10 +1,9 @@
-import unittest
 from textwrap import dedent
 
 from klara.core.cfg import Cfg, ParentScopeBlock
 from klara.core.tree_rewriter import AstBuilder
 
-from ..helper.base_test import BaseTest
+from ..helper.base_test import MANAGER, BaseTest, BaseTestInference
 
 
 class TestInitialInfoLiveout(BaseTest):
@@ -186,13 +185,13 @@ class TestInitialInfoLiveout(BaseTest):
         expected_live_out = {"A": {"a", "a.b"}, "B": set()}
         self.assertLiveOutEqual(cfg_real.block_list, expected_live_out)
 
-    # ------------------ test recompute_liveout----------------------------
-    def test_recompute_liveout(self):
+    # ------------------ test compute_live_out of a block list----------------------------
+    def test_compute_live_out_block_list(self):
         # Given: UEVAR(B) = 'c'
         # Expect: LIVEOUT(A) = 'c'
         blocks = self.build_arbitrary_blocks(block_links={"A": ["B"], "B": []})
         blocks[1].ue_var.add("c")
-        assert blocks[0].recompute_liveout() is True
+        Cfg().compute_live_out(block_list=blocks[:1])
         assert blocks[0].live_out == {"c"}
 
         # Given: UEVAR(B) = 'c',
@@ -203,7 +202,7 @@ class TestInitialInfoLiveout(BaseTest):
         blocks = self.build_arbitrary_blocks(block_links={"A": ["B"], "B": []})
         blocks[1].ue_var.add("c")
         blocks[1].live_out.add("d")
-        assert blocks[0].recompute_liveout() is True
+        Cfg().compute_live_out(block_list=blocks[:1])
         assert blocks[0].live_out == {"c", "d"}
 
         # Given: UEVAR(B) = 'c',
@@ -215,7 +214,7 @@ class TestInitialInfoLiveout(BaseTest):
         blocks[1].ue_var.add("c")
         blocks[1].live_out.add("d")
         blocks[1].var_kill.add("d")
-        assert blocks[0].recompute_liveout() is True
+        Cfg().compute_live_out(block_list=blocks[:1])
         assert blocks[0].live_out == {"c"}
 
         # Given: LIVEOUT(A) = 'c'
@@ -229,7 +228,7 @@ class TestInitialInfoLiveout(BaseTest):
         blocks[1].ue_var.add("c")
         blocks[1].live_out.add("d")
         blocks[1].var_kill.add("d")
-        assert blocks[0].recompute_liveout() is False
+        Cfg().compute_live_out(block_list=blocks[:1])
         assert blocks[0].live_out == {"c"}
 
 
@@ -240,116 +239,6 @@ class TestInsPhi(BaseTest):
             assert real_block._phi_repr == expected_phi_list
 
     # ------------------- test phi function insertion-----------------------
-    @unittest.skip("pruned/semipruned phi function is deprecated")
-    def test_insert_phi_function_semi_pruned(self):
-        r"""
-           Note: '|' with no arrows means pointing down
-
-            A
-            |
-            B   <------|
-         /    \        |
-        C      F       |
-        |    /  \      |
-        |    G   I     |
-        |    \   /     |
-        |      H       |
-         \    /        |
-           D-----------|
-           |
-           E
-        """
-        blocks, as_tree = self.build_arbitrary_blocks(
-            block_links={
-                "A": ["B"],
-                "B": ["C", "F"],
-                "C": ["D"],
-                "D": ["E", "B"],
-                "E": [],
-                "F": ["G", "I"],
-                "G": ["H"],
-                "H": ["D"],
-                "I": ["H"],
-            },
-            code={
-                "A": dedent(
-                    """\
-                                                            i = 1
-                                                            """
-                ),
-                "B": dedent(
-                    """\
-                                                            a = temp_0
-                                                            c = temp_1
-                                                            """
-                ),
-                "C": dedent(
-                    """\
-                                                            b = temp_2
-                                                            c = temp_3
-                                                            d = temp_4
-                                                            """
-                ),
-                "D": dedent(
-                    """\
-                                                            y = a + b
-                                                            z = c + d
-                                                            i = i + 1
-                                                            if i < 100:
-                                                                pass
-                                                            """
-                ),
-                "E": "return\n",
-                "F": dedent(
-                    """\
-                                                            a = temp_5
-                                                            d = temp_6
-                                                            if a < d:
-                                                                pass
-                                                            """
-                ),
-                "G": dedent(
-                    """\
-                                                            d = temp
-                                                            """
-                ),
-                "H": dedent(
-                    """\
-                                                            b = temp
-                                                            """
-                ),
-                "I": dedent(
-                    """\
-                                                            c = temp
-                                                            """
-                ),
-            },
-            block_type={"A": ParentScopeBlock},
-        )
-        cfg_real = Cfg()
-        cfg_real.block_list = blocks
-        cfg_real.as_tree = as_tree
-        cfg_real.root = cfg_real.block_list[0]
-        cfg_real.root.blocks = blocks
-        cfg_real.fill_df()
-        cfg_real.gather_initial_info()
-        cfg_real.ins_phi_function_semi_pruned()
-
-        expected_phi_list = {
-            "A": set(),
-            "B": {"a", "b", "c", "d", "i"},
-            "C": set(),
-            "D": {"a", "b", "c", "d"},
-            "E": set(),
-            "F": set(),
-            "G": set(),
-            "H": {"c", "d"},
-            "I": set(),
-        }
-
-        self.assertPhiListEqual(cfg_real.block_list, expected_phi_list)
-
-    @unittest.skip("pruned/semipruned phi function is deprecated")
     def test_insert_phi_function_pruned(self):
         r"""
            Note: '|' with no arrows means pointing down
@@ -444,8 +333,7 @@ class TestInsPhi(BaseTest):
         cfg_real.root.blocks = blocks
         cfg_real.fill_df()
         cfg_real.gather_initial_info()
-        cfg_real.compute_live_out()
-        cfg_real.ins_phi_function_all()
+        cfg_real.ins_phi_function_pruned()
         expected_phi_list = {
             "A": set(),
             "B": {"i"},
@@ -522,3 +410,59 @@ class TestInsPhi(BaseTest):
         assert cfg_real.block_list[-2]._phi_repr == {"a", "b", "z"}
         cfg_real.rename_to_ssa()
         assert "Phi(a_1, a_0)" in str(cfg_real.block_list[-2].ssa_code.code_list)
+
+
+class TestPrunedSsa(BaseTestInference):
+    def setUp(self):
+        self.setup_cov_config(overwrite=True, pruned_ssa=True)
+
+    def test_dead_variable(self):
+        source = """\
+            def foo(a):
+                if a > 2:
+                    b = 1
+                else:
+                    b = 2
+                b = a + 1
+                return b
+            c = foo(3)  #@ c
+        """
+        phi_count, unpruned_phi_count = MANAGER.phi_count, MANAGER.unpruned_phi_count
+        _, cfg_real = self.build_tree_cfg(source)
+        assert MANAGER.unpruned_phi_count - unpruned_phi_count == MANAGER.phi_count - phi_count + 1
+        join_block = cfg_real.block_list.get_block_by_name("L6")
+        assert not join_block.has_phi("b")
+        pruned, unpruned = self.infer_with_option(source, "pruned_ssa", "c")
+        assert pruned == unpruned == [["4"]]
+
+    def test_live_at_call(self):
+        source = """\
+            x = 0
+            if y:
+                x = 1
+            else:
+                x = 2
+            def bar():
+                return x
+            z = bar()  #@ z
+            x = 3
+        """
+        pruned, unpruned = self.infer_with_option(source, "pruned_ssa", "z")
+        assert pruned == unpruned
+        assert pruned == [["1", "2"]]
+
+    def test_live_at_exit(self):
+        source = """\
+            class A:
+                def __init__(self, c):
+                    if c:
+                        self.v = 1
+                    else:
+                        self.v = 2
+                        v = 3
+                    v = 4
+            a = A(True)
+            r = a.v  #@ r
+        """
+        pruned, unpruned = self.infer_with_option(source, "pruned_ssa", "r")
+        assert pruned == unpruned
@@ -0,0 +1,58 @@
+from ..helper.base_test import BaseTestInference
+
+
+class TestLazySsa(BaseTestInference):
+    def setUp(self):
+        self.setup_cov_config(overwrite=True, lazy_ssa=True)
+
+    def test_build_on_inference(self):
+        ast_nodes, cfg_real = self.build_tree_cfg(
+            """\
+            def foo(a):
+                if a > 2:
+                    return a
+                return 0
+            def bar(b):
+                return b  #@ ret
+            c = foo(3)  #@ c
+        """
+        )
+        foo, bar = ast_nodes.module.body[:2]
+        assert bar.refer_to_block.deferred_cfg is not None
+        assert ast_nodes.ret.value.version == -1
+        assert sorted(res.result.value for res in ast_nodes.c.value.infer()) == [0, 3]
+        assert foo.refer_to_block.deferred_cfg is None
+        assert cfg_real.block_list.get_block_by_name("L3").conditions
+        assert bar.refer_to_block.deferred_cfg is not None
+        list(ast_nodes.ret.value.infer())
+        assert bar.refer_to_block.deferred_cfg is None
+        assert ast_nodes.ret.value.version == 0
+
+    def test_method(self):
+        source = """\
+            class A:
+                def __init__(self, v):
+                    self.v = v
+                def get(self):
+                    return self.v
+            def make(n):
+                return A(n)
+            a = make(3)
+            r = a.get()  #@ r
+        """
+        lazy, eager = self.infer_with_option(source, "lazy_ssa", "r")
+        assert lazy == eager == [["3"]]
+
+    def test_kill_at_call(self):
+        source = """\
+            class B:
+                def __init__(self):
+                    self.x = 1
+                def set(self):
+                    self.x = 5
+            b = B()
+            b.set()
+            s = b.x  #@ s
+        """
+        lazy, eager = self.infer_with_option(source, "lazy_ssa", "s")
+        assert lazy == eager == [["5"]]
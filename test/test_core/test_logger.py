@@ -0,0 +1,29 @@
+import logging
+
+from klara.core.base_manager import BaseManager, CustomLogger
+
+MANAGER = BaseManager()
+
+
+class TestCustomLogger:
+    def test_disabled_level(self):
+        logged = []
+        logger = CustomLogger(lambda *args: logged.append(args), is_enabled=lambda: False)
+        logger("SSA", "  message {}", 1)
+        assert logged == []
+        # the duration is passed to the log method, which discards it according to the level
+        with logger("SSA", "operation"):
+            pass
+        assert [args[:2] for args in logged] == [("", "operation took {}")]
+
+    def test_enabled_level(self):
+        logged = []
+        logger = CustomLogger(lambda *args: logged.append(args))
+        logger("SSA", "  message {}", 1)
+        assert logged == [("SSA", "message {}", 1)]
+
+    def test_manager_logger_level(self, caplog):
+        with caplog.at_level(logging.INFO, logger="PYSCA"):
+            MANAGER.logger.debug("SSA", "debug message")
+            MANAGER.logger.info("SSA", "info message")
+        assert [record.getMessage() for record in caplog.records] == ["[SSA] info message"]
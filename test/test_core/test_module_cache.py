@@ -0,0 +1,76 @@
+import pathlib
+import tempfile
+
+from test.helper.base_test import MANAGER, BaseTestInference
+
+
+class TestModuleCache(BaseTestInference):
+    SOURCE = """\
+        def foo(a):
+            if a > 2:
+                return a
+            return 0
+        x = foo(3)
+    """
+
+    def setUp(self):
+        self.setup_cov_config(overwrite=True, module_cache=4)
+
+    def build(self, source, name=""):
+        as_tree = self.COV_MANAGER.build_tree(source, name)
+        return as_tree, self.COV_MANAGER.build_cfg(as_tree)
+
+    def test_same_source(self):
+        built_tree, built_cfg = self.build(self.SOURCE)
+        results = sorted(res.result.value for res in built_tree.body[-1].value.infer())
+        cached_tree, cached_cfg = self.build(self.SOURCE)
+        assert cached_tree is built_tree
+        assert cached_cfg is built_cfg
+        assert MANAGER.built_tree[""] is cached_tree
+        assert sorted(res.result.value for res in cached_tree.body[-1].value.infer()) == results
+
+    def test_different_key(self):
+        built_tree, _ = self.build(self.SOURCE)
+        assert self.build(self.SOURCE, name="other")[0] is not built_tree
+        assert self.build("x = 1")[0] is not built_tree
+        MANAGER.config.py_version = 2
+        assert self.build(self.SOURCE)[0] is not built_tree
+
+    def test_disabled(self):
+        MANAGER.config.module_cache = 0
+        built_tree, built_cfg = self.build(self.SOURCE)
+        rebuilt_tree, rebuilt_cfg = self.build(self.SOURCE)
+        assert rebuilt_tree is not built_tree
+        assert rebuilt_cfg is not built_cfg
+
+    def test_bounded(self):
+        MANAGER.config.module_cache = 2
+        built_tree, _ = self.build(self.SOURCE)
+        self.build("x = 1")
+        self.build("x = 2")
+        assert self.build(self.SOURCE)[0] is not built_tree
+
+    def test_kept_after_infer_cache_cleared(self):
+        built_tree, built_cfg = self.build(self.SOURCE)
+        MANAGER.clear_infer_cache()
+        assert MANAGER.get_module_cfg(built_tree) is built_cfg
+        assert self.build(self.SOURCE)[0] is built_tree
+        MANAGER.clear_module_cache()
+        assert MANAGER.get_module_cfg(built_tree) is None
+        assert self.build(self.SOURCE)[0] is not built_tree
+
+    def test_path_key(self):
+        built_tree = self.COV_MANAGER.build_tree(self.SOURCE, path="mod_1.py")
+        assert self.COV_MANAGER.build_tree(self.SOURCE, path="mod_1.py") is built_tree
+        assert self.COV_MANAGER.build_tree(self.SOURCE, path="mod_2.py") is not built_tree
+        assert self.COV_MANAGER.build_tree(self.SOURCE) is not built_tree
+
+    def test_build_modules(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory) / "mod.py"
+            path.write_text("x = 1\n")
+            (built_tree,) = MANAGER.build_modules([path])
+            assert MANAGER.build_modules([path]) == [built_tree]
+            assert MANAGER.built_tree[str(path)] is built_tree
+            path.write_text("x = 2\n")
+            assert MANAGER.build_modules([path]) != [built_tree]
@@ -42,6 +42,12 @@ except ValueError:
         tr.visit_module(as_tree)
         pass
 
+    def test_visit_cache(self):
+        tr = TreeRewriter()
+        tr.visit_module(ast.parse("x = y + z"))
+        assert tr._visit_cache[ast.Name] == tr.visit_name
+        assert tr._visit_cache[ast.BinOp] == tr.visit_binop
+
 
 class TestParentInfo:
     def test_parent_of_node(self):
@@ -113,6 +119,50 @@ class TestBaseNode:
         assert tree.body[1].body[0].body[0].get_parent_of_type(nodes.ClassDef) == tree.body[1]
         assert tree.body[1].body[0].body[0].get_parent_of_type(nodes.Module) == tree
 
+    def test_scope_and_statement_resolved_once(self):
+        tree = AstBuilder().string_build(
+            """\
+            def foo():
+                y = x + 1
+            z = 2
+        """
+        )
+        foo = tree.body[0]
+        name = foo.body[0].value.left
+        assert name.resolved_ is None
+        assert name.scope() is foo
+        assert name.statement() is foo.body[0]
+        assert name.resolved_[1:] == [foo, foo.body[0]]
+        assert name.scope() is foo
+        # moving the node invalidates what's resolved
+        name.parent = tree.body[1]
+        assert name.scope() is tree
+        assert name.statement() is tree.body[1]
+        assert foo.body[0].value.scope() is foo
+        # a new node getting its first parent doesn't
+        resolved = foo.body[0].value.resolved_
+        nodes.Name(parent=foo.body[0]).parent = foo.body[0]
+        new_name = nodes.Name()
+        new_name.parent = foo.body[0].value
+        assert foo.body[0].value.scope() is foo
+        assert foo.body[0].value.resolved_ is resolved
+        assert new_name.statement() is foo.body[0]
+
+    def test_slotted_nodes(self):
+        tree = AstBuilder().string_build(
+            """\
+            def foo(a, b=[1, 2]):
+                for i in range(a):
+                    a += {i: (i, b)}
+                return lambda: a
+        """
+        )
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            assert not hasattr(node, "__dict__"), node
+            stack.extend(c for c in node.get_children() if isinstance(c, nodes.BaseNode))
+
 
 class TestBaseContainer:
     def test_get_index(self):
@@ -158,7 +208,9 @@ class TestScopedNode:
                     pass
         """
         )
+        assert tree.body[0].type_ is None
         assert tree.body[0].type == "function"
+        assert tree.body[0].type_ == "function"
         assert tree.body[1].body[0].type == "method"
         assert tree.body[1].body[1].type == "staticmethod"
         assert tree.body[1].body[2].type == "classmethod"
@@ -176,6 +228,20 @@ class TestScopedNode:
         assert tree.containing_scope == [tree.body[0], tree.body[1]]
         assert tree.body[1].containing_scope == [tree.body[1].body[0]]
 
+    def test_scope_containers_created_lazily(self):
+        tree = AstBuilder().string_build(
+            """\
+            def foo():
+                return [x for x in range(3)]
+        """
+        )
+        list_comp = tree.body[0].body[0].value
+        assert list_comp.locals_ is None and list_comp.ssa_record_ is None
+        assert list_comp.get_version("x") == -1
+        assert list_comp.ssa_record_ is not None and list_comp.locals_ is None
+        list_comp.create_latest_stmt("x", list_comp.elt)
+        assert list_comp.get_latest_stmt("x") is list_comp.elt
+
     def test_functiondef_return_nodes(self):
         tree = AstBuilder().string_build(
             """\
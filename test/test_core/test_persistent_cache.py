@@ -0,0 +1,115 @@
+import pathlib
+import tempfile
+
+from klara.core import cfg, context_mod, nodes, persistent_cache
+from klara.core.manager import AstManager
+from test.helper.base_test import BaseTestInference
+
+MANAGER = AstManager()
+
+
+class TestPersistentInferCache(BaseTestInference):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.setup_cov_config(overwrite=True, infer_cache_dir=self.cache_dir.name)
+
+    def tearDown(self):
+        super(TestPersistentInferCache, self).tearDown()
+        MANAGER.persistent_cache = None
+        self.cache_dir.cleanup()
+
+    @staticmethod
+    def build_tree(source):
+        # simulate a fresh run by dropping the in memory summaries
+        MANAGER.save_persistent_cache()
+        MANAGER.persistent_cache = None
+        as_tree = MANAGER.build_tree(source)
+        cfg_real = cfg.Cfg(as_tree)
+        cfg_real.apply_transform()
+        cfg_real.convert_to_ssa()
+        cfg_real.fill_all_conditions()
+        return as_tree
+
+    @staticmethod
+    def infer_return_value(func, **call_context):
+        context = context_mod.InferenceContext()
+        for arg in func.args.args:
+            if arg.arg in call_context:
+                context.call_context[arg] = call_context[arg.arg]
+        MANAGER.infer_cache.clear()
+        return [res.result.value for res in func.infer_return_value(context)]
+
+    def test_reload_summary(self):
+        source = """\
+            def foo(a=1):
+                return a + 2
+        """
+        as_tree = self.build_tree(source)
+        assert self.infer_return_value(as_tree.body[0]) == [3]
+        assert MANAGER.persistent_cache.misses == 1
+        as_tree = self.build_tree(source)
+        assert self.infer_return_value(as_tree.body[0]) == [3]
+        assert MANAGER.persistent_cache.hits == 1
+
+    def test_call_context_in_key(self):
+        source = """\
+            def foo(a):
+                return a * 2
+        """
+        as_tree = self.build_tree(source)
+        assert self.infer_return_value(as_tree.body[0], a=nodes.Const(2)) == [4]
+        as_tree = self.build_tree(source)
+        assert self.infer_return_value(as_tree.body[0], a=nodes.Const(3)) == [6]
+        assert MANAGER.persistent_cache.hits == 0
+        assert self.infer_return_value(as_tree.body[0], a=nodes.Const(2)) == [4]
+        assert MANAGER.persistent_cache.hits == 1
+
+    def test_call_chain(self):
+        source = """\
+            y = 3
+            def outer(a):
+                def inner(b):
+                    return a + b + y
+                return inner(2)
+            x = outer(1)
+            z = outer(5)
+        """
+        as_tree = self.build_tree(source)
+        assert [res.result.value for res in as_tree.body[-2].value.infer()] == [6]
+        as_tree = self.build_tree(source)
+        # inner(2) captures a different `a`, the summary of the first run can't be used
+        assert [res.result.value for res in as_tree.body[-1].value.infer()] == [10]
+        assert MANAGER.persistent_cache.hits == 0
+        MANAGER.infer_cache.clear()
+        assert [res.result.value for res in as_tree.body[-2].value.infer()] == [6]
+        assert MANAGER.persistent_cache.hits == 1
+
+    def test_source_changed(self):
+        as_tree = self.build_tree("def foo(): return 1")
+        assert self.infer_return_value(as_tree.body[0]) == [1]
+        as_tree = self.build_tree("def foo(): return 2")
+        assert self.infer_return_value(as_tree.body[0]) == [2]
+        assert MANAGER.persistent_cache.hits == 0
+
+    def test_conditions_not_persisted(self):
+        source = """\
+            def foo(a: int):
+                if a > 2:
+                    return 1
+                return 2
+        """
+        as_tree = self.build_tree(source)
+        assert sorted(self.infer_return_value(as_tree.body[0])) == [1, 2]
+        as_tree = self.build_tree(source)
+        assert sorted(self.infer_return_value(as_tree.body[0])) == [1, 2]
+        assert MANAGER.persistent_cache.hits == 0
+
+    def test_extension_file_content_in_fingerprint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            extension = pathlib.Path(directory) / "extension.py"
+            extension.write_text("x = 1\n")
+            config = self.setup_cov_config(infer_extension_files=[str(extension)])
+            fingerprint = persistent_cache.config_fingerprint(config)
+            assert persistent_cache.config_fingerprint(config) == fingerprint
+            extension.write_text("x = 22\n")
+            assert persistent_cache.config_fingerprint(config) != fingerprint
@@ -0,0 +1,110 @@
+import textwrap
+
+from klara.core import nodes, ssa_visitors
+from klara.core.bases import BaseNode
+from klara.core.position_index import PositionIndex
+from test.helper.base_test import MANAGER, BaseTestInference
+
+SOURCE = """\
+import os
+
+class Foo:
+    def __init__(self, a):
+        self.a = a.b + os.sep
+
+    def bar(self, c,
+            d):
+        if c > self.a:
+            return call(c,
+                        d)
+
+x = Foo(1).bar(2, 3)
+"""
+
+
+class TestPositionIndex(BaseTestInference):
+    def setUp(self):
+        self.as_tree = MANAGER.build_tree(SOURCE)
+        self.index = PositionIndex(self.as_tree)
+
+    def all_positions(self):
+        positions = set()
+        stack = [self.as_tree]
+        while stack:
+            node = stack.pop()
+            if node.lineno is not None and node.col_offset is not None:
+                positions.add((node.lineno, node.col_offset))
+            stack.extend(child for child in node.get_children() if isinstance(child, BaseNode))
+        return positions
+
+    def test_node_at_same_as_node_finder(self):
+        positions = self.all_positions()
+        assert len(positions) > 20
+        for lineno, col_offset in positions:
+            nf = ssa_visitors.NodeFinder(lambda x: x.lineno == lineno and x.col_offset == col_offset)
+            assert self.index.node_at(lineno, col_offset) is nf.execute(self.as_tree)
+        assert self.index.node_at(2, 0) is None
+
+    def test_node_at_skip_variable_children(self):
+        node = self.index.node_at(5, 8)
+        assert isinstance(node, nodes.AssignAttribute)
+        assert node.attr == "a"
+
+    def test_first_node_at_line_same_as_extractor(self):
+        for lineno in range(1, len(SOURCE.splitlines()) + 2):
+            extracted = ssa_visitors.StatementExprExtractor({lineno: ("node", None)}).extract(self.as_tree)
+            assert self.index.first_node_at_line(lineno) is getattr(extracted, "node", None)
+
+    def test_first_nodes_at_lines(self):
+        stmts = self.index.first_nodes_at_lines([13, 9, 2, 9, 11])
+        assert [stmt.lineno for stmt in stmts] == [9, 11, 13]
+        assert isinstance(stmts[0], nodes.If)
+        assert isinstance(stmts[1], nodes.Name) and stmts[1].id == "d"
+
+    def test_nodes_in_lines(self):
+        found = self.index.nodes_in_lines(7, 8)
+        assert found[0] is self.as_tree.body[1].body[1]
+        assert [node.arg for node in found if isinstance(node, nodes.Arg)] == ["self", "c", "d"]
+        positions = [(node.lineno, node.col_offset) for node in found]
+        assert positions == sorted(positions)
+        assert self.index.nodes_in_lines(14, 20) == []
+
+    def test_enclosing_statement_and_scope(self):
+        bar = self.as_tree.body[1].body[1]
+        ret = bar.body[0].body[0]
+        assert self.index.enclosing_statement(11, 30) is ret
+        assert self.index.enclosing_scope(11, 30) is bar
+        assert self.index.enclosing_statement(5, 100) is self.as_tree.body[1].body[0].body[0]
+        assert self.index.enclosing_scope(13, 0) is self.as_tree
+        assert self.index.enclosing_statement(0, 0) is None
+        assert self.index.enclosing_scope(0, 0) is self.as_tree
+
+    def test_enclosing_nested_scope(self):
+        source = """\
+            def outer():
+                def inner():
+                    x = 1
+                y = 2
+
+                return y
+        """
+        as_tree = MANAGER.build_tree(textwrap.dedent(source))
+        index = PositionIndex(as_tree)
+        outer = as_tree.body[0]
+        inner = outer.body[0]
+        assert index.enclosing_scope(3, 20) is inner
+        assert index.enclosing_statement(3, 20) is inner.body[0]
+        # after the nested def, in the indentation of the next statement and on the empty line
+        assert index.enclosing_scope(4, 0) is outer
+        assert index.enclosing_statement(4, 0) is outer
+        assert index.enclosing_statement(4, 6) is outer.body[1]
+        assert index.enclosing_scope(5, 0) is outer
+        assert index.enclosing_node(6, 0) is outer
+        assert index.enclosing_statement(6, 4) is outer.body[2]
+
+    def test_manager_index(self):
+        index = MANAGER.get_position_index(self.as_tree)
+        assert MANAGER.get_position_index(self.as_tree) is index
+        as_tree = MANAGER.build_tree(textwrap.dedent(SOURCE))
+        assert MANAGER.get_position_index(as_tree) is not index
+        assert MANAGER.get_position_index(as_tree).node_at(13, 0).id == "x"
@@ -0,0 +1,53 @@
+import io
+import json
+
+from klara.core import profiler
+from test.helper.base_test import MANAGER, BaseTestInference
+
+
+class TestInferProfiler(BaseTestInference):
+    def setUp(self):
+        MANAGER.profiler.clear()
+        MANAGER.profiler.enabled = True
+
+    def tearDown(self):
+        super(TestInferProfiler, self).tearDown()
+        MANAGER.profiler.enabled = False
+        MANAGER.profiler.clear()
+
+    def test_handler_statistics(self):
+        ast_nodes, _ = self.build_tree_cfg(
+            """\
+            a = 1
+            b = a + 2  #@ b
+        """
+        )
+        assert [res.result.value for res in ast_nodes.b.value.infer()] == [3]
+        assert [res.result.value for res in ast_nodes.b.value.infer()] == [3]
+        handlers = MANAGER.profiler.to_dict()
+        binop = handlers["klara.core.inference.infer_binop"]
+        assert binop["calls"] == 1
+        assert binop["results"] == 1
+        assert binop["cache_hits"] == 1
+        assert binop["cache_misses"] == 1
+        assert binop["time"] >= binop["self_time"] >= 0
+        assert handlers["klara.core.inference.infer_name"]["calls"] == 1
+
+    def test_dump_json(self):
+        assert list(MANAGER.profiler.profile("foo", iter([1, 2]))) == [1, 2]
+        f = io.StringIO()
+        MANAGER.profiler.dump(f, counters={"infer": 1})
+        dumped = json.loads(f.getvalue())
+        assert dumped["handlers"]["foo"]["results"] == 2
+        assert dumped["counters"] == {"infer": 1}
+
+    def test_nested_time(self):
+        p = profiler.InferProfiler()
+
+        def outer():
+            yield from p.profile("inner", iter([1]))
+
+        assert list(p.profile("outer", outer())) == [1]
+        outer_stats, inner_stats = p.handlers["outer"], p.handlers["inner"]
+        assert outer_stats.time >= inner_stats.time
+        assert abs(outer_stats.self_time - (outer_stats.time - inner_stats.time)) < 1e-6
@@ -0,0 +1,147 @@
+import io
+import pathlib
+import tempfile
+from unittest import mock
+
+import pytest
+
+from klara.core import snapshot
+from test.helper.base_test import MANAGER, BaseTestInference
+
+
+class TestSnapshot(BaseTestInference):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.setup_cov_config(overwrite=True, snapshot_cache_dir=self.cache_dir.name)
+
+    def tearDown(self):
+        super(TestSnapshot, self).tearDown()
+        self.cache_dir.cleanup()
+
+    def build(self, source):
+        as_tree = self.COV_MANAGER.build_tree(source)
+        cfg_real = self.COV_MANAGER.build_cfg(as_tree)
+        MANAGER.infer_cache.clear()
+        return as_tree, cfg_real
+
+    def snapshot_files(self):
+        return list(pathlib.Path(self.cache_dir.name).iterdir())
+
+    @staticmethod
+    def ssa_code(cfg_real):
+        return sorted(str(code) for block in cfg_real.block_list for code in block.ssa_code.code_list)
+
+    def test_load_snapshot(self):
+        source = """\
+            def foo(a):
+                b = a + 1
+                if b > 2:
+                    b = b * 2
+                return b
+            x = foo(3)
+        """
+        built_tree, built_cfg = self.build(source)
+        assert len(self.snapshot_files()) == 1
+        assert sorted(res.result.value for res in built_tree.body[-1].value.infer()) == [4, 8]
+        loaded_tree, loaded_cfg = self.build(source)
+        assert loaded_tree is not built_tree
+        assert MANAGER.built_tree[""] is loaded_tree
+        assert len(loaded_cfg.block_list) == len(built_cfg.block_list)
+        assert self.ssa_code(loaded_cfg) == self.ssa_code(built_cfg)
+        assert loaded_cfg.as_tree is loaded_tree
+        assert sorted(res.result.value for res in loaded_tree.body[-1].value.infer()) == [4, 8]
+
+    def test_builtins_not_copied(self):
+        source = """\
+            x = [1, 2]
+            y = x.copy()
+        """
+        self.build(source)
+        loaded_tree, _ = self.build(source)
+        assert loaded_tree.body[0].value.obj is MANAGER.builtins_ast_cls[list]
+
+    def test_config_in_key(self):
+        source = "x = 1"
+        self.build(source)
+        MANAGER.config.pruned_ssa = True
+        self.build(source)
+        assert len(self.snapshot_files()) == 2
+        self.build("x = 2")
+        assert len(self.snapshot_files()) == 3
+
+    def test_lazy_ssa(self):
+        MANAGER.config.lazy_ssa = True
+        source = """\
+            def foo(a):
+                if a > 2:
+                    return a
+                return 0
+            def bar(b):
+                return foo(b)
+        """
+        self.build(source)
+        loaded_tree, _ = self.build(source)
+        bar = loaded_tree.body[1]
+        assert bar.refer_to_block.deferred_cfg is not None
+        call = bar.body[0].value
+        assert call.args[0].version == -1
+        list(call.infer())
+        assert bar.refer_to_block.deferred_cfg is None
+        assert call.args[0].version == 0
+
+    def test_corrupted_snapshot(self):
+        source = "x = 1"
+        self.build(source)
+        snapshot_file = self.snapshot_files()[0]
+        snapshot_file.write_bytes(b"not a snapshot")
+        as_tree, _ = self.build(source)
+        assert [res.result.value for res in as_tree.body[0].value.infer()] == [1]
+        # the snapshot is saved again
+        assert snapshot.load(snapshot_file, MANAGER.builtins_tree) is not None
+
+
+class TestSnapshotGraph(BaseTestInference):
+    @staticmethod
+    def dump_load(as_tree, *roots):
+        file = io.BytesIO()
+        snapshot.Snapshot(MANAGER.builtins_tree).dump(file, as_tree, *roots)
+        file.seek(0)
+        return snapshot.Snapshot(MANAGER.builtins_tree).load(file)
+
+    def test_shared_container(self):
+        as_tree = MANAGER.build_tree("x = 1")
+        assign = as_tree.body[0]
+        assign.replaced_links = assign.targets
+        (loaded_tree,) = self.dump_load(as_tree)
+        loaded_assign = loaded_tree.body[0]
+        assert loaded_assign.replaced_links is loaded_assign.targets
+        assert loaded_assign.targets[0].statement() is loaded_assign
+
+    def test_hashed_by_content(self):
+        as_tree = MANAGER.build_tree("x = 1")
+        assign = as_tree.body[0]
+        # the set is unpickled before the state of the const is restored
+        as_tree.instance_dict = {assign.value: assign}
+        (loaded_tree,) = self.dump_load(as_tree)
+        assert loaded_tree.instance_dict[loaded_tree.body[0].value] is loaded_tree.body[0]
+
+    def test_explicit_inference_not_saved(self):
+        as_tree = MANAGER.build_tree("x = 1")
+        as_tree.body[0].value.explicit_inference = lambda node, context=None: iter(())
+        (loaded_tree,) = self.dump_load(as_tree)
+        assert loaded_tree.body[0].value.explicit_inference is None
+
+    def test_external_module(self):
+        as_tree = MANAGER.build_tree("x = 1")
+        as_tree.containing_scope.append(MANAGER.build_tree("y = 1"))
+        with pytest.raises(snapshot.SnapshotError):
+            self.dump_load(as_tree)
+
+    def test_temp_file_removed_on_error(self):
+        as_tree = MANAGER.build_tree("x = 1")
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_file = pathlib.Path(cache_dir) / "x.snapshot"
+            with mock.patch.object(snapshot.Snapshot, "dump", side_effect=OSError("disk full")):
+                with pytest.raises(OSError):
+                    snapshot.dump(cache_file, MANAGER.builtins_tree, as_tree, None)
+            assert list(pathlib.Path(cache_dir).iterdir()) == []
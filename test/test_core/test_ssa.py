@@ -3,7 +3,7 @@ from collections import deque
 from textwrap import dedent
 
 from klara.core.cfg import Cfg
-from klara.core.ssa_visitors import AstAttrSeparator, VariableGetter
+from klara.core.ssa_visitors import AstAttrSeparator, AstVisitor, VariableGetter
 from klara.core.tree_rewriter import AstBuilder
 
 
@@ -148,3 +148,36 @@ class TestAstAttrSeparator:
         ast_sep.visit(attr_node)
         load_set = {str(s) for s in ast_sep.load}
         assert load_set == {"snake.colour.egg", "snake.colour", "snake"}
+
+
+class _NameCounter(AstVisitor):
+    def __init__(self):
+        self.names = 0
+        self.visited = []
+
+    def visit_name(self, node):
+        self.names += 1
+
+    def generic_visit(self, node):
+        self.visited.append(type(node).__name__)
+        super(_NameCounter, self).generic_visit(node)
+
+
+class _AssignNameCounter(_NameCounter):
+    def visit_assignname(self, node):
+        self.names += 1
+
+
+class TestAstVisitorDispatch:
+    def test_dispatch_per_visitor_class(self):
+        as_tree = AstBuilder().string_build("x = y + z")
+        counter = _NameCounter()
+        counter.visit(as_tree)
+        assert counter.names == 2
+        assert counter.visited == ["Module", "Assign", "AssignName", "BinOp"]
+        # the subclass doesn't share the dispatch table of the base visitor
+        sub_counter = _AssignNameCounter()
+        sub_counter.visit(as_tree)
+        assert sub_counter.names == 3
+        assert sub_counter.visited == ["Module", "Assign", "BinOp"]
+        assert _NameCounter._dispatch is not _AssignNameCounter._dispatch
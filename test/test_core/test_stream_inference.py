@@ -0,0 +1,56 @@
+from klara.core import inference, nodes, utilities
+from test.helper.base_test import MANAGER, BaseTestInference
+
+
+class TestStreamInference(BaseTestInference):
+    def setUp(self):
+        self.setup_cov_config(overwrite=True, stream_inference=True)
+        self.produced = []
+
+    def _results(self, *values):
+        for i, v in enumerate(values):
+            self.produced.append(v)
+            yield inference.InferenceResult.load_result(nodes.Const(v), selected_operand={"pivot": i})
+
+    def test_yield_first_seen_immediately(self):
+        wrapped = inference.cache_yield_different(self._results)
+        it = wrapped(1, 2, 3)
+        first = next(it)
+        assert first.result.value == 1
+        # a single result is not wrapped, the same as the default mode
+        assert type(first) is inference.InferenceResult
+        assert self.produced == [1]
+
+    def test_combine_when_duplicate_arrive(self):
+        wrapped = inference.cache_yield_different(self._results)
+        it = wrapped(1, 2, 1)
+        first = next(it)
+        first_hash = hash(first)
+        third_operand = utilities.SelectedOperand.from_operands({"pivot": 2})
+        assert first.selected_operand.is_conflict(third_operand)
+        rest = list(it)
+        assert [res.result.value for res in rest] == [2, 1]
+        assert self.produced == [1, 2, 1]
+        # the yielded result is never changed, the combination is a new result
+        assert first.selected_operand.is_conflict(third_operand)
+        assert hash(first) == first_hash
+        combined = rest[-1]
+        assert isinstance(combined, inference.MultiInferenceResult)
+        assert not combined.selected_operand.is_conflict(third_operand)
+
+    def test_same_results_as_default(self):
+        source = """\
+            def foo(a):
+                if a > 2:
+                    b = 1
+                else:
+                    b = 2
+                return b + a * 0  #@ ret
+            c = foo(1) + foo(3)  #@ c
+        """
+        ast_nodes, _ = self.build_tree_cfg(source)
+        streamed = {str(res.result) for res in ast_nodes.c.value.infer()}
+        MANAGER.config.stream_inference = False
+        MANAGER.infer_cache.clear()
+        default = {str(res.result) for res in ast_nodes.c.value.infer()}
+        assert streamed == default
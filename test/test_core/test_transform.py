@@ -46,6 +46,25 @@ class TestCustomTransform:
             MANAGER.apply_transform(new_tree)
             assert repr(new_tree.body[0].value) == "BinOp: BinOp: y + z + y"
 
+    def test_replaced_statement(self):
+        """the statement of the nodes of the replaced subtree is resolved again"""
+
+        def transform_assign(node):
+            new_node = nodes.Assign(node.lineno, node.col_offset, parent=node.parent)
+            new_node.postinit(node.targets, node.value)
+            node.value.parent = new_node
+            for target in node.targets:
+                target.parent = new_node
+            return new_node
+
+        new_tree = TreeRewriter().visit_module(ast.parse("x = foo(a + 1)"))
+        name = new_tree.body[0].value.args[0].left
+        assert name.statement() is new_tree.body[0]
+        with add_transform(MANAGER, nodes.Assign, transform_assign):
+            MANAGER.apply_transform(new_tree)
+        assert name.statement() is new_tree.body[0]
+        assert name.scope() is new_tree
+
 
 class TestExplicitInference(BaseTestInference):
     def test_explicit_inference(self):
@@ -1,4 +1,15 @@
-from klara.core.utilities import SubsetTree, TempAttr
+import itertools
+
+from klara.core import nodes
+from klara.core.base_manager import BaseManager
+from klara.core.utilities import (
+    SelectedOperand,
+    SubsetTree,
+    TempAttr,
+    check_selected_operand,
+    infer_product,
+    is_subset,
+)
 
 
 class TestTempAttr:
@@ -16,6 +27,20 @@ class TestTempAttr:
         assert ins.another == 1
 
 
+class TestIsSubset:
+    def test_cancel_sub_and_super_node(self):
+        left, right, other = nodes.Name("x"), nodes.Const(1), nodes.Name("y")
+        compare = nodes.BoolOp()
+        compare.postinit("and", [left, right])
+        not_other = nodes.UnaryOp()
+        not_other.postinit("not", other)
+        assert is_subset({left, other, right}, {not_other}) == {left, right}
+        assert is_subset({not_other, left}, {other}) == {left}
+        # the values of BoolOp are in a list, which is not a field of the node
+        assert is_subset({left}, {compare}) == {left}
+        assert is_subset({left}, set()) == {left}
+
+
 class TestSubsetTree:
     def build_sub_tree(self, lits):
         return SubsetTree.build_sub_tree((i, k) for i, k in enumerate(lits))
@@ -64,3 +89,70 @@ class TestSubsetTree:
         st = self.build_sub_tree(dictionary.keys())
         res = list(self.all_subset(st))
         assert res == [[{1, 2, 3}, {1, 2}], [{1, 2, 4}, {1, 2}, {2, 4}]]
+
+
+class TestInferProduct:
+    def test_same_as_product(self):
+        operands = ([{"a": 1}, {"a": 2}, {}], [{"b": 1}, {"a": 1}], [{"a": {1, 2}, "b": 2}, {"b": 1}])
+        expected = [p for p in itertools.product(*operands) if check_selected_operand(p)]
+        assert list(infer_product(*operands)) == expected
+        assert list(infer_product(*operands, disable_caching=True)) == list(itertools.product(*operands))
+
+    def test_empty(self):
+        assert list(infer_product()) == [()]
+        assert list(infer_product([{}], [])) == []
+
+    def test_prune_conflicted_prefix(self):
+        first = [{"a": 1}, {"a": 2}]
+        second = [{"a": 2}]
+        third = [{"b": 1}, {"b": 2}]
+        results = list(infer_product(iter(first), iter(second), iter(third)))
+        assert results == [(first[1], second[0], third[0]), (first[1], second[0], third[1])]
+
+    def test_side_effect_order(self):
+        # the second operand changes the state read by the first one, like the instance_mode of infer_attribute
+        state = {"instance_mode": True}
+
+        def values():
+            for value in (1, 2):
+                yield value, state["instance_mode"]
+
+        def links():
+            state["instance_mode"] = False
+            yield "link"
+
+        assert list(infer_product(values(), links())) == [((1, True), "link"), ((2, True), "link")]
+
+
+class TestSelectedOperand:
+    def test_conflict(self):
+        left = SelectedOperand.from_operands({"a": 1, "b": {1, 2}})
+        assert not left.is_conflict(SelectedOperand.from_operands({"a": 1, "c": 3}))
+        assert not left.is_conflict(SelectedOperand.from_operands({"b": 2}))
+        assert left.is_conflict(SelectedOperand.from_operands({"a": 2}))
+        assert left.is_conflict(SelectedOperand.from_operands({"b": {3, 4}}))
+
+    def test_combine(self):
+        selected = SelectedOperand.from_operands({"a": 1})
+        selected.combine(SelectedOperand.from_operands({"a": 2, "b": 1}))
+        assert selected == SelectedOperand.from_operands({"a": {1, 2}, "b": 1})
+
+    def test_operand_bits_cleared_with_infer_cache(self):
+        manager = BaseManager()
+        SelectedOperand.from_operands({"pivot_of_test": {1, 2}})
+        assert len(manager.operand_bits["pivot_of_test"]) == 2
+        manager.clear_infer_cache()
+        assert "pivot_of_test" not in manager.operand_bits
+
+    def test_kept_across_infer_cache_clear(self):
+        kept = SelectedOperand.from_operands({"pivot_of_test": 1})
+        BaseManager().clear_infer_cache()
+        # 2 is numbered with the bit of 1 in the previous numbering
+        new = SelectedOperand.from_operands({"pivot_of_test": 2})
+        assert kept.is_conflict(new)
+        assert new.is_conflict(kept)
+        assert not kept.is_conflict(SelectedOperand.from_operands({"pivot_of_test": {1, 2}}))
+        combined = new.copy()
+        combined.combine(kept)
+        assert combined == SelectedOperand.from_operands({"pivot_of_test": {1, 2}})
+        assert check_selected_operand([new, kept]) is False
@@ -55,6 +55,32 @@ class TestFillCondition:
         results = {str(s) for s in cfg_real.block_list.get_block_by_name("L4").conditions}
         assert results == set()
 
+    def test_while_elif(self):
+        as_tree = AstBuilder().string_build(
+            dedent(
+                """\
+                x = 2
+                while x > 1:
+                    if y < 3:
+                        stmt4
+                    elif y > 5:
+                        stmt6
+                    x = x - 1
+                stmt8
+             """
+            )
+        )
+        cfg_real = Cfg(as_tree)
+        cfg_real.root.fill_conditions()
+        results = {str(s) for s in cfg_real.block_list.get_block_by_name("L6").conditions}
+        assert results == {"x > 1", "not(y < 3)", "y > 5"}
+        results = {str(s) for s in cfg_real.block_list.get_block_by_name("L8").conditions}
+        assert results == {"not(x > 1)"}
+        # the same conditions are shared between blocks
+        l3_conditions = cfg_real.block_list.get_block_by_name("L3").conditions
+        assert {str(s) for s in l3_conditions} == {"x > 1"}
+        assert cfg_real.block_list.get_block_by_name("L7").conditions is l3_conditions
+
 
 class TestSolveConditionsCompare(BaseTestPatchCondResult):
     def test_greater(self):
@@ -5,8 +5,11 @@ import sys
 import unittest
 from textwrap import dedent
 
+import z3
+
 from klara.core import nodes
 from klara.klara_z3.cov_manager import CovManager
+from klara.klara_z3.instance_collector import InstanceCollector
 from klara.scripts.cover_gen_ins.config import ConfigNamespace
 
 from ..helper.base_test import BaseCovTest, BaseTestInference
@@ -66,6 +69,31 @@ class TestCoverLines(Base):
         linenos = self.get_lineno(as_tree)
         self.run_and_assert_line_fix(as_tree, linenos, lambda args: args["number_w"] < 4 and args["cm"] != 2)
 
+    def test_module_cache(self):
+        as_tree = dedent(
+            """\
+
+            class MyClass:
+                def init(self):
+                    self.cm = self.cfg["cm"]
+                    self.number_w = self.cfg["number_w"]
+                    self.cell1 = xxx.Cell()
+                    if self.number_w < 4:
+                        if self.cm == 2:
+                            pass
+                        else:
+                            self.cell1 = xxx.Cell() #@
+        """
+        )
+        linenos = self.get_lineno(as_tree)
+        expected = lambda args: args["number_w"] < 4 and args["cm"] != 2
+        self.run_and_assert_line_fix(as_tree, linenos, expected, module_cache=4)
+        built_tree = MANAGER.built_tree[""]
+        # the tree and cfg of the first solve are analyzed again
+        self.run_and_assert_line_fix(as_tree, linenos, expected, module_cache=4)
+        assert MANAGER.built_tree[""] is built_tree
+        MANAGER.clear_module_cache()
+
     def test_simple_minimal_instances(self):
         as_tree = dedent(
             """\
@@ -347,6 +375,16 @@ class TestCoverLines(Base):
         self.run_and_assert_line_fix(as_tree, linenos, lambda a: a["number_b"] * 2 > 8, 1, mss_algorithm="z3")
         self.run_and_assert_line_fix(as_tree, linenos, lambda a: True, 0, mss_algorithm="legacy")
 
+    def test_mss_without_the_last_check(self):
+        cm = MANAGER.z3var_maps["cm"] = z3.Int("cm")
+        collector = InstanceCollector()
+        collector.add_cond({cm > 3})
+        collector.add_cond({cm < 2})
+        # the shared solver is left with the assumptions of the check
+        assert MANAGER.check_assumptions_and_get_model({cm < 2}).sat
+        results = collector.use_mss_z3()
+        assert sorted(res["cm"] > 3 for res in results) == [False, True]
+
 
 class TestCoverAll(Base):
     def test_simple(self):